@@ -9,4 +9,12 @@ rm -rfv $OMD_ROOT/local/lib/check_mk/base/plugins/agent_based
 ln -sv $WORKSPACE/agent_based $OMD_ROOT/local/lib/check_mk/base/plugins/agent_based
 
 rm -rfv $OMD_ROOT/local/lib/nagios/plugins
-ln -sv $WORKSPACE/nagios_plugins $OMD_ROOT/local/lib/nagios/plugins
\ No newline at end of file
+ln -sv $WORKSPACE/nagios_plugins $OMD_ROOT/local/lib/nagios/plugins
+
+rm -rfv $OMD_ROOT/local/lib/python3/sentry4_pdu
+ln -sv $WORKSPACE/lib/python3/sentry4_pdu $OMD_ROOT/local/lib/python3/sentry4_pdu
+
+for FILE in $WORKSPACE/bin/*; do
+    rm -rfv $OMD_ROOT/local/bin/$(basename $FILE)
+    ln -sv $FILE $OMD_ROOT/local/bin/$(basename $FILE)
+done;
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks based on the Sentry4-MIB for PDU status.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Groups the temperature and humidity sensors of a unit (e.g. the probes of an
+# EMCU) into a single 'Environment <unit>' service. Enabled by setting
+# 'environment_grouping' to 'unit' in the Sentry4 PDU discovery rule, which
+# also disables the per sensor services of sentry4_pdu_temp/sentry4_pdu_humid.
+
+
+from .agent_based_api.v1 import (
+    register,
+    Service,
+    Result,
+    State,
+    Metric,
+)
+from .utils.sentry4_pdu import (
+    DISCOVERY_DEFAULT_PARAMETERS,
+    sentry4_levels_state,
+    sentry4_unit_id,
+)
+
+
+def _unit_sensors(section, unit):
+    return {sensor_id: sensor for (sensor_id, sensor) in (section or {}).items() if sentry4_unit_id(sensor_id) == unit}
+
+
+def _check_sensors(title, unit_of_measurement, metric, sensors):
+    results = []
+    values = []
+
+    for (sensor_id, sensor) in sorted(sensors.items()):
+        if sensor['status'] != 0:
+            results.append(Result(state=State.CRIT, summary=f"{sensor_id} {sensor['name']}: {title} sensor error"))
+            continue
+
+        value = sensor['value']
+        values.append(value)
+
+        (state, text) = sentry4_levels_state(
+            value,
+            float(sensor['low_alarm']),
+            float(sensor['low_warning']),
+            float(sensor['high_warning']),
+            float(sensor['high_alarm']),
+        )
+
+        if state == State.OK:
+            results.append(Result(state=state, notice=f"{sensor_id} {sensor['name']}: {value}{unit_of_measurement}"))
+        else:
+            results.append(Result(state=state, summary=f"{sensor_id} {sensor['name']}: {value}{unit_of_measurement} {text}"))
+
+    if values:
+        value_min = min(values)
+        value_avg = round(sum(values) / len(values), 1)
+        value_max = max(values)
+
+        yield Result(state=State.OK, summary=f"{title}: {len(values)} sensors, min {value_min}{unit_of_measurement}, avg {value_avg}{unit_of_measurement}, max {value_max}{unit_of_measurement}")
+
+        yield Metric(f'{metric}_min', value_min)
+        yield Metric(f'{metric}_avg', value_avg)
+        yield Metric(f'{metric}_max', value_max)
+
+    yield from results
+
+
+def discover_sentry4_pdu_environment(params, section_sentry4_pdu_temp, section_sentry4_pdu_humid):
+    if params.get('environment_grouping') != 'unit':
+        return
+
+    units = []
+
+    for section in (section_sentry4_pdu_temp, section_sentry4_pdu_humid):
+        for sensor_id in (section or {}):
+            unit = sentry4_unit_id(sensor_id)
+            if unit not in units:
+                units.append(unit)
+
+    for unit in units:
+        yield Service(item=f"Environment {unit}")
+
+
+def check_sentry4_pdu_environment(item, section_sentry4_pdu_temp, section_sentry4_pdu_humid):
+    unit = item[len('Environment '):]
+
+    temp_sensors = _unit_sensors(section_sentry4_pdu_temp, unit)
+    humid_sensors = _unit_sensors(section_sentry4_pdu_humid, unit)
+
+    if not temp_sensors and not humid_sensors:
+        return
+
+    yield from _check_sensors('Temperature', ' °C', 'sentry4_temp', temp_sensors)
+    yield from _check_sensors('Humidity', '%', 'sentry4_humidity', humid_sensors)
+
+
+register.check_plugin(
+    name='sentry4_pdu_environment',
+    sections=['sentry4_pdu_temp', 'sentry4_pdu_humid'],
+    service_name='%s',
+    discovery_function=discover_sentry4_pdu_environment,
+    discovery_ruleset_name='sentry4_pdu_discovery',
+    discovery_default_parameters=DISCOVERY_DEFAULT_PARAMETERS,
+    check_function=check_sentry4_pdu_environment,
+)
@@ -40,63 +40,75 @@
 
 from .agent_based_api.v1 import (
     register,
-    SNMPTree,
     exists,
     Service,
     Result,
     State,
     Metric,
 )
+from .utils.sentry4_pdu import (
+    DISCOVERY_DEFAULT_PARAMETERS,
+    Sentry4Column,
+    Sentry4Table,
+    sentry4_item,
+    sentry4_item_is_stable,
+    sentry4_levels_state,
+    sentry4_section_key,
+)
 
 
-def parse_sentry4_pdu_humid(string_table):
-
-    parsed = {}
-
-    for (sensor_id, name, value, status, low_alarm, low_warning, high_warning, high_alarm) in string_table:
+SENTRY4_HUMID_TABLE = Sentry4Table(
+    base='.1.3.6.1.4.1.1718.4.1.10',  # Sentry4-MIB::st4HumiditySensors
+    columns=[
+        Sentry4Column('2.1.2', 'sensor_id'),                    # Sentry4-MIB::st4HumidSensorID
+        Sentry4Column('2.1.3', 'name'),                         # Sentry4-MIB::st4HumidSensorName
+        Sentry4Column('3.1.1', 'value', int, 1, ('', '-1')),    # Sentry4-MIB::st4HumidSensorValue
+        Sentry4Column('3.1.2', 'status', int),                  # Sentry4-MIB::st4HumidSensorStatus
+        Sentry4Column('4.1.2', 'low_alarm', int),               # Sentry4-MIB::st4HumidSensorLowAlarm
+        Sentry4Column('4.1.3', 'low_warning', int),             # Sentry4-MIB::st4HumidSensorLowWarning
+        Sentry4Column('4.1.4', 'high_warning', int),            # Sentry4-MIB::st4HumidSensorHighWarning
+        Sentry4Column('4.1.5', 'high_alarm', int),              # Sentry4-MIB::st4HumidSensorHighAlarm
+    ],
+)
 
-        if (int(value) != -1):
-            item = f"Humidity {sensor_id} {name}"
-            parsed[item] = {}
-            parsed[item]['value'] = int(value)
-            parsed[item]['status'] = int(status)
-            parsed[item]['low_alarm'] = int(low_alarm)
-            parsed[item]['low_warning'] = int(low_warning)
-            parsed[item]['high_warning'] = int(high_warning)
-            parsed[item]['high_alarm'] = int(high_alarm)
 
-    return parsed
+def parse_sentry4_pdu_humid(string_table):
+    return SENTRY4_HUMID_TABLE.parse(string_table)
 
 
 register.snmp_section(
     name='sentry4_pdu_humid',
     detect=exists('.1.3.6.1.4.1.1718.4.1.1.1.1.0'),
-    fetch=SNMPTree(
-        base='.1.3.6.1.4.1.1718.4.1.10',  # Sentry4-MIB::st4HumiditySensors
-        oids=[
-            '2.1.2',  # Sentry4-MIB::st4HumidSensorID
-            '2.1.3',  # Sentry4-MIB::st4HumidSensorName
-            '3.1.1',  # Sentry4-MIB::st4HumidSensorValue
-            '3.1.2',  # Sentry4-MIB::st4HumidSensorStatus
-            '4.1.2',  # Sentry4-MIB::st4HumidSensorLowAlarm
-            '4.1.3',  # Sentry4-MIB::st4HumidSensorLowWarning
-            '4.1.4',  # Sentry4-MIB::st4HumidSensorHighWarning
-            '4.1.5',  # Sentry4-MIB::st4HumidSensorHighAlarm
-        ],
-    ),
+    fetch=SENTRY4_HUMID_TABLE.fetch,
     parse_function=parse_sentry4_pdu_humid,
 )
 
 
-def discover_sentry4_pdu_humid(section):
-    for service in section.keys():
-        yield Service(item=service)
+# Same section from the special agent agent_sentry4_pdu, see sentry4_pdu.fetch
+register.agent_section(
+    name='sentry4_pdu_humid_agent',
+    parsed_section_name='sentry4_pdu_humid',
+    parse_function=parse_sentry4_pdu_humid,
+    supersedes=['sentry4_pdu_humid'],
+)
+
+
+def discover_sentry4_pdu_humid(params, section):
+    if params.get('environment_grouping') == 'unit':
+        return
+
+    for (sensor_id, sensor) in section.items():
+        yield Service(item=sentry4_item('Humidity', sensor_id, sensor['name'], params))
 
 
 def check_sentry4_pdu_humid(item, params, section):
-    if item not in section:
+    key = sentry4_section_key('Humidity', item, section, 'name')
+    if key is None:
         return
 
+    if sentry4_item_is_stable('Humidity', item, key):
+        yield Result(state=State.OK, summary=f"Name: {section[key]['name']}")
+
     low_alarm = 0.0
     low_warning = 0.0
     high_warning = 0.0
@@ -106,40 +118,32 @@ def check_sentry4_pdu_humid(item, params, section):
         low_alarm = params['levels_lower'][1]
         low_warning = params['levels_lower'][0]
     else:
-        low_alarm = float(section[item]['low_alarm'])
-        low_warning = float(section[item]['low_warning'])
+        low_alarm = float(section[key]['low_alarm'])
+        low_warning = float(section[key]['low_warning'])
 
     if 'levels' in params:
         high_warning = params['levels'][0]
         high_alarm = params['levels'][1]
     else:
-        high_warning = float(section[item]['high_warning'])
-        high_alarm = float(section[item]['high_alarm'])
+        high_warning = float(section[key]['high_warning'])
+        high_alarm = float(section[key]['high_alarm'])
 
     details = f"High alarm:{high_alarm}, High warning:{high_warning}, Low warning:{low_warning}, Low alarm:{low_alarm}"
 
-    if section[item]['status'] == 0:
+    if section[key]['status'] == 0:
 
-        humid = section[item]['value']
+        humid = section[key]['value']
 
         summary = f"{humid}%"
 
         yield Metric('humidity', humid, levels=(high_warning, high_alarm))
 
-        if humid <= low_alarm:
-            yield Result(state=State.CRIT, summary=f"{summary} is below critical threshold", details=details)
-
-        elif humid >= high_alarm:
-            yield Result(state=State.CRIT, summary=f"{summary} is above critical threshold", details=details)
-
-        elif humid >= high_warning:
-            yield Result(state=State.WARN, summary=f"{summary} is above warning threshold", details=details)
+        (state, text) = sentry4_levels_state(humid, low_alarm, low_warning, high_warning, high_alarm)
 
-        elif humid <= low_warning:
-            yield Result(state=State.WARN, summary=f"{summary} is below warning threshold", details=details)
+        if text:
+            summary = f"{summary} {text}"
 
-        else:
-            yield Result(state=State.OK, summary=summary, details=details)
+        yield Result(state=state, summary=summary, details=details)
 
     else:
         yield Result(state=State.CRIT, summary='Humidity sensor error')
@@ -149,6 +153,8 @@ register.check_plugin(
     name='sentry4_pdu_humid',
     service_name='%s',
     discovery_function=discover_sentry4_pdu_humid,
+    discovery_ruleset_name='sentry4_pdu_discovery',
+    discovery_default_parameters=DISCOVERY_DEFAULT_PARAMETERS,
     check_function=check_sentry4_pdu_humid,
     check_default_parameters={},
     check_ruleset_name='humidity',
@@ -39,55 +39,55 @@
 
 from .agent_based_api.v1 import (
     register,
-    SNMPTree,
     exists,
     Service,
     Result,
     State,
     Metric,
 )
+from .utils.sentry4_pdu import (
+    DISCOVERY_DEFAULT_PARAMETERS,
+    Sentry4Column,
+    Sentry4Table,
+    sentry4_item,
+    sentry4_item_is_stable,
+    sentry4_section_key,
+)
 
 
-def parse_sentry4_pdu_inlet(string_table):
-
-    parsed = {}
-
-    for (cord_id, cord_name, state, status, active_power, apparent_power, power_utilized, power_factor) in string_table:
-
-        cord = f"Input cord {cord_id} {cord_name}"
-
-        if (cord not in parsed):
-            parsed[cord] = {}
+SENTRY4_INLET_TABLE = Sentry4Table(
+    base='.1.3.6.1.4.1.1718.4.1.3',  # Sentry4-MIB::st4InputCords
+    columns=[
+        Sentry4Column('2.1.2', 'cord_id'),                  # Sentry4-MIB::st4InputCordID
+        Sentry4Column('2.1.3', 'cord_name'),                # Sentry4-MIB::st4InputCordName
+        Sentry4Column('3.1.1', 'state', int),               # Sentry4-MIB::st4InputCordState
+        Sentry4Column('3.1.2', 'status', int),              # Sentry4-MIB::st4InputCordStatus
+        Sentry4Column('3.1.3', 'active_power', int),        # Sentry4-MIB::st4InputCordActivePower
+        Sentry4Column('3.1.5', 'apparent_power', int),      # Sentry4-MIB::st4InputCordApparentPower
+        Sentry4Column('3.1.7', 'power_utilized', int),      # Sentry4-MIB::st4InputCordPowerUtilized
+        Sentry4Column('3.1.8', 'power_factor', float, 100),  # Sentry4-MIB::st4InputCordPowerFactor (hundredths)
+    ],
+)
 
-        parsed[cord]['cord_id'] = cord_id
-        parsed[cord]['cord_name'] = cord_name
-        parsed[cord]['state'] = state
-        parsed[cord]['status'] = status
-        parsed[cord]['active_power'] = active_power
-        parsed[cord]['apparent_power'] = apparent_power
-        parsed[cord]['power_utilized'] = power_utilized
-        parsed[cord]['power_factor'] = power_factor
 
-    return parsed
+def parse_sentry4_pdu_inlet(string_table):
+    return SENTRY4_INLET_TABLE.parse(string_table)
 
 
 register.snmp_section(
     name='sentry4_pdu_inlet',
     detect=exists('.1.3.6.1.4.1.1718.4.1.1.1.1.0'),
-    fetch=SNMPTree(
-        base='.1.3.6.1.4.1.1718.4.1.3',  # Sentry4-MIB::st4InputCords
-        oids=[
-            '2.1.2',  # Sentry4-MIB::st4InputCordID
-            '2.1.3',  # Sentry4-MIB::st4InputCordName
-            '3.1.1',  # Sentry4-MIB::st4InputCordState
-            '3.1.2',  # Sentry4-MIB::st4InputCordStatus
-            '3.1.3',  # Sentry4-MIB::st4InputCordActivePower
-            '3.1.5',  # Sentry4-MIB::st4InputCordApparentPower
-            '3.1.7',  # Sentry4-MIB::st4InputCordPowerUtilized
-            '3.1.8',  # Sentry4-MIB::st4InputCordPowerFactor
-        ],
-    ),
+    fetch=SENTRY4_INLET_TABLE.fetch,
+    parse_function=parse_sentry4_pdu_inlet,
+)
+
+
+# Same section from the special agent agent_sentry4_pdu, see sentry4_pdu.fetch
+register.agent_section(
+    name='sentry4_pdu_inlet_agent',
+    parsed_section_name='sentry4_pdu_inlet',
     parse_function=parse_sentry4_pdu_inlet,
+    supersedes=['sentry4_pdu_inlet'],
 )
 
 
@@ -125,20 +125,24 @@ SERVICE_STATUS_MAP = {
 }
 
 
-def discover_sentry4_pdu_inlet(section):
-    for service in section.keys():
-        yield Service(item=service)
+def discover_sentry4_pdu_inlet(params, section):
+    for (cord_id, cord) in section.items():
+        yield Service(item=sentry4_item('Input cord', cord_id, cord['cord_name'], params))
 
 
 def check_sentry4_pdu_inlet(item, section):
-    if item not in section:
+    key = sentry4_section_key('Input cord', item, section, 'cord_name')
+    if key is None:
         return
 
-    state = int(section[item]['state'])
-    status = int(section[item]['status'])
-    power = int(section[item]['active_power'])
-    appower = int(section[item]['apparent_power'])
-    power_usage_percentage = int(section[item]['power_utilized'])
+    state = section[key]['state']
+    status = section[key]['status']
+    power = section[key]['active_power']
+    appower = section[key]['apparent_power']
+    power_usage_percentage = section[key]['power_utilized']
+
+    if sentry4_item_is_stable('Input cord', item, key):
+        yield Result(state=State.OK, summary=f"Name: {section[key]['cord_name']}")
 
     summary = f"Status: {SERVICE_STATUS_MAP[status]}({status}) State: {SERVICE_STATE_MAP[state]}({state})"
 
@@ -160,5 +164,7 @@ register.check_plugin(
     name='sentry4_pdu_inlet',
     service_name='%s',
     discovery_function=discover_sentry4_pdu_inlet,
+    discovery_ruleset_name='sentry4_pdu_discovery',
+    discovery_default_parameters=DISCOVERY_DEFAULT_PARAMETERS,
     check_function=check_sentry4_pdu_inlet,
 )
@@ -56,55 +56,55 @@
 
 from .agent_based_api.v1 import (
     register,
-    SNMPTree,
     exists,
     Service,
     Result,
     State,
     Metric,
 )
+from .utils.sentry4_pdu import (
+    DISCOVERY_DEFAULT_PARAMETERS,
+    Sentry4Column,
+    Sentry4Table,
+    sentry4_item,
+    sentry4_item_is_stable,
+    sentry4_section_key,
+)
 
 
-def parse_sentry4_pdu_outlet(string_table):
-
-    parsed = {}
-
-    for (outlet_id, outlet_name, state, status, current, voltage, active_power, apparent_power) in string_table:
-
-        outlet = f"Outlet {outlet_id} {outlet_name}"
-
-        if (outlet not in parsed):
-            parsed[outlet] = {}
+SENTRY4_OUTLET_TABLE = Sentry4Table(
+    base='.1.3.6.1.4.1.1718.4.1.8',  # Sentry4-MIB::st4Outlets
+    columns=[
+        Sentry4Column('2.1.2', 'outlet_id'),                # Sentry4-MIB::st4OutletID
+        Sentry4Column('2.1.3', 'outlet_name'),              # Sentry4-MIB::st4OutletName
+        Sentry4Column('3.1.1', 'state', int),               # Sentry4-MIB::st4OutletState
+        Sentry4Column('3.1.2', 'status', int),              # Sentry4-MIB::st4OutletStatus
+        Sentry4Column('3.1.3', 'current', float, 100),      # Sentry4-MIB::st4OutletCurrent (hundredth Amps)
+        Sentry4Column('3.1.6', 'voltage', float, 10),       # Sentry4-MIB::st4OutletVoltage (tenth Volts)
+        Sentry4Column('3.1.7', 'active_power', int),        # Sentry4-MIB::st4OutletActivePower
+        Sentry4Column('3.1.9', 'apparent_power', int),      # Sentry4-MIB::st4OutletApparentPower
+    ],
+)
 
-        parsed[outlet]['outlet_id'] = outlet_id
-        parsed[outlet]['outlet_name'] = outlet_name
-        parsed[outlet]['state'] = state
-        parsed[outlet]['status'] = status
-        parsed[outlet]['current'] = current
-        parsed[outlet]['voltage'] = voltage
-        parsed[outlet]['active_power'] = active_power
-        parsed[outlet]['apparent_power'] = apparent_power
 
-    return parsed
+def parse_sentry4_pdu_outlet(string_table):
+    return SENTRY4_OUTLET_TABLE.parse(string_table)
 
 
 register.snmp_section(
     name='sentry4_pdu_outlet',
     detect=exists('.1.3.6.1.4.1.1718.4.1.1.1.1.0'),
-    fetch=SNMPTree(
-        base='.1.3.6.1.4.1.1718.4.1.8',  # Sentry4-MIB::st4Outlets
-        oids=[
-            '2.1.2',  # Sentry4-MIB::st4OutletID
-            '2.1.3',  # Sentry4-MIB::st4OutletName
-            '3.1.1',  # Sentry4-MIB::st4OutletState
-            '3.1.2',  # Sentry4-MIB::st4OutletStatus
-            '3.1.3',  # Sentry4-MIB::st4OutletCurrent
-            '3.1.6',  # Sentry4-MIB::st4OutletVoltage
-            '3.1.7',  # Sentry4-MIB::st4OutletActivePower
-            '3.1.9',  # Sentry4-MIB::st4OutletApparentPower
-        ],
-    ),
+    fetch=SENTRY4_OUTLET_TABLE.fetch,
+    parse_function=parse_sentry4_pdu_outlet,
+)
+
+
+# Same section from the special agent agent_sentry4_pdu, see sentry4_pdu.fetch
+register.agent_section(
+    name='sentry4_pdu_outlet_agent',
+    parsed_section_name='sentry4_pdu_outlet',
     parse_function=parse_sentry4_pdu_outlet,
+    supersedes=['sentry4_pdu_outlet'],
 )
 
 
@@ -142,21 +142,25 @@ SERVICE_STATUS_MAP = {
 }
 
 
-def discover_sentry4_pdu_outlet(section):
-    for service in section.keys():
-        yield Service(item=service)
+def discover_sentry4_pdu_outlet(params, section):
+    for (outlet_id, outlet) in section.items():
+        yield Service(item=sentry4_item('Outlet', outlet_id, outlet['outlet_name'], params))
 
 
 def check_sentry4_pdu_outlet(item, section):
-    if item not in section:
+    key = sentry4_section_key('Outlet', item, section, 'outlet_name')
+    if key is None:
         return
 
-    state = int(section[item]['state'])
-    status = int(section[item]['status'])
-    current = int(section[item]['current']) / 100
-    voltage = int(section[item]['voltage']) / 10
-    power = int(section[item]['active_power'])
-    appower = int(section[item]['apparent_power'])
+    state = section[key]['state']
+    status = section[key]['status']
+    current = section[key]['current']
+    voltage = section[key]['voltage']
+    power = section[key]['active_power']
+    appower = section[key]['apparent_power']
+
+    if sentry4_item_is_stable('Outlet', item, key):
+        yield Result(state=State.OK, summary=f"Name: {section[key]['outlet_name']}")
 
     summary = f"Status: {SERVICE_STATUS_MAP[status]}({status}) State: {SERVICE_STATE_MAP[state]}({state})"
 
@@ -179,5 +183,7 @@ register.check_plugin(
     name='sentry4_pdu_outlet',
     service_name='%s',
     discovery_function=discover_sentry4_pdu_outlet,
+    discovery_ruleset_name='sentry4_pdu_discovery',
+    discovery_default_parameters=DISCOVERY_DEFAULT_PARAMETERS,
     check_function=check_sentry4_pdu_outlet,
 )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks based on the Sentry4-MIB for PDU status.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# The sections are piggyback data of the datasource program sentry4_pdu_rollup
+# for hosts named after a site, row or rack.
+
+
+from .agent_based_api.v1 import (
+    register,
+    Service,
+    Result,
+    State,
+    Metric,
+)
+
+
+def parse_sentry4_pdu_rollup(string_table):
+    section = {}
+
+    for line in string_table:
+        if line[0] == 'level':
+            section['level'] = line[1]
+        elif line[0] in ('pdus', 'stale', 'cord_power'):
+            section[line[0]] = int(line[1])
+        elif line[0] == 'outlet_current':
+            section['outlet_current'] = float(line[1])
+        elif line[0] == 'max_temperature':
+            section['max_temperature'] = float(line[1])
+            section['max_temperature_sensor'] = line[2] if len(line) > 2 else ''
+
+    return section
+
+
+register.agent_section(
+    name='sentry4_pdu_rollup',
+    parse_function=parse_sentry4_pdu_rollup,
+)
+
+
+def discover_sentry4_pdu_rollup(section):
+    if 'level' in section:
+        yield Service()
+
+
+def check_sentry4_pdu_rollup(section):
+    level = section['level'].capitalize()
+
+    yield Result(
+        state=State.OK,
+        summary=f"{level}: {section['pdus']} PDUs, cord power {section['cord_power']} W, outlet current {section['outlet_current']} A",
+    )
+    yield Metric('power', section['cord_power'])
+    yield Metric('current', section['outlet_current'])
+
+    if 'max_temperature' in section:
+        yield Result(state=State.OK, summary=f"Hottest sensor: {section['max_temperature']} °C ({section['max_temperature_sensor']})")
+        yield Metric('sentry4_temp_max', section['max_temperature'])
+
+    if section['stale']:
+        yield Result(state=State.WARN, summary=f"{section['stale']} PDUs without current data")
+
+
+register.check_plugin(
+    name='sentry4_pdu_rollup',
+    service_name='PDU power rollup',
+    discovery_function=discover_sentry4_pdu_rollup,
+    check_function=check_sentry4_pdu_rollup,
+)
@@ -30,49 +30,50 @@
 
 from .agent_based_api.v1 import (
     register,
-    SNMPTree,
     exists,
     Service,
     Result,
     State,
 )
+from .utils.sentry4_pdu import (
+    DISCOVERY_DEFAULT_PARAMETERS,
+    Sentry4Column,
+    Sentry4Table,
+    sentry4_section_key,
+)
 
 
-def parse_sentry4_pdu_status(string_table):
-
-    parsed = {}
-
-    for (unit_id, unit_name, unit_sn, unit_model, unit_type, unit_status) in string_table:
-        unit = f"Sentry PDU status: {unit_name}"
-
-        if (unit not in parsed):
-            parsed[unit] = {}
+SENTRY4_UNIT_TABLE = Sentry4Table(
+    base='.1.3.6.1.4.1.1718.4.1.2',  # Sentry4-MIB::st4Units
+    columns=[
+        Sentry4Column('2.1.2', 'Unit'),                     # Sentry4-MIB::st4UnitID
+        Sentry4Column('2.1.3', 'Name'),                     # Sentry4-MIB::st4UnitName
+        Sentry4Column('2.1.4', 'SN'),                       # Sentry4-MIB::st4UnitProductSN
+        Sentry4Column('2.1.5', 'Model'),                    # Sentry4-MIB::st4UnitModel
+        Sentry4Column('2.1.7', 'Type', int),                # Sentry4-MIB::st4UnitType
+        Sentry4Column('3.1.1', 'Status', int),              # Sentry4-MIB::st4UnitStatus
+    ],
+)
 
-        parsed[unit]['Unit'] = unit_id
-        parsed[unit]['Name'] = unit_name
-        parsed[unit]['SN'] = unit_sn
-        parsed[unit]['Model'] = unit_model
-        parsed[unit]['Type'] = unit_type
-        parsed[unit]['Status'] = unit_status
 
-    return parsed
+def parse_sentry4_pdu_status(string_table):
+    return SENTRY4_UNIT_TABLE.parse(string_table)
 
 
 register.snmp_section(
     name='sentry4_pdu_status',
     detect=exists('.1.3.6.1.4.1.1718.4.1.1.1.1.0'),
-    fetch=SNMPTree(
-        base='.1.3.6.1.4.1.1718.4.1.2',
-        oids=[
-            '2.1.2',  # Sentry4-MIB::st4UnitID
-            '2.1.3',  # Sentry4-MIB::st4UnitName
-            '2.1.4',  # Sentry4-MIB::st4UnitProductSN
-            '2.1.5',  # Sentry4-MIB::st4UnitModel
-            '2.1.7',  # Sentry4-MIB::st4UnitType
-            '3.1.1',  # Sentry4-MIB::st4UnitStatus
-        ],
-    ),
+    fetch=SENTRY4_UNIT_TABLE.fetch,
+    parse_function=parse_sentry4_pdu_status,
+)
+
+
+# Same section from the special agent agent_sentry4_pdu, see sentry4_pdu.fetch
+register.agent_section(
+    name='sentry4_pdu_status_agent',
+    parsed_section_name='sentry4_pdu_status',
     parse_function=parse_sentry4_pdu_status,
+    supersedes=['sentry4_pdu_status'],
 )
 
 
@@ -109,21 +110,25 @@ UNIT_TYPE_MAP = {
 }
 
 
-def discover_sentry4_pdu_status(section):
-    for service in section.keys():
-        yield Service(item=service)
+def discover_sentry4_pdu_status(params, section):
+    for (unit_id, unit) in section.items():
+        if params.get('item_naming') == 'id':
+            yield Service(item=f"Sentry PDU status: {unit_id}")
+        else:
+            yield Service(item=f"Sentry PDU status: {unit['Name']}")
 
 
 def check_sentry4_pdu_status(item, section):
-    if item not in section:
+    unit = sentry4_section_key('Sentry PDU status:', item, section, 'Name')
+    if unit is None:
         return
 
-    status = int(section[item]['Status'])
-    type = int(section[item]['Type'])
+    status = section[unit]['Status']
+    type = section[unit]['Type']
 
     summary = ''
 
-    for (key, value) in section[item].items():
+    for (key, value) in section[unit].items():
         if (key == 'Status' and value != ''):
             summary = f"{key}: {SERVICE_STATE_MAP[status]}({value}), {summary}"
         elif (key == 'Type' and value != ''):
@@ -147,5 +152,7 @@ register.check_plugin(
     name='sentry4_pdu_status',
     service_name='%s',
     discovery_function=discover_sentry4_pdu_status,
+    discovery_ruleset_name='sentry4_pdu_discovery',
+    discovery_default_parameters=DISCOVERY_DEFAULT_PARAMETERS,
     check_function=check_sentry4_pdu_status,
 )
@@ -48,13 +48,21 @@
 
 from .agent_based_api.v1 import (
     register,
-    SNMPTree,
     exists,
     Service,
     Result,
     State,
     Metric,
 )
+from .utils.sentry4_pdu import (
+    DISCOVERY_DEFAULT_PARAMETERS,
+    Sentry4Column,
+    Sentry4Table,
+    sentry4_item,
+    sentry4_item_is_stable,
+    sentry4_levels_state,
+    sentry4_section_key,
+)
 
 
 def convert_farenheit_to_celsius(f):
@@ -62,36 +70,45 @@ def convert_farenheit_to_celsius(f):
     return c
 
 
+SENTRY4_TEMP_TABLE = Sentry4Table(
+    base='.1.3.6.1.4.1.1718.4.1.9',  # Sentry4-MIB::st4TemperatureSensors
+    columns=[
+        Sentry4Column('1.10', None),                                        # Sentry4-MIB::st4TempSensorScale
+        Sentry4Column('2.1.2', 'sensor_id'),                                # Sentry4-MIB::st4TempSensorID
+        Sentry4Column('2.1.3', 'name'),                                     # Sentry4-MIB::st4TempSensorName
+        Sentry4Column('3.1.1', 'value', float, 10, ('', '-410', '-706')),   # Sentry4-MIB::st4TempSensorValue (tenth degrees)
+        Sentry4Column('3.1.2', 'status', int),                              # Sentry4-MIB::st4TempSensorStatus
+        Sentry4Column('4.1.2', 'low_alarm', int),                           # Sentry4-MIB::st4TempSensorLowAlarm
+        Sentry4Column('4.1.3', 'low_warning', int),                         # Sentry4-MIB::st4TempSensorLowWarning
+        Sentry4Column('4.1.4', 'high_warning', int),                        # Sentry4-MIB::st4TempSensorHighWarning
+        Sentry4Column('4.1.5', 'high_alarm', int),                          # Sentry4-MIB::st4TempSensorHighAlarm
+    ],
+)
+
+
 def parse_sentry4_pdu_temp(string_table):
 
     parsed = {}
     unit = ''
 
-    for (scale, sensor_id, name, value, status, low_alarm, low_warning, high_warning, high_alarm) in string_table:
-
-        if scale != '':
-            unit = scale
-
-        if (unit == '0'):
-            if (value != '' and int(value) != -410):
-                item = f"Temperature {sensor_id} {name}"
-                parsed[item] = {}
-                parsed[item]['value'] = float(int(value) / 10)
-                parsed[item]['status'] = int(status)
-                parsed[item]['low_alarm'] = int(low_alarm)
-                parsed[item]['low_warning'] = int(low_warning)
-                parsed[item]['high_warning'] = int(high_warning)
-                parsed[item]['high_alarm'] = int(high_alarm)
-        else:
-            if (value != '' and int(value) != -706):
-                item = f"Temperature {sensor_id} {name}"
-                parsed[item] = {}
-                parsed[item]['value'] = float(convert_farenheit_to_celsius(int(value) / 10))
-                parsed[item]['status'] = int(status)
-                parsed[item]['low_alarm'] = int(convert_farenheit_to_celsius(int(low_alarm)))
-                parsed[item]['low_warning'] = int(convert_farenheit_to_celsius(int(low_warning)))
-                parsed[item]['high_warning'] = int(convert_farenheit_to_celsius(int(high_warning)))
-                parsed[item]['high_alarm'] = int(convert_farenheit_to_celsius(int(high_alarm)))
+    for row in string_table:
+
+        # st4TempSensorScale is a scalar and only set in the first row
+        if row[0] != '':
+            unit = row[0]
+
+        sensor = SENTRY4_TEMP_TABLE.convert_row(row)
+
+        if sensor is None:
+            continue
+
+        if (unit != '0'):
+            sensor['value'] = float(convert_farenheit_to_celsius(sensor['value']))
+            for key in ('low_alarm', 'low_warning', 'high_warning', 'high_alarm'):
+                if sensor[key] is not None:
+                    sensor[key] = int(convert_farenheit_to_celsius(sensor[key]))
+
+        parsed[sensor['sensor_id']] = sensor
 
     return parsed
 
@@ -99,33 +116,36 @@ def parse_sentry4_pdu_temp(string_table):
 register.snmp_section(
     name='sentry4_pdu_temp',
     detect=exists('.1.3.6.1.4.1.1718.4.1.1.1.1.0'),
-    fetch=SNMPTree(
-        base='.1.3.6.1.4.1.1718.4.1.9',  # Sentry4-MIB::st4TemperatureSensors
-        oids=[
-            '1.10',   # Sentry4-MIB::st4TempSensorScale
-            '2.1.2',  # Sentry4-MIB::st4TempSensorID
-            '2.1.3',  # Sentry4-MIB::st4TempSensorName
-            '3.1.1',  # Sentry4-MIB::st4TempSensorValue
-            '3.1.2',  # Sentry4-MIB::st4TempSensorStatus
-            '4.1.2',  # Sentry4-MIB::st4TempSensorLowAlarm
-            '4.1.3',  # Sentry4-MIB::st4TempSensorLowWarning
-            '4.1.4',  # Sentry4-MIB::st4TempSensorHighWarning
-            '4.1.5',  # Sentry4-MIB::st4TempSensorHighAlarm
-        ],
-    ),
+    fetch=SENTRY4_TEMP_TABLE.fetch,
     parse_function=parse_sentry4_pdu_temp,
 )
 
 
-def discover_sentry4_pdu_temp(section):
-    for service in section.keys():
-        yield Service(item=service)
+# Same section from the special agent agent_sentry4_pdu, see sentry4_pdu.fetch
+register.agent_section(
+    name='sentry4_pdu_temp_agent',
+    parsed_section_name='sentry4_pdu_temp',
+    parse_function=parse_sentry4_pdu_temp,
+    supersedes=['sentry4_pdu_temp'],
+)
+
+
+def discover_sentry4_pdu_temp(params, section):
+    if params.get('environment_grouping') == 'unit':
+        return
+
+    for (sensor_id, sensor) in section.items():
+        yield Service(item=sentry4_item('Temperature', sensor_id, sensor['name'], params))
 
 
 def check_sentry4_pdu_temp(item, params, section):
-    if item not in section:
+    key = sentry4_section_key('Temperature', item, section, 'name')
+    if key is None:
         return
 
+    if sentry4_item_is_stable('Temperature', item, key):
+        yield Result(state=State.OK, summary=f"Name: {section[key]['name']}")
+
     low_alarm = 0.0
     low_warning = 0.0
     high_warning = 0.0
@@ -135,21 +155,21 @@ def check_sentry4_pdu_temp(item, params, section):
         low_alarm = params['levels_lower'][1]
         low_warning = params['levels_lower'][0]
     else:
-        low_alarm = float(section[item]['low_alarm'])
-        low_warning = float(section[item]['low_warning'])
+        low_alarm = float(section[key]['low_alarm'])
+        low_warning = float(section[key]['low_warning'])
 
     if 'levels' in params:
         high_warning = params['levels'][0]
         high_alarm = params['levels'][1]
     else:
-        high_warning = float(section[item]['high_warning'])
-        high_alarm = float(section[item]['high_alarm'])
+        high_warning = float(section[key]['high_warning'])
+        high_alarm = float(section[key]['high_alarm'])
 
     details = f"High alarm:{high_alarm}, High warning:{high_warning}, Low warning:{low_warning}, Low alarm:{low_alarm}"
 
-    if section[item]['status'] == 0:
+    if section[key]['status'] == 0:
 
-        temp = section[item]['value']
+        temp = section[key]['value']
 
         if 'output_unit' in params and params['output_unit'] == 'f':
             f_temp = (temp * 9 / 5) + 32
@@ -162,20 +182,12 @@ def check_sentry4_pdu_temp(item, params, section):
 
         yield Metric('sentry4_temp', temp, levels=(high_warning, high_alarm))
 
-        if temp <= low_alarm:
-            yield Result(state=State.CRIT, summary=f"{summary} is below critical threshold", details=details)
-
-        elif temp >= high_alarm:
-            yield Result(state=State.CRIT, summary=f"{summary} is above critical threshold", details=details)
+        (state, text) = sentry4_levels_state(temp, low_alarm, low_warning, high_warning, high_alarm)
 
-        elif temp >= high_warning:
-            yield Result(state=State.WARN, summary=f"{summary} is above warning threshold", details=details)
+        if text:
+            summary = f"{summary} {text}"
 
-        elif temp <= low_warning:
-            yield Result(state=State.WARN, summary=f"{summary} is below warning threshold", details=details)
-
-        else:
-            yield Result(state=State.OK, summary=summary, details=details)
+        yield Result(state=state, summary=summary, details=details)
 
     else:
         yield Result(state=State.CRIT, summary='Temperature sensor error')
@@ -185,6 +197,8 @@ register.check_plugin(
     name='sentry4_pdu_temp',
     service_name='%s',
     discovery_function=discover_sentry4_pdu_temp,
+    discovery_ruleset_name='sentry4_pdu_discovery',
+    discovery_default_parameters=DISCOVERY_DEFAULT_PARAMETERS,
     check_function=check_sentry4_pdu_temp,
     check_default_parameters={},
     check_ruleset_name='temperature',
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Shared helpers for the Sentry4-MIB checks.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Sections are keyed by the Sentry4 ID of a row (st4OutletID, st4InputCordID,
+# st4TempSensorID, ...). These IDs describe the physical position on the unit
+# and survive relabeling, while the names are free text set by the operator.
+#
+# The 'item_naming' discovery parameter selects how service items are built:
+#   'id_name'  Outlet AA1 Master_Outlet_1   (legacy, changes on every relabel)
+#   'id'       Outlet AA1                   (stable, name shown in the summary)
+#
+# The 'environment_grouping' discovery parameter selects between one service
+# per temperature and humidity sensor ('sensor') and one 'Environment' service
+# per unit covering all of its sensors ('unit').
+#
+# Every Sentry4 table is described once by a Sentry4Table made of
+# Sentry4Column(oid, name, type, scale, sentinels) entries. The table provides
+# the SNMPTree to fetch and builds a row converter from the columns at import
+# time, so adding a column to a section is a one line change:
+#   type       str, int or float, float values are divided by scale
+#              (e.g. 100 for hundredth Amps, 10 for tenth Volts)
+#   sentinels  raw values marking a row without a reading (e.g. '-410' for a
+#              disconnected temperature sensor), such rows are dropped
+#   name       None fetches the column without adding it to the section
+
+from collections import namedtuple
+
+from ..agent_based_api.v1 import (
+    SNMPTree,
+    State,
+)
+
+
+DISCOVERY_DEFAULT_PARAMETERS = {
+    'item_naming': 'id_name',
+    'environment_grouping': 'sensor',
+}
+
+
+Sentry4Column = namedtuple('Sentry4Column', ['oid', 'name', 'type', 'scale', 'sentinels'], defaults=[str, 1, ()])
+
+
+def _int(value):
+    return int(value) if value != '' else None
+
+
+def _column_converter(column):
+    if column.type is str:
+        return str
+
+    if column.type is int and column.scale == 1:
+        return _int
+
+    scale = column.scale
+
+    def convert(value):
+        return int(value) / scale if value != '' else None
+
+    return convert
+
+
+def _row_converter(columns):
+    # Precomputes the (index, name) of the str and int columns, the (index, name,
+    # scale) of the scaled ones and the sentinel sets. The fast path converts with
+    # int() directly, rows with empty cells (e.g. a chained unit not answering)
+    # raise ValueError there and take the per cell path, which maps them to None.
+    # SENTRY4_PDU_BENCHMARK=1 runs the benchmark in test_sentry4_pdu_outlet.py.
+    named = [(index, column) for (index, column) in enumerate(columns) if column.name is not None]
+    fields = tuple((index, column.name, _column_converter(column)) for (index, column) in named)
+    str_fields = tuple((index, column.name) for (index, column) in named if column.type is str)
+    int_fields = tuple((index, column.name) for (index, column) in named if column.type is int and column.scale == 1)
+    scaled_fields = tuple(
+        (index, column.name, column.scale)
+        for (index, column) in named
+        if column.type is not str and not (column.type is int and column.scale == 1)
+    )
+    sentinels = tuple((index, frozenset(column.sentinels)) for (index, column) in enumerate(columns) if column.sentinels)
+
+    def convert_row(row):
+        for (index, values) in sentinels:
+            if row[index] in values:
+                return None
+
+        try:
+            entry = {name: row[index] for (index, name) in str_fields}
+            for (index, name) in int_fields:
+                entry[name] = int(row[index])
+            for (index, name, scale) in scaled_fields:
+                entry[name] = int(row[index]) / scale
+            return entry
+        except ValueError:
+            return {name: convert(row[index]) for (index, name, convert) in fields}
+
+    return convert_row
+
+
+class Sentry4Table:
+    def __init__(self, base, columns, key=None):
+        self.fetch = SNMPTree(base=base, oids=[column.oid for column in columns])
+        self.columns = columns
+        self.key = key or next(column.name for column in columns if column.name is not None)
+        self.convert_row = _row_converter(columns)
+
+    def parse(self, string_table):
+        key = self.key
+        return {entry[key]: entry for entry in map(self.convert_row, string_table) if entry is not None}
+
+
+def sentry4_item(prefix, item_id, name, params):
+    if params.get('item_naming') == 'id':
+        return f"{prefix} {item_id}"
+
+    return f"{prefix} {item_id} {name}"
+
+
+def sentry4_section_key(prefix, item, section, name_key):
+    # Resolve both item styles to the section key. Legacy items are matched by
+    # their ID so existing services keep working after a relabel until they are
+    # rediscovered; items made of the name only are matched by name.
+    if not item.startswith(f"{prefix} "):
+        return None
+
+    remainder = item[len(prefix) + 1:]
+    key = remainder.split(' ', 1)[0]
+
+    if key in section:
+        return key
+
+    for (key, entry) in section.items():
+        if entry.get(name_key) == remainder:
+            return key
+
+    return None
+
+
+def sentry4_item_is_stable(prefix, item, key):
+    return item == f"{prefix} {key}"
+
+
+def sentry4_unit_id(sensor_id):
+    # Sensor IDs are the unit ID followed by the sensor port, e.g. E1, E2
+    return sensor_id.rstrip('0123456789')
+
+
+def sentry4_levels_state(value, low_alarm, low_warning, high_warning, high_alarm):
+    if value <= low_alarm:
+        return (State.CRIT, 'is below critical threshold')
+
+    elif value >= high_alarm:
+        return (State.CRIT, 'is above critical threshold')
+
+    elif value >= high_warning:
+        return (State.WARN, 'is above warning threshold')
+
+    elif value <= low_warning:
+        return (State.WARN, 'is below warning threshold')
+
+    return (State.OK, '')
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Special agent fetching Sentry4 PDUs with targeted GET requests.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Prints the Sentry4 tables as agent sections named after the SNMP sections with
+# an '_agent' suffix, registered next to the SNMP sections in the plugins in
+# agent_based. The sections are 'nostrip': empty cells are part of the rows,
+# e.g. st4TempSensorScale is only set for the first temperature sensor, and
+# Checkmk would strip them off the start and end of a line otherwise.
+
+import argparse
+import os
+import sys
+import time
+
+from .fetch import Sentry4Fetcher
+from .snmp import VERSION_1, VERSION_2C, SNMPClient, SNMPError
+
+AGENT_SECTION_SUFFIX = '_agent'
+
+
+def _state_file(host):
+    state_dir = os.path.join(os.environ.get('OMD_ROOT', '/tmp'), 'tmp', 'check_mk', 'sentry4_pdu')
+    return os.path.join(state_dir, f'{host}.json')
+
+
+def write_sections(string_tables, out):
+    for (name, string_table) in string_tables.items():
+        out.write(f'<<<{name}{AGENT_SECTION_SUFFIX}:sep(9):nostrip>>>\n')
+        for row in string_table:
+            out.write('\t'.join(value.replace('\t', ' ').replace('\n', ' ') for value in row) + '\n')
+
+
+def main(argv=None):
+    from .sections import SECTIONS
+
+    parser = argparse.ArgumentParser(description='Checkmk special agent for Sentry4 PDUs')
+    parser.add_argument('host', help='Host name or address of the PDU')
+    parser.add_argument('--port', type=int, default=161, help='SNMP port of the PDU (default: %(default)s)')
+    parser.add_argument('--community', default='public', help='SNMP community (default: %(default)s)')
+    parser.add_argument('--snmp-version', choices=['1', '2c'], default='2c', help='SNMP version (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=1.0, help='SNMP timeout in seconds (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=2, help='SNMP retries (default: %(default)s)')
+    parser.add_argument('--max-repetitions', type=int, default=25, help='GetBulk max-repetitions of full walks (default: %(default)s)')
+    parser.add_argument('--max-oids', type=int, default=40, help='OIDs per GET request (default: %(default)s)')
+    parser.add_argument('--full-walk-interval', type=float, default=3600.0, help='Seconds between full walks, 0 to always walk (default: %(default)s)')
+    parser.add_argument('--state-file', help='File the known indexes are kept in (default: $OMD_ROOT/tmp/check_mk/sentry4_pdu/<host>.json)')
+    parser.add_argument('--debug', action='store_true', help='Show statistics and tracebacks')
+    args = parser.parse_args(argv)
+
+    client = SNMPClient(args.host, args.port, args.community, VERSION_1 if args.snmp_version == '1' else VERSION_2C, args.timeout, args.retries)
+    fetcher = Sentry4Fetcher(
+        client,
+        {name: table for (name, (table, _parse_function)) in SECTIONS.items()},
+        args.state_file or _state_file(args.host),
+        args.full_walk_interval,
+        args.max_oids,
+        args.max_repetitions,
+    )
+
+    start = time.monotonic()
+
+    try:
+        string_tables = fetcher.fetch()
+    except SNMPError as error:
+        if args.debug:
+            raise
+        sys.stderr.write(f'{error}\n')
+        return 1
+
+    write_sections(string_tables, sys.stdout)
+
+    if args.debug:
+        sys.stderr.write(
+            f"{'full walk' if fetcher.full_walk else 'targeted GET'}: {client.requests} requests, "
+            f"{client.bytes_sent} bytes sent, {client.bytes_received} bytes received, {time.monotonic() - start:.3f}s\n"
+        )
+
+    return 0
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# SNMP request budget of the Sentry4 sections.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Computes the requests and bytes a full fetch of the Sentry4 sections costs
+# for a device topology. Checkmk walks every OID of an SNMPTree separately,
+# with GetBulk requests of 'max_repetitions' varbinds (SNMP v2c) or one
+# GetNext request per row (SNMP v1). A walk ends with the first varbind outside
+# the column, so a column of n rows takes n // max_repetitions + 1 requests.
+#
+# The topology is turned into a MIB holding the fetched columns with IDs and
+# names like those of a real PDU, and the walks are replayed on it with the
+# BER encoding of sentry4_pdu.snmp to get the exact message sizes. Columns not
+# fetched by the package are not modelled. --verify walks the same MIB served
+# by a local SNMP stand-in and compares the numbers.
+
+import argparse
+import bisect
+import sys
+import threading
+from collections import namedtuple
+
+from .snmp import (
+    END_OF_MIB_VIEW,
+    GET_BULK_REQUEST,
+    GET_NEXT_REQUEST,
+    NULL,
+    RESPONSE,
+    TAG_END_OF_MIB_VIEW,
+    VERSION_1,
+    VERSION_2C,
+    Message,
+    SNMPClient,
+    encode_message,
+    integer,
+    octet_string,
+    oid_from_str,
+    oid_in_subtree,
+)
+
+# Units per PDU, input cords per unit, outlets per input cord, sensors per unit
+Topology = namedtuple('Topology', ['units', 'cords', 'outlets', 'temp_sensors', 'humid_sensors'], defaults=[1, 1, 24, 1, 1])
+
+Cost = namedtuple('Cost', ['requests', 'bytes_sent', 'bytes_received'])
+
+# SNMPClient starts at a random request ID, nearly all of them take four bytes
+REQUEST_ID = 0x40000000
+
+# Columns of the common config subtree (1) are scalars
+_SCALAR_SUBTREE = 1
+
+
+def _unit_id(unit):
+    return chr(ord('A') + unit - 1)
+
+
+# The table rows of a section by index, with the ID the PDU gives the row
+ROWS = {
+    'sentry4_pdu_status': lambda topology: [
+        ((unit,), _unit_id(unit)) for unit in range(1, topology.units + 1)
+    ],
+    'sentry4_pdu_inlet': lambda topology: [
+        ((unit, cord), f'{_unit_id(unit)}{_unit_id(cord)}')
+        for unit in range(1, topology.units + 1)
+        for cord in range(1, topology.cords + 1)
+    ],
+    'sentry4_pdu_outlet': lambda topology: [
+        ((unit, cord, outlet), f'{_unit_id(unit)}{_unit_id(cord)}{outlet}')
+        for unit in range(1, topology.units + 1)
+        for cord in range(1, topology.cords + 1)
+        for outlet in range(1, topology.outlets + 1)
+    ],
+    'sentry4_pdu_temp': lambda topology: [
+        ((unit, sensor), f'{_unit_id(unit)}{sensor}')
+        for unit in range(1, topology.units + 1)
+        for sensor in range(1, topology.temp_sensors + 1)
+    ],
+    'sentry4_pdu_humid': lambda topology: [
+        ((unit, sensor), f'{_unit_id(unit)}{sensor}')
+        for unit in range(1, topology.units + 1)
+        for sensor in range(1, topology.humid_sensors + 1)
+    ],
+}
+
+
+def topology_data(tables, topology, name_length=20, value=1234):
+    # The MIB of a PDU with this topology, restricted to the columns of tables.
+    # String columns get the row ID, or a name of name_length characters when
+    # they are not the key, numeric columns value.
+    data = {}
+
+    for (name, table) in tables.items():
+        base = oid_from_str(table.fetch.base)
+        rows = ROWS[name](topology)
+
+        for column in table.columns:
+            column_oid = base + oid_from_str(column.oid)
+
+            if column_oid[len(base)] == _SCALAR_SUBTREE:
+                data[column_oid + (0,)] = integer(0)
+                continue
+
+            for (index, row_id) in rows:
+                if column.type is not str:
+                    data[column_oid + index] = integer(value)
+                elif column.name == table.key:
+                    data[column_oid + index] = octet_string(row_id)
+                else:
+                    data[column_oid + index] = octet_string(f'{row_id}_'.ljust(name_length, 'x')[:name_length])
+
+    return data
+
+
+def walk_cost(data, oids, root, max_repetitions, version=VERSION_2C, community='public'):
+    # Replays SNMPClient.walk on data, oids are the sorted keys of data
+    def next_varbind(oid):
+        position = bisect.bisect_right(oids, oid)
+        return (oids[position], data[oids[position]]) if position < len(oids) else (oid, END_OF_MIB_VIEW)
+
+    (requests, sent, received) = (0, 0, 0)
+    oid = root
+
+    while True:
+        if version == VERSION_1:
+            request = Message(version, community, GET_NEXT_REQUEST, REQUEST_ID, 0, 0, [(oid, NULL)])
+            batch = [next_varbind(oid)]
+        else:
+            request = Message(version, community, GET_BULK_REQUEST, REQUEST_ID, 0, max_repetitions, [(oid, NULL)])
+            batch = []
+            for _repetition in range(max_repetitions):
+                batch.append(next_varbind(batch[-1][0] if batch else oid))
+
+        requests += 1
+        sent += len(encode_message(request))
+        received += len(encode_message(request._replace(pdu_type=RESPONSE, error_status=0, error_index=0, varbinds=batch)))
+
+        for (next_oid, value) in batch:
+            if value[0] == TAG_END_OF_MIB_VIEW or not oid_in_subtree(next_oid, root) or next_oid <= oid:
+                return Cost(requests, sent, received)
+            oid = next_oid
+
+
+def _columns(table):
+    base = oid_from_str(table.fetch.base)
+    return [base + oid_from_str(oid) for oid in table.fetch.oids]
+
+
+def fetch_budget(tables, topology, max_repetitions=10, version=VERSION_2C, community='public', name_length=20):
+    # Returns {section: (rows, columns, Cost)} of a full fetch
+    data = topology_data(tables, topology, name_length)
+    oids = sorted(data)
+    budget = {}
+
+    for (name, table) in tables.items():
+        costs = [walk_cost(data, oids, column, max_repetitions, version, community) for column in _columns(table)]
+        budget[name] = (len(ROWS[name](topology)), len(costs), Cost(*map(sum, zip(*costs))))
+
+    return budget
+
+
+def measure_budget(tables, topology, max_repetitions=10, version=VERSION_2C, community='public', name_length=20):
+    # Same as fetch_budget, but measured by walking a local SNMP stand-in
+    from .standin import SNMPStandIn
+
+    server = SNMPStandIn(topology_data(tables, topology, name_length))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    budget = {}
+    try:
+        for (name, table) in tables.items():
+            client = SNMPClient('127.0.0.1', server.port, community, version)
+            for column in _columns(table):
+                client.walk(column, max_repetitions)
+            budget[name] = (len(ROWS[name](topology)), len(table.fetch.oids), Cost(client.requests, client.bytes_sent, client.bytes_received))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return budget
+
+
+def _total(budget):
+    return Cost(*map(sum, zip(*(cost for (_rows, _columns, cost) in budget.values()))))
+
+
+def format_budget(budget, rtt=0.005, pdus=1, interval=60.0, measured=None):
+    lines = [f"{'Section':<20} {'Rows':>6} {'Cols':>5} {'Requests':>9} {'Sent':>9} {'Received':>10} {'Time':>8}"]
+
+    for (name, (rows, columns, cost)) in budget.items():
+        lines.append(f'{name:<20} {rows:>6} {columns:>5} {cost.requests:>9} {cost.bytes_sent:>9} {cost.bytes_received:>10} {cost.requests * rtt:>7.2f}s')
+
+    total = _total(budget)
+    lines.append(f"{'Per PDU':<33} {total.requests:>9} {total.bytes_sent:>9} {total.bytes_received:>10} {total.requests * rtt:>7.2f}s")
+
+    if pdus > 1:
+        lines.append(
+            f"{f'Per site ({pdus} PDUs)':<33} {total.requests * pdus:>9} {total.bytes_sent * pdus:>9} {total.bytes_received * pdus:>10}"
+            f" {total.requests * pdus / interval:>6.1f}/s"
+        )
+
+    if measured is not None:
+        lines.append('')
+        lines.append(f"{'Stand-in':<20} {'Requests':>9} {'Sent':>9} {'Received':>10}")
+        for (name, (_rows, _columns, cost)) in measured.items():
+            model = budget[name][2]
+            lines.append(f'{name:<20} {cost.requests - model.requests:>+9} {cost.bytes_sent - model.bytes_sent:>+9} {cost.bytes_received - model.bytes_received:>+10}')
+
+    return '\n'.join(lines)
+
+
+def verify(budget, measured, tolerance=0.01):
+    # The request counts must match, the bytes may differ by the request IDs
+    for (name, (_rows, _columns, model)) in budget.items():
+        cost = measured[name][2]
+        if cost.requests != model.requests:
+            return False
+        if abs(cost.bytes_sent - model.bytes_sent) > tolerance * model.bytes_sent:
+            return False
+        if abs(cost.bytes_received - model.bytes_received) > tolerance * model.bytes_received:
+            return False
+    return True
+
+
+def main(argv=None):
+    from .sections import SECTIONS
+
+    parser = argparse.ArgumentParser(description='SNMP request budget of a full fetch of the Sentry4 sections')
+    parser.add_argument('--units', type=int, default=1, help='Units per PDU, e.g. 2 for a master and a link unit (default: %(default)s)')
+    parser.add_argument('--cords', type=int, default=1, help='Input cords per unit (default: %(default)s)')
+    parser.add_argument('--outlets', type=int, default=24, help='Outlets per input cord (default: %(default)s)')
+    parser.add_argument('--temp-sensors', type=int, default=1, help='Temperature sensors per unit (default: %(default)s)')
+    parser.add_argument('--humid-sensors', type=int, default=1, help='Humidity sensors per unit (default: %(default)s)')
+    parser.add_argument('--name-length', type=int, default=20, help='Length of the outlet, cord, unit and sensor names (default: %(default)s)')
+    parser.add_argument('--max-repetitions', type=int, default=10, help='GetBulk max-repetitions, "Bulk walk: Number of OIDs per bulk" in Checkmk (default: %(default)s)')
+    parser.add_argument('--snmp-version', choices=['1', '2c'], default='2c', help='SNMP version (default: %(default)s)')
+    parser.add_argument('--community', default='public', help='SNMP community, its length counts (default: %(default)s)')
+    parser.add_argument('--rtt', type=float, default=5.0, help='Round trip time to the PDUs in ms (default: %(default)s)')
+    parser.add_argument('--pdus', type=int, default=1, help='PDUs per site (default: %(default)s)')
+    parser.add_argument('--interval', type=float, default=60.0, help='Check interval in seconds (default: %(default)s)')
+    parser.add_argument('--verify', action='store_true', help='Compare with walks of a local SNMP stand-in')
+    args = parser.parse_args(argv)
+
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    topology = Topology(args.units, args.cords, args.outlets, args.temp_sensors, args.humid_sensors)
+    options = (args.max_repetitions, VERSION_1 if args.snmp_version == '1' else VERSION_2C, args.community, args.name_length)
+
+    budget = fetch_budget(tables, topology, *options)
+    measured = measure_budget(tables, topology, *options) if args.verify else None
+
+    sys.stdout.write(format_budget(budget, args.rtt / 1000, args.pdus, args.interval, measured) + '\n')
+
+    if measured is not None and not verify(budget, measured):
+        sys.stderr.write('The stand-in walks do not match the computed budget\n')
+        return 1
+
+    return 0
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Adaptive sampling collector for Sentry4 PDUs.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Polls each PDU with the targeted GET requests of sentry4_pdu.fetch and keeps
+# the latest values as agent output in a cache file per PDU. The poll interval
+# adapts to the readings:
+#   - 'min_interval' while an outlet current or a temperature moves by more
+#     than 'current_delta'/'temperature_delta', or a status is not normal
+#   - otherwise doubled after every poll, up to 'max_interval'
+#   - after a failed poll 'min_interval', doubled with every further failure
+#     up to 'max_interval', so unreachable PDUs are not hammered
+# Checkmk reads the cache files with the datasource program sentry4_pdu_cache.
+# With a samples directory the outlet and input cord values of every poll are
+# also kept in a ring buffer file per PDU, see sentry4_pdu.ringbuffer. With
+# 'shared_memory' the parsed sections are published for other processes, see
+# sentry4_pdu.shared.
+
+import argparse
+import heapq
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from .agent import write_sections
+from .fetch import Sentry4Fetcher
+from .ringbuffer import SampleStore
+from .shared import SharedModelPublisher
+from .snmp import VERSION_1, VERSION_2C, SNMPClient, SNMPError
+
+LOGGER = logging.getLogger('sentry4_pdu_collector')
+
+# Sentry4-MIB DeviceStatus normal(0) and disabled(1)
+NORMAL_STATUSES = (0, 1)
+
+# The unit section keeps its status as 'Status', all others as 'status'
+STATUS_FIELDS = {'sentry4_pdu_status': 'Status'}
+
+
+def cache_dir():
+    return os.path.join(os.environ.get('OMD_ROOT', '/tmp'), 'tmp', 'check_mk', 'sentry4_pdu', 'collector')
+
+
+def readings(parsed):
+    # The values whose changes make the collector poll faster
+    currents = {key: outlet['current'] for (key, outlet) in parsed.get('sentry4_pdu_outlet', {}).items()}
+    temperatures = {key: sensor['value'] for (key, sensor) in parsed.get('sentry4_pdu_temp', {}).items()}
+    statuses = {
+        (name, key): entry[STATUS_FIELDS.get(name, 'status')]
+        for (name, section) in parsed.items()
+        for (key, entry) in section.items()
+        if entry.get(STATUS_FIELDS.get(name, 'status')) is not None
+    }
+    return (currents, temperatures, statuses)
+
+
+def _moved(previous, current, delta):
+    return any(
+        value is not None and previous.get(key) is not None and abs(value - previous[key]) > delta
+        for (key, value) in current.items()
+    )
+
+
+def is_active(previous, current, current_delta=0.1, temperature_delta=0.5):
+    (currents, temperatures, statuses) = current
+
+    if any(status not in NORMAL_STATUSES for status in statuses.values()):
+        return True
+
+    if previous is None:
+        return False
+
+    return _moved(previous[0], currents, current_delta) or _moved(previous[1], temperatures, temperature_delta)
+
+
+class PDUCollector:
+    def __init__(self, host, fetcher, parse_functions, cache_file, min_interval=15.0, max_interval=300.0, current_delta=0.1, temperature_delta=0.5, store=None, shared=None):
+        self.host = host
+        self.fetcher = fetcher
+        self.parse_functions = parse_functions
+        self.cache_file = cache_file
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.current_delta = current_delta
+        self.temperature_delta = temperature_delta
+        self.store = store
+        self.shared = shared
+
+        self.interval = min_interval
+        self.readings = None
+        self.failures = 0
+
+    def _write_cache(self, string_tables):
+        output = StringIO()
+        write_sections(string_tables, output)
+
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        with open(f'{self.cache_file}.new', 'w') as cache_file:
+            cache_file.write(output.getvalue())
+        os.replace(f'{self.cache_file}.new', self.cache_file)
+
+    def poll(self):
+        # Returns the seconds until the next poll
+        try:
+            string_tables = self.fetcher.fetch()
+        except SNMPError as e:
+            LOGGER.warning('Polling %s failed: %s', self.host, e)
+            self.interval = min(self.min_interval * 2 ** self.failures, self.max_interval)
+            self.failures += 1
+            return self.interval
+
+        if self.failures:
+            self.interval = self.min_interval
+            self.failures = 0
+
+        self._write_cache(string_tables)
+
+        parsed = {name: parse_function(string_tables[name]) for (name, parse_function) in self.parse_functions.items()}
+        if self.store is not None:
+            self.store.append(self.host, time.time(), parsed)
+        if self.shared is not None:
+            self.shared.publish(time.time(), parsed)
+
+        current = readings(parsed)
+
+        if is_active(self.readings, current, self.current_delta, self.temperature_delta):
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+        self.readings = current
+        LOGGER.debug('Polled %s, next poll in %.0fs', self.host, self.interval)
+        return self.interval
+
+
+def run(collectors, stop, workers=4, clock=time.monotonic):
+    # Polls every collector when it is due until stop is set
+    due = [(clock(), position) for position in range(len(collectors))]
+    heapq.heapify(due)
+    lock = threading.Lock()
+
+    def poll(position):
+        try:
+            interval = collectors[position].poll()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('Polling %s failed', collectors[position].host)
+            interval = collectors[position].max_interval
+        with lock:
+            heapq.heappush(due, (clock() + interval, position))
+
+    with ThreadPoolExecutor(workers) as executor:
+        while not stop.is_set():
+            with lock:
+                ready = []
+                while due and due[0][0] <= clock():
+                    ready.append(heapq.heappop(due)[1])
+                wait = due[0][0] - clock() if due else 1.0
+
+            for position in ready:
+                executor.submit(poll, position)
+
+            stop.wait(min(max(wait, 0.1), 1.0))
+
+
+def parse_host(host):
+    # 'name=address' or a name that is also the address
+    (name, _sep, address) = host.partition('=')
+    return (name, address or name)
+
+
+def main(argv=None):
+    from .sections import SECTIONS
+
+    parser = argparse.ArgumentParser(description='Adaptive sampling collector for Sentry4 PDUs')
+    parser.add_argument('hosts', nargs='+', metavar='HOST[=ADDRESS]', help='Checkmk host name and address of a PDU')
+    parser.add_argument('--community', default='public', help='SNMP community (default: %(default)s)')
+    parser.add_argument('--snmp-version', choices=['1', '2c'], default='2c', help='SNMP version (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=1.0, help='SNMP timeout in seconds (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=2, help='SNMP retries (default: %(default)s)')
+    parser.add_argument('--max-oids', type=int, default=40, help='OIDs per GET request (default: %(default)s)')
+    parser.add_argument('--full-walk-interval', type=float, default=3600.0, help='Seconds between full walks (default: %(default)s)')
+    parser.add_argument('--min-interval', type=float, default=15.0, help='Poll interval while readings move (default: %(default)s)')
+    parser.add_argument('--max-interval', type=float, default=300.0, help='Poll interval of flat readings (default: %(default)s)')
+    parser.add_argument('--current-delta', type=float, default=0.1, help='Outlet current change in A that counts as moving (default: %(default)s)')
+    parser.add_argument('--temperature-delta', type=float, default=0.5, help='Temperature change in °C that counts as moving (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=4, help='PDUs polled at the same time (default: %(default)s)')
+    parser.add_argument('--cache-dir', default=cache_dir(), help='Directory of the cache files (default: %(default)s)')
+    parser.add_argument('--samples-dir', help='Keep the outlet and input cord samples in a ring buffer file per PDU in this directory')
+    parser.add_argument('--samples-capacity', type=int, default=30000, help='Samples kept per PDU (default: %(default)s, 5 days at 15s)')
+    parser.add_argument('--shared-memory', action='store_true', help='Publish the parsed sections of every poll in shared memory, e.g. for sentry4_pdu_exporter --from-collector')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log debug output')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    parse_functions = {name: parse_function for (name, (_table, parse_function)) in SECTIONS.items()}
+    version = VERSION_1 if args.snmp_version == '1' else VERSION_2C
+    store = SampleStore(args.samples_dir, args.samples_capacity) if args.samples_dir else None
+
+    collectors = []
+    for (name, address) in map(parse_host, args.hosts):
+        client = SNMPClient(address, community=args.community, version=version, timeout=args.timeout, retries=args.retries)
+        fetcher = Sentry4Fetcher(client, tables, os.path.join(args.cache_dir, f'{name}.json'), args.full_walk_interval, args.max_oids)
+        collectors.append(PDUCollector(
+            name, fetcher, parse_functions, os.path.join(args.cache_dir, f'{name}.txt'),
+            args.min_interval, args.max_interval, args.current_delta, args.temperature_delta, store,
+            SharedModelPublisher(name) if args.shared_memory else None,
+        ))
+
+    stop = threading.Event()
+    LOGGER.info('Collecting %d PDUs', len(collectors))
+
+    try:
+        run(collectors, stop, args.workers)
+    except KeyboardInterrupt:
+        stop.set()
+
+    if store is not None:
+        store.close()
+    for collector in collectors:
+        if collector.shared is not None:
+            collector.shared.close()
+
+    return 0
+
+
+def cache_main(argv=None):
+    parser = argparse.ArgumentParser(description='Prints the cached agent output of a Sentry4 PDU collected by sentry4_pdu_collector')
+    parser.add_argument('host', help='Checkmk host name of the PDU')
+    parser.add_argument('--max-age', type=float, default=600.0, help='Seconds after which the cache counts as stale (default: %(default)s)')
+    parser.add_argument('--cache-dir', default=cache_dir(), help='Directory of the cache files (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    cache_file = os.path.join(args.cache_dir, f'{args.host}.txt')
+
+    try:
+        age = time.time() - os.stat(cache_file).st_mtime
+        with open(cache_file) as cached:
+            output = cached.read()
+    except OSError as e:
+        sys.stderr.write(f'No cached data for {args.host}: {e}\n')
+        return 1
+
+    if age > args.max_age:
+        sys.stderr.write(f'Cached data for {args.host} is {age:.0f}s old, is sentry4_pdu_collector running?\n')
+        return 1
+
+    sys.stdout.write(output)
+    return 0
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Prometheus/OpenMetrics exporter for Sentry4 PDUs.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Serves the values of the Sentry4 sections as gauges on /metrics. The PDUs
+# are fetched with the targeted GET requests of sentry4_pdu.fetch and parsed
+# by the parse functions of the checks, so the scaling is the same as in
+# Checkmk. The state of every service the checks would discover is exported
+# as sentry4_service_state.
+#
+# Each PDU is fetched at most once per 'ttl' seconds, scrapes in between are
+# answered from the cache. PDUs due for a fetch are fetched concurrently.
+# With 'from_collector' the PDUs are not fetched, the parsed sections the
+# collector publishes in shared memory are exported instead.
+
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cmk.base.plugins.agent_based import (
+    sentry4_pdu_humid,
+    sentry4_pdu_inlet,
+    sentry4_pdu_outlet,
+    sentry4_pdu_status,
+    sentry4_pdu_temp,
+)
+from cmk.base.plugins.agent_based.agent_based_api.v1 import Result, State
+
+from .fetch import Sentry4Fetcher
+from .shared import attach
+from .snmp import VERSION_1, VERSION_2C, SNMPClient, SNMPError
+
+LOGGER = logging.getLogger('sentry4_pdu_exporter')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Discovery function, check function and whether the check takes params per section
+CHECKS = {
+    'sentry4_pdu_status': (sentry4_pdu_status.discover_sentry4_pdu_status, sentry4_pdu_status.check_sentry4_pdu_status, False),
+    'sentry4_pdu_inlet': (sentry4_pdu_inlet.discover_sentry4_pdu_inlet, sentry4_pdu_inlet.check_sentry4_pdu_inlet, False),
+    'sentry4_pdu_outlet': (sentry4_pdu_outlet.discover_sentry4_pdu_outlet, sentry4_pdu_outlet.check_sentry4_pdu_outlet, False),
+    'sentry4_pdu_temp': (sentry4_pdu_temp.discover_sentry4_pdu_temp, sentry4_pdu_temp.check_sentry4_pdu_temp, True),
+    'sentry4_pdu_humid': (sentry4_pdu_humid.discover_sentry4_pdu_humid, sentry4_pdu_humid.check_sentry4_pdu_humid, True),
+}
+
+# Items from the ID only, so the series stay the same when an outlet is relabeled
+DISCOVERY_PARAMETERS = {'item_naming': 'id', 'environment_grouping': 'sensor'}
+
+# Metric name, help, section, (ID label, name field), value field, scale
+GAUGES = [
+    ('sentry4_unit_status', 'Unit status (Sentry4-MIB DeviceStatus)', 'sentry4_pdu_status', ('unit', 'Name'), 'Status', 1),
+    ('sentry4_inlet_state', 'Input cord state (Sentry4-MIB DeviceState)', 'sentry4_pdu_inlet', ('cord', 'cord_name'), 'state', 1),
+    ('sentry4_inlet_status', 'Input cord status (Sentry4-MIB DeviceStatus)', 'sentry4_pdu_inlet', ('cord', 'cord_name'), 'status', 1),
+    ('sentry4_inlet_active_power_watts', 'Input cord active power', 'sentry4_pdu_inlet', ('cord', 'cord_name'), 'active_power', 1),
+    ('sentry4_inlet_apparent_power_voltamperes', 'Input cord apparent power', 'sentry4_pdu_inlet', ('cord', 'cord_name'), 'apparent_power', 1),
+    ('sentry4_inlet_power_factor', 'Input cord power factor', 'sentry4_pdu_inlet', ('cord', 'cord_name'), 'power_factor', 1),
+    ('sentry4_inlet_power_utilized_ratio', 'Input cord power utilized', 'sentry4_pdu_inlet', ('cord', 'cord_name'), 'power_utilized', 0.001),
+    ('sentry4_outlet_state', 'Outlet state (Sentry4-MIB DeviceState)', 'sentry4_pdu_outlet', ('outlet', 'outlet_name'), 'state', 1),
+    ('sentry4_outlet_status', 'Outlet status (Sentry4-MIB DeviceStatus)', 'sentry4_pdu_outlet', ('outlet', 'outlet_name'), 'status', 1),
+    ('sentry4_outlet_current_amperes', 'Outlet current', 'sentry4_pdu_outlet', ('outlet', 'outlet_name'), 'current', 1),
+    ('sentry4_outlet_voltage_volts', 'Outlet voltage', 'sentry4_pdu_outlet', ('outlet', 'outlet_name'), 'voltage', 1),
+    ('sentry4_outlet_active_power_watts', 'Outlet active power', 'sentry4_pdu_outlet', ('outlet', 'outlet_name'), 'active_power', 1),
+    ('sentry4_outlet_apparent_power_voltamperes', 'Outlet apparent power', 'sentry4_pdu_outlet', ('outlet', 'outlet_name'), 'apparent_power', 1),
+    ('sentry4_temperature_celsius', 'Temperature sensor value', 'sentry4_pdu_temp', ('sensor', 'name'), 'value', 1),
+    ('sentry4_temperature_status', 'Temperature sensor status (Sentry4-MIB DeviceStatus)', 'sentry4_pdu_temp', ('sensor', 'name'), 'status', 1),
+    ('sentry4_humidity_percent', 'Humidity sensor value', 'sentry4_pdu_humid', ('sensor', 'name'), 'value', 1),
+    ('sentry4_humidity_status', 'Humidity sensor status (Sentry4-MIB DeviceStatus)', 'sentry4_pdu_humid', ('sensor', 'name'), 'status', 1),
+]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels):
+    return ','.join(f'{name}="{_escape(value)}"' for (name, value) in labels)
+
+
+def service_states(parsed):
+    # The state the checks give every service they would discover, by item
+    states = {}
+
+    for (name, (discover, check, takes_params)) in CHECKS.items():
+        section = parsed.get(name)
+        if not section:
+            continue
+
+        for service in discover(DISCOVERY_PARAMETERS, section):
+            try:
+                results = check(service.item, {}, section) if takes_params else check(service.item, section)
+                results = [result.state for result in results if isinstance(result, Result)]
+            except Exception:  # pylint: disable=broad-except
+                # Checkmk makes a crashing check UNKNOWN as well
+                LOGGER.debug('Check of %s failed', service.item, exc_info=True)
+                results = [State.UNKNOWN]
+
+            if results:
+                states[service.item] = State.worst(*results).value
+
+    return states
+
+
+class PDUTarget:
+    def __init__(self, host, fetcher, parse_functions, ttl=10.0, clock=time.monotonic):
+        self.host = host
+        self.fetcher = fetcher
+        self.parse_functions = parse_functions
+        self.ttl = ttl
+        self.clock = clock
+
+        self.parsed = None
+        self.fetched = None
+        self.duration = 0.0
+        self.fetches = 0
+        self._lock = threading.Lock()
+
+    def collect(self):
+        # Concurrent scrapes wait for a fetch in progress instead of starting their own
+        with self._lock:
+            now = self.clock()
+            if self.fetched is not None and now - self.fetched < self.ttl:
+                return self.parsed
+
+            start = time.monotonic()
+            try:
+                string_tables = self.fetcher.fetch()
+                self.parsed = {name: parse_function(string_tables[name]) for (name, parse_function) in self.parse_functions.items()}
+            except SNMPError as e:
+                LOGGER.warning('Fetching %s failed: %s', self.host, e)
+                self.parsed = None
+            except Exception:  # pylint: disable=broad-except
+                # A bug or unexpected data of one PDU must not fail the whole scrape
+                LOGGER.exception('Fetching %s failed', self.host)
+                self.parsed = None
+
+            self.duration = time.monotonic() - start
+            self.fetched = now
+            self.fetches += 1
+            return self.parsed
+
+
+class SharedPDUTarget:
+    """A PDU polled by sentry4_pdu_collector --shared-memory"""
+
+    def __init__(self, host, max_age=600.0, clock=time.time):
+        self.host = host
+        self.max_age = max_age
+        self.clock = clock
+
+        self.duration = 0.0
+
+    def collect(self):
+        try:
+            model = attach(self.host)
+            if model is None:
+                return None
+
+            with model:
+                if self.clock() - model.timestamp > self.max_age:
+                    return None
+                return model.sections()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('Reading the shared model of %s failed', self.host)
+            return None
+
+
+class Sentry4Exporter:
+    def __init__(self, targets, workers=8):
+        self.targets = targets
+        self._executor = ThreadPoolExecutor(workers)
+
+    def samples(self):
+        # Returns {metric: (help, [(labels, value)])} of all targets
+        families = {name: (help_text, []) for (name, help_text, *_spec) in GAUGES}
+        families['sentry4_service_state'] = ('State of the Checkmk service (0 OK, 1 WARN, 2 CRIT, 3 UNKNOWN)', [])
+        families['sentry4_up'] = ('Whether the last fetch of the PDU succeeded', [])
+        families['sentry4_fetch_duration_seconds'] = ('Duration of the last fetch of the PDU', [])
+
+        for (target, parsed) in zip(self.targets, self._executor.map(lambda target: target.collect(), self.targets)):
+            pdu = (('pdu', target.host),)
+            families['sentry4_up'][1].append((pdu, 0 if parsed is None else 1))
+            families['sentry4_fetch_duration_seconds'][1].append((pdu, target.duration))
+
+            if parsed is None:
+                continue
+
+            for (name, _help_text, section_name, (id_label, name_field), field, scale) in GAUGES:
+                for (key, entry) in parsed.get(section_name, {}).items():
+                    if entry.get(field) is not None:
+                        families[name][1].append((pdu + ((id_label, key), ('name', entry[name_field])), entry[field] * scale))
+
+            for (item, state) in service_states(parsed).items():
+                families['sentry4_service_state'][1].append((pdu + (('service', item),), state))
+
+        return families
+
+    def render(self, openmetrics=False):
+        lines = []
+
+        for (name, (help_text, samples)) in self.samples().items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(f'{name}{{{_labels(labels)}}} {value}' for (labels, value) in samples)
+
+        if openmetrics:
+            lines.append('# EOF')
+
+        return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+        body = self.server.exporter.render(openmetrics).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        LOGGER.debug('%s %s', self.client_address[0], format % args)
+
+
+class ExporterServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, exporter):
+        self.exporter = exporter
+        super().__init__(server_address, _MetricsHandler)
+
+
+def main(argv=None):
+    from .collector import parse_host
+    from .sections import SECTIONS
+
+    parser = argparse.ArgumentParser(description='Prometheus/OpenMetrics exporter for Sentry4 PDUs')
+    parser.add_argument('hosts', nargs='+', metavar='HOST[=ADDRESS]', help='Name (the pdu label) and address of a PDU')
+    parser.add_argument('--listen', default='0.0.0.0', help='Address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=9841, help='HTTP port to listen on (default: %(default)s)')
+    parser.add_argument('--ttl', type=float, default=10.0, help='Seconds the values of a PDU are cached between scrapes (default: %(default)s)')
+    parser.add_argument('--community', default='public', help='SNMP community (default: %(default)s)')
+    parser.add_argument('--snmp-version', choices=['1', '2c'], default='2c', help='SNMP version (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=1.0, help='SNMP timeout in seconds (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=1, help='SNMP retries (default: %(default)s)')
+    parser.add_argument('--max-oids', type=int, default=40, help='OIDs per GET request (default: %(default)s)')
+    parser.add_argument('--full-walk-interval', type=float, default=3600.0, help='Seconds between full walks (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=8, help='PDUs fetched at the same time (default: %(default)s)')
+    parser.add_argument('--state-dir', default=os.path.join(os.environ.get('OMD_ROOT', '/tmp'), 'tmp', 'check_mk', 'sentry4_pdu', 'exporter'), help='Directory of the index state files (default: %(default)s)')
+    parser.add_argument('--from-collector', action='store_true', help='Export what sentry4_pdu_collector --shared-memory publishes instead of fetching the PDUs')
+    parser.add_argument('--max-age', type=float, default=600.0, help='Seconds after which the data of the collector counts as stale (default: %(default)s)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log debug output')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    parse_functions = {name: parse_function for (name, (_table, parse_function)) in SECTIONS.items()}
+    version = VERSION_1 if args.snmp_version == '1' else VERSION_2C
+
+    targets = []
+    for (name, address) in map(parse_host, args.hosts):
+        if args.from_collector:
+            targets.append(SharedPDUTarget(name, args.max_age))
+            continue
+
+        client = SNMPClient(address, community=args.community, version=version, timeout=args.timeout, retries=args.retries)
+        fetcher = Sentry4Fetcher(client, tables, os.path.join(args.state_dir, f'{name}.json'), args.full_walk_interval, args.max_oids)
+        targets.append(PDUTarget(name, fetcher, parse_functions, args.ttl))
+
+    with ExporterServer((args.listen, args.port), Sentry4Exporter(targets, args.workers)) as server:
+        LOGGER.info('Listening on %s:%s', args.listen, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Fetches the Sentry4 tables of a PDU with targeted GET requests.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# A full fetch walks every column of every Sentry4 table with GetBulk. Once the
+# indexes of the outlets, cords and sensors are known, the same data can be
+# read with batched GET requests for exactly these indexes. Rows without a
+# reading (the sentinel values of the column specs, e.g. disconnected temperature
+# sensors) are left out. A full walk is done again
+#   - every 'full_walk_interval' seconds, to pick up new outlets and sensors
+#   - when a GET request hits an index that no longer exists or fails with
+#     any other error status (tooBig, genErr, ...)
+#   - when no indexes are known yet, or they were stored for other columns
+#     (e.g. after a plugin update added a column or section)
+# The indexes and the columns they were read from are kept in a JSON state
+# file per PDU.
+
+import json
+import os
+import time
+
+from .snmp import (
+    ERROR_NO_SUCH_NAME,
+    EXCEPTION_TAGS,
+    GET_REQUEST,
+    NULL,
+    decode_value,
+    oid_from_str,
+)
+
+
+class GetFailed(Exception):
+    pass
+
+
+class IndexMissing(GetFailed):
+    pass
+
+
+def _value_to_str(value):
+    decoded = decode_value(value)
+    return '' if decoded is None else str(decoded)
+
+
+def string_table(columns):
+    # Builds the rows the SNMP fetcher of Checkmk would pass to the parse function
+    # from one {index: value} dict per column
+    indexes = sorted(set().union(*columns))
+    return [[column.get(index, '') for column in columns] for index in indexes]
+
+
+class Sentry4Fetcher:
+    def __init__(self, client, tables, state_file, full_walk_interval=3600.0, max_oids=40, max_repetitions=25, clock=time.time):
+        self.client = client
+        self.tables = tables
+        self.state_file = state_file
+        self.full_walk_interval = full_walk_interval
+        self.max_oids = max_oids
+        self.max_repetitions = max_repetitions
+        self.clock = clock
+
+        self.full_walk = False
+
+    def _columns(self, table):
+        base = oid_from_str(table.fetch.base)
+        return [base + oid_from_str(oid) for oid in table.fetch.oids]
+
+    def _layout(self):
+        # The columns fetched per section, stored with the indexes
+        return {name: ['.'.join(map(str, column)) for column in self._columns(table)] for (name, table) in self.tables.items()}
+
+    def _load_state(self):
+        try:
+            with open(self.state_file) as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        with open(f'{self.state_file}.new', 'w') as state_file:
+            json.dump(state, state_file)
+        os.replace(f'{self.state_file}.new', self.state_file)
+
+    def walk(self):
+        values = {}
+        for (name, table) in self.tables.items():
+            values[name] = []
+            for column in self._columns(table):
+                (varbinds, _successor) = self.client.walk(column, self.max_repetitions)
+                values[name].append({oid[len(column):]: _value_to_str(value) for (oid, value) in varbinds})
+        return values
+
+    def get(self, indexes):
+        requests = []
+        for (name, table) in self.tables.items():
+            for (position, column) in enumerate(self._columns(table)):
+                for index in indexes[name][position]:
+                    requests.append((name, position, tuple(index), column + tuple(index)))
+
+        values = {name: [{} for _oid in table.fetch.oids] for (name, table) in self.tables.items()}
+
+        for start in range(0, len(requests), self.max_oids):
+            batch = requests[start:start + self.max_oids]
+            response = self.client.request(GET_REQUEST, [(oid, NULL) for (_name, _position, _index, oid) in batch])
+
+            if response.error_status == ERROR_NO_SUCH_NAME and 0 < response.error_index <= len(batch):
+                raise IndexMissing(batch[response.error_index - 1][3])
+
+            if response.error_status:
+                raise GetFailed(f'error status {response.error_status} at index {response.error_index}')
+
+            if len(response.varbinds) != len(batch):
+                raise GetFailed(f'{len(response.varbinds)} of {len(batch)} values returned')
+
+            for ((name, position, index, oid), (_oid, value)) in zip(batch, response.varbinds):
+                if value[0] in EXCEPTION_TAGS:
+                    raise IndexMissing(oid)
+                values[name][position][index] = _value_to_str(value)
+
+        return values
+
+    def _indexes(self, values):
+        # The indexes per column of the rows with a reading
+        indexes = {}
+
+        for (name, table) in self.tables.items():
+            columns = values[name]
+            skipped = set()
+
+            for (position, column) in enumerate(table.columns):
+                if column.sentinels:
+                    skipped.update(index for (index, value) in columns[position].items() if value in column.sentinels)
+
+            indexes[name] = [[list(index) for index in sorted(column) if index not in skipped] for column in columns]
+
+        return indexes
+
+    def _stored_indexes(self, state, now):
+        # The indexes of a current state for the configured columns, None when
+        # a full walk is due or the state is malformed
+        try:
+            if now - state['walked'] >= self.full_walk_interval or state['columns'] != self._layout():
+                return None
+
+            indexes = state['indexes']
+            for (name, table) in self.tables.items():
+                columns = indexes[name]
+                if len(columns) != len(table.fetch.oids):
+                    return None
+                if not all(isinstance(index, list) and all(isinstance(part, int) for part in index) for column in columns for index in column):
+                    return None
+        except (KeyError, TypeError):
+            return None
+
+        return indexes
+
+    def fetch(self):
+        now = self.clock()
+        indexes = self._stored_indexes(self._load_state(), now)
+        self.full_walk = True
+
+        if indexes is not None:
+            try:
+                values = self.get(indexes)
+                self.full_walk = False
+            except GetFailed:
+                pass
+
+        if self.full_walk:
+            values = self.walk()
+            self._save_state({'walked': now, 'columns': self._layout(), 'indexes': self._indexes(values)})
+
+        return {name: string_table(columns) for (name, columns) in values.items()}
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Caching SNMP proxy for Sentry4 PDUs polled by several monitoring sites.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Monitoring sites point their SNMP requests for a PDU at the proxy and use
+# '<community>@<pdu address>[:<port>]' as community. Requests inside the
+# Sentry4 tables fetched by this package are answered from a per PDU cache:
+#   - monitor subtrees (values, states) are walked again after 'ttl' seconds
+#   - config subtrees (IDs, names, thresholds) are only walked again when
+#     st4SystemConfigModifiedCount changes, which is checked every 'ttl' seconds
+# Concurrent requests for a PDU wait for a walk in progress instead of starting
+# their own. Requests for a subtree that could not be walked yet, and all other
+# Get, GetNext and GetBulk requests are forwarded to the PDU. Only PDUs whose address is in 'allowed' are proxied, and Set requests
+# and all other PDU types are dropped.
+
+import argparse
+import bisect
+import logging
+import socketserver
+import threading
+import time
+
+from .snmp import (
+    END_OF_MIB_VIEW,
+    GET_BULK_REQUEST,
+    GET_NEXT_REQUEST,
+    GET_REQUEST,
+    RESPONSE,
+    SNMPClient,
+    SNMPError,
+    TAG_END_OF_MIB_VIEW,
+    VERSION_2C,
+    Message,
+    decode_message,
+    encode_message,
+    encode_varbind,
+    oid_from_str,
+    oid_in_subtree,
+)
+
+LOGGER = logging.getLogger('sentry4_pdu_proxy')
+
+# Stay below the maximum UDP payload when answering GetBulk requests from the cache
+MAX_RESPONSE_SIZE = 60000
+
+# Caches kept per PDU address for different communities and SNMP versions, the
+# oldest one is dropped for a new one
+MAX_CACHES_PER_ADDRESS = 4
+
+READ_REQUESTS = (GET_REQUEST, GET_NEXT_REQUEST, GET_BULK_REQUEST)
+
+
+def parse_address(address, default_port=161):
+    # 'host[:port]' as (host, port)
+    (host, _colon, port) = address.partition(':')
+    try:
+        return (host, int(port or default_port))
+    except ValueError:
+        raise SNMPError(f"Invalid port in '{address}'")
+
+
+class _Subtree:
+    # Readers do not hold the device lock while a walk may update the subtree,
+    # so the walked OIDs, values and successor are replaced as one tuple
+
+    def __init__(self, root):
+        self.root = root
+        self.walked = None
+        self._snapshot = None
+
+    def update(self, varbinds, successor, now):
+        self._snapshot = ([oid for (oid, _value) in varbinds], [value for (_oid, value) in varbinds], successor)
+        self.walked = now
+
+    def get(self, oid):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        (oids, values, _successor) = snapshot
+        index = bisect.bisect_left(oids, oid)
+        if index < len(oids) and oids[index] == oid:
+            return values[index]
+        return None
+
+    def get_next(self, oid):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+
+        (oids, values, successor) = snapshot
+        index = bisect.bisect_right(oids, oid)
+        if index < len(oids):
+            return (oids[index], values[index])
+        return successor or (oid, END_OF_MIB_VIEW)
+
+
+class DeviceCache:
+    """Cached Sentry4 subtrees of a single PDU"""
+
+    def __init__(self, client, config_subtrees, monitor_subtrees, config_oid, ttl=30.0, max_repetitions=25, clock=time.monotonic):
+        self.client = client
+        self.config_oid = config_oid
+        self.ttl = ttl
+        self.max_repetitions = max_repetitions
+        self.clock = clock
+
+        self._config = [_Subtree(root) for root in config_subtrees]
+        self._monitor = [_Subtree(root) for root in monitor_subtrees]
+        self._subtrees = sorted(self._config + self._monitor, key=lambda subtree: subtree.root)
+        self._config_counter = None
+        self._config_checked = None
+        self._lock = threading.Lock()
+
+        self.walks = 0
+
+    def subtree(self, oid):
+        for subtree in self._subtrees:
+            if oid_in_subtree(oid, subtree.root):
+                return subtree
+        return None
+
+    def _walk(self, subtrees, now):
+        for subtree in subtrees:
+            (varbinds, successor) = self.client.walk(subtree.root, self.max_repetitions)
+            subtree.update(varbinds, successor, now)
+            self.walks += 1
+
+    def refresh(self, subtree):
+        with self._lock:
+            now = self.clock()
+
+            if subtree in self._monitor:
+                if subtree.walked is None or now - subtree.walked >= self.ttl:
+                    self._walk([subtree], now)
+                return
+
+            # The counter and check time are only kept once the walk succeeded,
+            # a failed walk is retried with the next request
+            unwalked = any(subtree.walked is None for subtree in self._config)
+            if unwalked or self._config_checked is None or now - self._config_checked >= self.ttl:
+                counter = self.client.get([self.config_oid])[0][1]
+
+                if unwalked or counter != self._config_counter:
+                    LOGGER.info('Configuration of %s:%s changed, walking config subtrees', *self.client.address)
+                    self._walk(self._config, now)
+                    self._config_counter = counter
+
+                self._config_checked = now
+
+    def get(self, oid):
+        subtree = self.subtree(oid)
+        if subtree is None:
+            return None
+
+        self.refresh(subtree)
+        return subtree.get(oid)
+
+    def get_next(self, oid):
+        subtree = self.subtree(oid)
+        if subtree is None:
+            return None
+
+        self.refresh(subtree)
+        return subtree.get_next(oid)
+
+
+class Sentry4Proxy:
+    def __init__(self, config_subtrees, monitor_subtrees, config_oid, ttl=30.0, timeout=1.0, retries=2, max_repetitions=25, clock=time.monotonic, allowed=()):
+        self.config_subtrees = config_subtrees
+        self.monitor_subtrees = monitor_subtrees
+        self.config_oid = config_oid
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.max_repetitions = max_repetitions
+        self.clock = clock
+        self.allowed = {parse_address(address) for address in allowed}
+
+        self._devices = {}
+        self._lock = threading.Lock()
+
+        self.client_requests = 0
+        self.cache_hits = 0
+        self.forwarded = 0
+
+    def device(self, community, version):
+        (device_community, _at, target) = community.rpartition('@')
+        if not device_community:
+            raise SNMPError(f"Community '{community}' does not name a device ('<community>@<address>[:<port>]')")
+
+        address = parse_address(target)
+        if address not in self.allowed:
+            raise SNMPError(f'{address[0]}:{address[1]} is not an allowed PDU address')
+
+        key = address + (device_community, version)
+
+        with self._lock:
+            if key not in self._devices:
+                cached = [cached_key for cached_key in self._devices if cached_key[:2] == address]
+                if len(cached) >= MAX_CACHES_PER_ADDRESS:
+                    del self._devices[cached[0]]
+                client = SNMPClient(key[0], key[1], device_community, version, self.timeout, self.retries)
+                self._devices[key] = DeviceCache(client, self.config_subtrees, self.monitor_subtrees, self.config_oid, self.ttl, self.max_repetitions, self.clock)
+            return self._devices[key]
+
+    def device_requests(self):
+        return sum(device.client.requests for device in list(self._devices.values()))
+
+    def stats(self):
+        device_requests = self.device_requests()
+        return {
+            'client_requests': self.client_requests,
+            'cache_hits': self.cache_hits,
+            'forwarded': self.forwarded,
+            'hit_rate': self.cache_hits / self.client_requests if self.client_requests else 0.0,
+            'device_requests': device_requests,
+            'device_requests_saved': self.client_requests - device_requests,
+        }
+
+    def _answer_get(self, device, varbinds):
+        answer = []
+        for (oid, _value) in varbinds:
+            value = device.get(oid)
+            if value is None:
+                return None
+            answer.append((oid, value))
+        return answer
+
+    def _answer_get_next(self, device, varbinds):
+        answer = []
+        for (oid, _value) in varbinds:
+            varbind = device.get_next(oid)
+            if varbind is None:
+                return None
+            answer.append(varbind)
+        return answer
+
+    def _answer_get_bulk(self, device, request):
+        non_repeaters = max(0, min(request.error_status, len(request.varbinds)))
+        max_repetitions = max(0, request.error_index)
+
+        answer = self._answer_get_next(device, request.varbinds[:non_repeaters])
+        if answer is None:
+            return None
+
+        size = sum(len(encode_varbind(*varbind)) for varbind in answer)
+        row = list(request.varbinds[non_repeaters:])
+        rows = 0
+
+        while rows < max_repetitions and row:
+            next_row = []
+            for (oid, value) in row:
+                if value[0] == TAG_END_OF_MIB_VIEW:
+                    varbind = (oid, END_OF_MIB_VIEW)
+                else:
+                    varbind = device.get_next(oid)
+                if varbind is None:
+                    break
+                next_row.append(varbind)
+
+            if len(next_row) < len(row):
+                # Leaving the cached subtrees, a shorter response is fine for GetBulk
+                break
+
+            size += sum(len(encode_varbind(*varbind)) for varbind in next_row)
+            if size > MAX_RESPONSE_SIZE:
+                break
+
+            answer.extend(next_row)
+            row = next_row
+            rows += 1
+
+        if rows == 0 and len(request.varbinds) > non_repeaters:
+            return None
+
+        return answer
+
+    def handle(self, data):
+        request = decode_message(data)
+        if request.pdu_type not in READ_REQUESTS:
+            raise SNMPError(f'PDU type 0x{request.pdu_type:02x} is not proxied')
+
+        self.client_requests += 1
+
+        device = self.device(request.community, request.version)
+
+        answer = None
+        if request.pdu_type == GET_REQUEST:
+            answer = self._answer_get(device, request.varbinds)
+        elif request.pdu_type == GET_NEXT_REQUEST:
+            answer = self._answer_get_next(device, request.varbinds)
+        elif request.pdu_type == GET_BULK_REQUEST and request.version == VERSION_2C:
+            answer = self._answer_get_bulk(device, request)
+
+        if answer is not None:
+            self.cache_hits += 1
+            response = Message(request.version, request.community, RESPONSE, request.request_id, 0, 0, answer)
+        else:
+            self.forwarded += 1
+            forwarded = device.client.request(request.pdu_type, request.varbinds, request.error_status, request.error_index)
+            response = forwarded._replace(community=request.community, request_id=request.request_id)
+
+        return encode_message(response)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        (data, sock) = self.request
+        try:
+            response = self.server.proxy.handle(data)
+        except SNMPError as e:
+            LOGGER.warning('Dropping request from %s: %s', self.client_address[0], e)
+            return
+        sock.sendto(response, self.client_address)
+
+
+class ProxyServer(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+
+    def __init__(self, address, proxy):
+        self.proxy = proxy
+        super().__init__(address, _RequestHandler)
+
+
+def main(argv=None):
+    from .sections import CONFIG_MODIFIED_OID, table_subtrees
+
+    parser = argparse.ArgumentParser(description='Caching SNMP proxy for Sentry4 PDUs')
+    parser.add_argument('--listen', default='127.0.0.1', help='Address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=1161, help='UDP port to listen on (default: %(default)s)')
+    parser.add_argument('--allow', action='append', default=[], required=True, metavar='ADDRESS[:PORT]', help='Address of a PDU that may be proxied, repeat for every PDU')
+    parser.add_argument('--ttl', type=float, default=30.0, help='Seconds the values of a PDU are cached (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=1.0, help='SNMP timeout towards the PDUs in seconds (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=2, help='SNMP retries towards the PDUs (default: %(default)s)')
+    parser.add_argument('--max-repetitions', type=int, default=25, help='GetBulk max-repetitions towards the PDUs (default: %(default)s)')
+    parser.add_argument('--stats-interval', type=float, default=300.0, help='Seconds between statistics log lines (default: %(default)s)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log debug output')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    (config_subtrees, monitor_subtrees) = table_subtrees()
+    proxy = Sentry4Proxy(config_subtrees, monitor_subtrees, oid_from_str(CONFIG_MODIFIED_OID), args.ttl, args.timeout, args.retries, args.max_repetitions, allowed=args.allow)
+
+    with ProxyServer((args.listen, args.port), proxy) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        LOGGER.info('Listening on %s:%s', args.listen, args.port)
+
+        try:
+            while True:
+                time.sleep(args.stats_interval)
+                LOGGER.info('Statistics: %s', ', '.join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for (key, value) in proxy.stats().items()))
+        except KeyboardInterrupt:
+            server.shutdown()
+
+    return 0
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Memory-mapped ring buffers of outlet and input cord samples.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# One preallocated file per PDU holds the last 'capacity' samples of the outlet
+# currents and powers and the input cord powers, the values the outlet and
+# input cord checks see. Appending writes one slot after the previous one and
+# wraps around at the end, so writes stay sequential and the file size fixed.
+#
+# File layout, all little endian:
+#   header     magic, format version, capacity, channel count, data offset, count
+#   channels   JSON list of the channel names, e.g. "outlet:AA1:current"
+#   slots      'capacity' slots of a float64 timestamp and a float32 per channel,
+#              padded to 8 bytes. Missing values are NaN.
+# 'count' is the number of samples ever appended, the next slot is count % capacity.
+# It is updated after the slot is written, a reader may see the oldest slot
+# being overwritten while it reads.
+#
+# Readers get zero-copy NumPy views of the slots with RingBuffer.segments().
+# NumPy is only needed for these views.
+
+import json
+import math
+import mmap
+import os
+import struct
+
+MAGIC = b'S4RB'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sIQIIQ')
+_COUNT = struct.Struct('<Q')
+_COUNT_OFFSET = _HEADER.size - _COUNT.size
+_TIMESTAMP = struct.Struct('<d')
+
+# Outlet and input cord values stored per PDU: section, channel type, field
+CHANNEL_FIELDS = [
+    ('sentry4_pdu_outlet', 'outlet', 'current'),
+    ('sentry4_pdu_outlet', 'outlet', 'active_power'),
+    ('sentry4_pdu_inlet', 'inlet', 'active_power'),
+]
+
+
+def channel_values(parsed):
+    # The values of the parsed sections by channel name
+    return {
+        f'{channel_type}:{key}:{field}': entry[field]
+        for (section_name, channel_type, field) in CHANNEL_FIELDS
+        for (key, entry) in parsed.get(section_name, {}).items()
+    }
+
+
+class RingBuffer:
+    def __init__(self, path, mapped, channels, capacity, data_offset):
+        self.path = path
+        self.channels = channels
+        self.capacity = capacity
+
+        self._mmap = mapped
+        self._data_offset = data_offset
+        self._slot = struct.Struct(f'<d{len(channels)}f')
+        self._slot_size = (self._slot.size + 7) // 8 * 8
+
+    @classmethod
+    def create(cls, path, channels, capacity):
+        channels = list(channels)
+        names = json.dumps(channels).encode('utf-8')
+        data_offset = (_HEADER.size + len(names) + 7) // 8 * 8
+        slot_size = (_TIMESTAMP.size + 4 * len(channels) + 7) // 8 * 8
+
+        with open(f'{path}.new', 'wb') as ring_file:
+            ring_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, capacity, len(channels), data_offset, 0))
+            ring_file.write(names)
+            ring_file.truncate(data_offset + capacity * slot_size)
+        os.replace(f'{path}.new', path)
+
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        with open(path, 'r+b' if writable else 'rb') as ring_file:
+            mapped = mmap.mmap(ring_file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+        (magic, version, capacity, channel_count, data_offset, _count) = _HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            mapped.close()
+            raise ValueError(f'{path} is not a Sentry4 ring buffer')
+
+        channels = json.loads(mapped[_HEADER.size:data_offset].rstrip(b'\0').decode('utf-8'))
+        if len(channels) != channel_count:
+            mapped.close()
+            raise ValueError(f'{path} has a broken channel list')
+
+        return cls(path, mapped, channels, capacity, data_offset)
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def count(self):
+        return _COUNT.unpack_from(self._mmap, _COUNT_OFFSET)[0]
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp, values):
+        # values are by channel name, channels without a value are stored as NaN
+        count = self.count
+        offset = self._data_offset + count % self.capacity * self._slot_size
+        self._slot.pack_into(self._mmap, offset, timestamp, *(
+            math.nan if values.get(channel) is None else values[channel] for channel in self.channels
+        ))
+        _COUNT.pack_into(self._mmap, _COUNT_OFFSET, count + 1)
+
+    def _ranges(self):
+        # The (first, last) slot ranges of the samples in chronological order
+        count = self.count
+        if count <= self.capacity:
+            return [(0, count)]
+        head = count % self.capacity
+        return [(head, self.capacity), (0, head)] if head else [(0, self.capacity)]
+
+    def samples(self):
+        # Copies of the samples in chronological order as (timestamp, [values])
+        result = []
+        for (first, last) in self._ranges():
+            for slot in range(first, last):
+                (timestamp, *values) = self._slot.unpack_from(self._mmap, self._data_offset + slot * self._slot_size)
+                result.append((timestamp, values))
+        return result
+
+    def segments(self):
+        # Zero-copy (timestamps, values) NumPy views in chronological order, at
+        # most two as the samples wrap around at the end of the file. values has
+        # a column per channel.
+        import numpy  # type: ignore[import] # pylint: disable=import-outside-toplevel
+
+        dtype = numpy.dtype({
+            'names': ['timestamp', 'values'],
+            'formats': ['<f8', ('<f4', (len(self.channels),))],
+            'offsets': [0, _TIMESTAMP.size],
+            'itemsize': self._slot_size,
+        })
+        slots = numpy.ndarray((self.capacity,), dtype, buffer=self._mmap, offset=self._data_offset)
+
+        return [(slots['timestamp'][first:last], slots['values'][first:last]) for (first, last) in self._ranges() if last > first]
+
+
+class SampleStore:
+    """A ring buffer file per PDU in a directory"""
+
+    def __init__(self, directory, capacity):
+        self.directory = directory
+        self.capacity = capacity
+        self._rings = {}
+
+    def path(self, host):
+        return os.path.join(self.directory, f'{host}.ring')
+
+    def _ring(self, host, channels):
+        ring = self._rings.get(host)
+
+        if ring is None and os.path.exists(self.path(host)):
+            try:
+                ring = RingBuffer.open(self.path(host), writable=True)
+            except (OSError, ValueError):
+                ring = None
+
+        if ring is not None and (not set(channels) <= set(ring.channels) or ring.capacity != self.capacity):
+            # Outlets were added, the new file keeps the known channels as well so
+            # a poll missing some of them (e.g. a link unit not answering) does
+            # not start another one
+            channels = sorted(set(channels) | set(ring.channels))
+            self._set_aside(host, ring)
+            ring = None
+
+        if ring is None:
+            os.makedirs(self.directory, exist_ok=True)
+            ring = RingBuffer.create(self.path(host), channels, self.capacity)
+
+        self._rings[host] = ring
+        return ring
+
+    def _set_aside(self, host, ring):
+        # Keeps the samples so far as .old, unless that one holds more samples
+        samples = len(ring)
+        ring.close()
+
+        try:
+            with RingBuffer.open(f'{self.path(host)}.old') as old:
+                keep_old = len(old) > samples
+        except (OSError, ValueError):
+            keep_old = False
+
+        if keep_old:
+            os.remove(self.path(host))
+        else:
+            os.replace(self.path(host), f'{self.path(host)}.old')
+
+    def append(self, host, timestamp, parsed):
+        values = channel_values(parsed)
+        self._ring(host, sorted(values)).append(timestamp, values)
+
+    def close(self):
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
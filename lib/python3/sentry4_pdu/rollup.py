@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Power rollup of Sentry4 PDUs by site, row and rack.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Reads the cached agent output of every PDU the collector polls, one PDU at a
+# time, and adds the input cord power, the outlet current and the hottest
+# temperature sensor of each PDU to the totals of its rack. Row and site totals
+# are added up from the rack totals. Only the totals are kept, so the run time
+# grows with the number of PDUs and the memory with the number of racks.
+#
+# The totals are printed as piggyback data for hosts named after the site,
+# '<site>-<row>' and '<site>-<row>-<rack>', checked by sentry4_pdu_rollup.
+
+import argparse
+import os
+import sys
+import time
+
+from .agent import AGENT_SECTION_SUFFIX
+from .collector import cache_dir
+
+ROLLUP_SECTION = 'sentry4_pdu_rollup'
+
+
+class Rollup:
+    """Totals of the PDUs of a site, row or rack"""
+
+    def __init__(self):
+        self.pdus = 0
+        self.stale = 0
+        self.cord_power = 0
+        self.outlet_current = 0.0
+        self.max_temperature = None
+        self.max_temperature_sensor = None
+
+    def add_temperature(self, value, sensor):
+        if value is not None and (self.max_temperature is None or value > self.max_temperature):
+            self.max_temperature = value
+            self.max_temperature_sensor = sensor
+
+    def add_pdu(self, host, parsed):
+        self.pdus += 1
+        self.cord_power += sum(cord['active_power'] or 0 for cord in parsed.get('sentry4_pdu_inlet', {}).values())
+        self.outlet_current += sum(outlet['current'] or 0 for outlet in parsed.get('sentry4_pdu_outlet', {}).values())
+
+        for (sensor_id, sensor) in parsed.get('sentry4_pdu_temp', {}).items():
+            if sensor['status'] == 0:
+                self.add_temperature(sensor['value'], f'{host} {sensor_id}')
+
+    def add(self, other):
+        self.pdus += other.pdus
+        self.stale += other.stale
+        self.cord_power += other.cord_power
+        self.outlet_current += other.outlet_current
+        self.add_temperature(other.max_temperature, other.max_temperature_sensor)
+
+    def lines(self, level):
+        lines = [
+            f'level\t{level}',
+            f'pdus\t{self.pdus}',
+            f'stale\t{self.stale}',
+            f'cord_power\t{self.cord_power}',
+            f'outlet_current\t{round(self.outlet_current, 2)}',
+        ]
+        if self.max_temperature is not None:
+            lines.append(f'max_temperature\t{self.max_temperature}\t{self.max_temperature_sensor}')
+        return lines
+
+
+def read_locations(lines):
+    # 'host site row rack' per line, returns {host: (site, row, rack)}
+    locations = {}
+    for line in lines:
+        fields = line.split('#', 1)[0].split()
+        if len(fields) == 4:
+            locations[fields[0]] = tuple(fields[1:])
+    return locations
+
+
+def parse_agent_output(lines, parse_functions):
+    # The parsed sections of the agent output of the special agent or the collector
+    string_tables = {name: [] for name in parse_functions}
+    current = None
+
+    for line in lines:
+        line = line.rstrip('\n')
+        if line.startswith('<<<') and line.endswith('>>>'):
+            name = line[3:-3].split(':', 1)[0]
+            current = string_tables.get(name[:-len(AGENT_SECTION_SUFFIX)]) if name.endswith(AGENT_SECTION_SUFFIX) else None
+        elif current is not None:
+            current.append(line.split('\t'))
+
+    return {name: parse_function(string_tables[name]) for (name, parse_function) in parse_functions.items()}
+
+
+def rollup_racks(locations, parse_functions, directory, max_age=600.0, clock=time.time):
+    # Returns {(site, row, rack): Rollup} of the PDUs in locations
+    racks = {}
+
+    for (host, location) in locations.items():
+        rack = racks.setdefault(location, Rollup())
+        path = os.path.join(directory, f'{host}.txt')
+
+        try:
+            stale = clock() - os.stat(path).st_mtime > max_age
+            if not stale:
+                with open(path) as cached:
+                    parsed = parse_agent_output(cached, parse_functions)
+        except OSError:
+            stale = True
+
+        if stale:
+            rack.stale += 1
+            continue
+
+        rack.add_pdu(host, parsed)
+
+    return racks
+
+
+def rollup_levels(racks, separator='-'):
+    # Yields (piggyback host, level, Rollup) of every site, row and rack
+    sites = {}
+    rows = {}
+
+    for ((site, row, rack), totals) in sorted(racks.items()):
+        sites.setdefault(site, Rollup()).add(totals)
+        rows.setdefault((site, row), Rollup()).add(totals)
+
+    for (site, totals) in sites.items():
+        yield (site, 'site', totals)
+    for ((site, row), totals) in rows.items():
+        yield (separator.join((site, row)), 'row', totals)
+    for (location, totals) in sorted(racks.items()):
+        yield (separator.join(location), 'rack', totals)
+
+
+def write_piggyback(levels, out):
+    for (host, level, totals) in levels:
+        out.write(f'<<<<{host}>>>>\n')
+        out.write(f'<<<{ROLLUP_SECTION}:sep(9)>>>\n')
+        out.write('\n'.join(totals.lines(level)) + '\n')
+        out.write('<<<<>>>>\n')
+
+
+def main(argv=None):
+    from .sections import SECTIONS
+
+    parser = argparse.ArgumentParser(description='Power rollup of Sentry4 PDUs by site, row and rack as piggyback data')
+    parser.add_argument('--locations', required=True, help='File with a "host site row rack" line per PDU')
+    parser.add_argument('--cache-dir', default=cache_dir(), help='Directory of the sentry4_pdu_collector cache files (default: %(default)s)')
+    parser.add_argument('--max-age', type=float, default=600.0, help='Seconds after which the data of a PDU counts as stale (default: %(default)s)')
+    parser.add_argument('--separator', default='-', help='Joins site, row and rack to the piggyback host names (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    with open(args.locations) as locations_file:
+        locations = read_locations(locations_file)
+
+    parse_functions = {name: parse_function for (name, (_table, parse_function)) in SECTIONS.items()}
+    racks = rollup_racks(locations, parse_functions, args.cache_dir, args.max_age)
+    write_piggyback(rollup_levels(racks, args.separator), sys.stdout)
+
+    return 0
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# The Sentry4 SNMP sections of this package, as used by the tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# The agent_based plugins are the single source of truth for what is fetched
+# from a Sentry4 PDU and how it is parsed, the tools import them from the site.
+
+from cmk.base.plugins.agent_based import (
+    sentry4_pdu_humid,
+    sentry4_pdu_inlet,
+    sentry4_pdu_outlet,
+    sentry4_pdu_status,
+    sentry4_pdu_temp,
+)
+
+from .snmp import oid_from_str
+
+
+# Sentry4-MIB::st4SystemProductName.0, the OID the sections are detected by
+DETECT_OID = '.1.3.6.1.4.1.1718.4.1.1.1.1.0'
+
+# Sentry4-MIB::st4SystemConfigModifiedCount.0, increases on every configuration change
+CONFIG_MODIFIED_OID = '.1.3.6.1.4.1.1718.4.1.1.1.10.0'
+
+# Sentry4 tables are split into common config (1), config (2), monitor (3) and
+# event config (4) subtrees. Only the monitor subtree changes between
+# configuration changes, IDs, names and thresholds live in the others.
+MONITOR_SUBTREE = 3
+CONFIG_SUBTREES = (1, 2, 4)
+
+SECTIONS = {
+    'sentry4_pdu_status': (sentry4_pdu_status.SENTRY4_UNIT_TABLE, sentry4_pdu_status.parse_sentry4_pdu_status),
+    'sentry4_pdu_inlet': (sentry4_pdu_inlet.SENTRY4_INLET_TABLE, sentry4_pdu_inlet.parse_sentry4_pdu_inlet),
+    'sentry4_pdu_outlet': (sentry4_pdu_outlet.SENTRY4_OUTLET_TABLE, sentry4_pdu_outlet.parse_sentry4_pdu_outlet),
+    'sentry4_pdu_temp': (sentry4_pdu_temp.SENTRY4_TEMP_TABLE, sentry4_pdu_temp.parse_sentry4_pdu_temp),
+    'sentry4_pdu_humid': (sentry4_pdu_humid.SENTRY4_HUMID_TABLE, sentry4_pdu_humid.parse_sentry4_pdu_humid),
+}
+
+
+def table_subtrees():
+    # Returns the (config, monitor) subtrees of all Sentry4 tables fetched by the package
+    config = []
+    monitor = []
+
+    for (table, _parse_function) in SECTIONS.values():
+        base = oid_from_str(table.fetch.base)
+        config.extend(base + (subtree,) for subtree in CONFIG_SUBTREES)
+        monitor.append(base + (MONITOR_SUBTREE,))
+
+    return (config, monitor)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Shares the parsed Sentry4 sections of a PDU between processes.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# The collector parses every poll of a PDU once and publishes the parsed
+# sections in shared memory, other processes on the node (e.g. the exporter)
+# attach to them instead of fetching and parsing the PDU themselves.
+#
+# Every publish creates a new, immutable data segment, a small pointer segment
+# per host names the latest one. The previous data segment is kept until the
+# next publish so readers that just read the pointer still find it.
+#
+# Data segment layout, all little endian:
+#   header     magic, format version, fetch timestamp, directory size
+#   directory  JSON: per section the row count and per column the kind and
+#              offset of its array
+#   arrays     8 byte aligned. Numeric columns are float64 with NaN for None,
+#              string columns an int32 length per row (-1 for None) followed
+#              by the UTF-8 data. The section keys are the string column
+#              '__key__'.
+# Readers get zero-copy memoryviews of the numeric columns with
+# SharedModel.column() and the section dicts the checks use with section().
+
+import hashlib
+import json
+import math
+import struct
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+MAGIC = b'S4SM'
+FORMAT_VERSION = 1
+
+_POINTER = struct.Struct('<4sIQ')
+_HEADER = struct.Struct('<4sIdI')
+
+KEY_COLUMN = '__key__'
+
+# Segments created by this process, the resource tracker unlinks them on exit
+_created = set()
+
+
+def segment_name(host, generation=None):
+    # Short enough for the 31 characters macOS allows
+    name = f"s4pdu_{hashlib.sha1(host.encode('utf-8')).hexdigest()[:16]}"
+    return name if generation is None else f'{name}_{generation:x}'
+
+
+def _create(name, size):
+    shm = shared_memory.SharedMemory(name, create=True, size=size)
+    _created.add(name)
+    return shm
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name)
+    # Attaching registers the segment with the resource tracker of this
+    # process, which would unlink it when the process exits
+    if name not in _created:
+        resource_tracker.unregister(shm._name, 'shared_memory')  # pylint: disable=protected-access
+    return shm
+
+
+def _align(size):
+    return (size + 7) // 8 * 8
+
+
+def _column_kind(values):
+    if any(isinstance(value, str) for value in values):
+        return 's'
+    if all(value is None or isinstance(value, int) for value in values):
+        return 'i'
+    return 'f'
+
+
+def _encode_column(kind, values):
+    if kind != 's':
+        return array('d', (math.nan if value is None else value for value in values)).tobytes()
+
+    data = [None if value is None else value.encode('utf-8') for value in values]
+    lengths = array('i', (-1 if value is None else len(value) for value in data))
+    return lengths.tobytes() + b''.join(value for value in data if value is not None)
+
+
+def encode_model(timestamp, parsed):
+    directory = {}
+    arrays = []
+    offset = 0
+
+    for (name, section) in parsed.items():
+        rows = list(section.values())
+        columns = {KEY_COLUMN: list(section)}
+        for row in rows:
+            for field in row:
+                columns.setdefault(field, [])
+        for field in list(columns)[1:]:
+            columns[field] = [row.get(field) for row in rows]
+
+        directory[name] = {'rows': len(rows), 'columns': {}}
+        for (field, values) in columns.items():
+            kind = 's' if field == KEY_COLUMN else _column_kind(values)
+            data = _encode_column(kind, values)
+            directory[name]['columns'][field] = (kind, offset, len(data))
+            arrays.append(data + b'\0' * (_align(len(data)) - len(data)))
+            offset += _align(len(data))
+
+    encoded_directory = json.dumps(directory).encode('utf-8')
+    data_offset = _align(_HEADER.size + len(encoded_directory))
+
+    return b''.join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, timestamp, len(encoded_directory)),
+        encoded_directory,
+        b'\0' * (data_offset - _HEADER.size - len(encoded_directory)),
+    ] + arrays)
+
+
+class SharedModel:
+    def __init__(self, shm):
+        self._shm = shm
+        (magic, version, self.timestamp, directory_size) = _HEADER.unpack_from(shm.buf)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{shm.name} is not a Sentry4 shared model')
+
+        self.directory = json.loads(bytes(shm.buf[_HEADER.size:_HEADER.size + directory_size]).decode('utf-8'))
+        self._data_offset = _align(_HEADER.size + directory_size)
+
+    def close(self):
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _buffer(self, section, field):
+        (kind, offset, size) = self.directory[section]['columns'][field]
+        start = self._data_offset + offset
+        return (kind, self._shm.buf[start:start + size])
+
+    def column(self, section, field):
+        # A zero-copy float64 memoryview of a numeric column, None values are
+        # NaN. Release it before closing the model.
+        (kind, buffer) = self._buffer(section, field)
+        if kind == 's':
+            buffer.release()
+            raise TypeError(f'{section} {field} is a string column')
+        return buffer.cast('d')
+
+    def _values(self, section, field):
+        (kind, buffer) = self._buffer(section, field)
+        rows = self.directory[section]['rows']
+
+        with buffer:
+            if kind != 's':
+                with buffer.cast('d') as values:
+                    return [None if math.isnan(value) else int(value) if kind == 'i' else value for value in values]
+
+            lengths = array('i')
+            lengths.frombytes(buffer[:4 * rows])
+            data = bytes(buffer[4 * rows:])
+
+        values = []
+        start = 0
+        for length in lengths:
+            if length < 0:
+                values.append(None)
+                continue
+            values.append(data[start:start + length].decode('utf-8'))
+            start += length
+        return values
+
+    def section(self, name):
+        fields = list(self.directory[name]['columns'])
+        columns = [self._values(name, field) for field in fields]
+        return {row[0]: dict(zip(fields[1:], row[1:])) for row in zip(*columns)}
+
+    def sections(self):
+        return {name: self.section(name) for name in self.directory}
+
+
+class SharedModelPublisher:
+    """Publishes the parsed sections of a host, one publisher per host"""
+
+    def __init__(self, host):
+        self.host = host
+        try:
+            self._pointer = _create(segment_name(host), _POINTER.size)
+            self.generation = 0
+        except FileExistsError:
+            # Left behind by a publisher that did not exit cleanly, take it over
+            self._pointer = shared_memory.SharedMemory(segment_name(host))
+            _created.add(self._pointer.name)
+            self.generation = _POINTER.unpack_from(self._pointer.buf)[2]
+        self._segments = []
+
+    def publish(self, timestamp, parsed):
+        data = encode_model(timestamp, parsed)
+        segment = _create(segment_name(self.host, self.generation + 1), len(data))
+        segment.buf[:len(data)] = data
+
+        self.generation += 1
+        _POINTER.pack_into(self._pointer.buf, 0, MAGIC, FORMAT_VERSION, self.generation)
+
+        self._segments.append(segment)
+        while len(self._segments) > 2:
+            self._unlink(self._segments.pop(0))
+
+    @staticmethod
+    def _unlink(segment):
+        segment.close()
+        segment.unlink()
+        _created.discard(segment.name)
+
+    def close(self):
+        for segment in self._segments:
+            self._unlink(segment)
+        self._segments.clear()
+        if self._pointer is not None:
+            self._unlink(self._pointer)
+            self._pointer = None
+
+
+def attach(host):
+    # The latest SharedModel published for host, None if there is none
+    for _attempt in range(2):
+        try:
+            pointer = _attach(segment_name(host))
+        except FileNotFoundError:
+            return None
+
+        try:
+            (magic, _version, generation) = _POINTER.unpack_from(pointer.buf)
+        finally:
+            pointer.close()
+
+        if magic != MAGIC:
+            return None
+
+        try:
+            return SharedModel(_attach(segment_name(host, generation)))
+        except FileNotFoundError:
+            # Replaced by two publishes since reading the pointer
+            continue
+
+    return None
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Minimal SNMP v1/v2c codec and client used by the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Only the parts of SNMP the Sentry4 tools need are implemented: the BER
+# encoding of messages, Get/GetNext/GetBulk/Response PDUs and a blocking UDP
+# client. Values are kept as (tag, raw bytes) so they can be cached and sent on
+# unchanged; decode_value() turns them into Python values.
+
+import random
+import socket
+import threading
+from collections import namedtuple
+
+
+VERSION_1 = 0
+VERSION_2C = 1
+
+GET_REQUEST = 0xa0
+GET_NEXT_REQUEST = 0xa1
+RESPONSE = 0xa2
+SET_REQUEST = 0xa3
+GET_BULK_REQUEST = 0xa5
+
+TAG_INTEGER = 0x02
+TAG_OCTET_STRING = 0x04
+TAG_NULL = 0x05
+TAG_OID = 0x06
+TAG_SEQUENCE = 0x30
+TAG_IP_ADDRESS = 0x40
+TAG_COUNTER32 = 0x41
+TAG_GAUGE32 = 0x42
+TAG_TIMETICKS = 0x43
+TAG_OPAQUE = 0x44
+TAG_COUNTER64 = 0x46
+TAG_NO_SUCH_OBJECT = 0x80
+TAG_NO_SUCH_INSTANCE = 0x81
+TAG_END_OF_MIB_VIEW = 0x82
+
+EXCEPTION_TAGS = (TAG_NO_SUCH_OBJECT, TAG_NO_SUCH_INSTANCE, TAG_END_OF_MIB_VIEW)
+
+ERROR_NO_SUCH_NAME = 2
+
+NULL = (TAG_NULL, b'')
+END_OF_MIB_VIEW = (TAG_END_OF_MIB_VIEW, b'')
+NO_SUCH_INSTANCE = (TAG_NO_SUCH_INSTANCE, b'')
+
+# error_status/error_index hold non_repeaters/max_repetitions for GetBulk
+Message = namedtuple('Message', ['version', 'community', 'pdu_type', 'request_id', 'error_status', 'error_index', 'varbinds'])
+
+
+class SNMPError(Exception):
+    pass
+
+
+class SNMPTimeout(SNMPError):
+    pass
+
+
+def oid_from_str(oid):
+    return tuple(int(arc) for arc in oid.strip('.').split('.'))
+
+
+def oid_to_str(oid):
+    return '.' + '.'.join(str(arc) for arc in oid)
+
+
+def oid_in_subtree(oid, root):
+    return oid[:len(root)] == root
+
+
+def _encode_length(length):
+    if length < 0x80:
+        return bytes([length])
+
+    raw = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([0x80 | len(raw)]) + raw
+
+
+def _encode_tlv(tag, content):
+    return bytes([tag]) + _encode_length(len(content)) + content
+
+
+def _encode_integer(value):
+    length = max(1, (value + (value < 0)).bit_length() // 8 + 1)
+    return value.to_bytes(length, 'big', signed=True)
+
+
+def _encode_oid(oid):
+    arcs = [oid[0] * 40 + oid[1]] + list(oid[2:])
+    content = bytearray()
+
+    for arc in arcs:
+        chunk = [arc & 0x7f]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7f))
+            arc >>= 7
+        content.extend(reversed(chunk))
+
+    return bytes(content)
+
+
+def _decode_tlv(data, offset):
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+
+    if length & 0x80:
+        size = length & 0x7f
+        length = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+
+    end = offset + length
+    if end > len(data):
+        raise SNMPError('Truncated BER data')
+
+    return (tag, data[offset:end], end)
+
+
+def _decode_oid(content):
+    arcs = []
+    arc = 0
+
+    for byte in content:
+        arc = (arc << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+
+    first = min(arcs[0] // 40, 2)
+    return (first, arcs[0] - first * 40) + tuple(arcs[1:])
+
+
+def integer(value):
+    return (TAG_INTEGER, _encode_integer(value))
+
+
+def octet_string(value):
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return (TAG_OCTET_STRING, value)
+
+
+def decode_value(value):
+    (tag, raw) = value
+
+    if tag == TAG_INTEGER:
+        return int.from_bytes(raw, 'big', signed=True)
+
+    if tag in (TAG_COUNTER32, TAG_GAUGE32, TAG_TIMETICKS, TAG_COUNTER64):
+        return int.from_bytes(raw, 'big')
+
+    if tag == TAG_OCTET_STRING:
+        return raw.decode('utf-8', errors='replace')
+
+    if tag == TAG_OID:
+        return oid_to_str(_decode_oid(raw))
+
+    if tag == TAG_IP_ADDRESS:
+        return '.'.join(str(byte) for byte in raw)
+
+    return None
+
+
+def encode_varbind(oid, value):
+    return _encode_tlv(TAG_SEQUENCE, _encode_tlv(TAG_OID, _encode_oid(oid)) + _encode_tlv(*value))
+
+
+def encode_message(message):
+    varbinds = b''.join(encode_varbind(oid, value) for (oid, value) in message.varbinds)
+    pdu = b''.join([
+        _encode_tlv(TAG_INTEGER, _encode_integer(message.request_id)),
+        _encode_tlv(TAG_INTEGER, _encode_integer(message.error_status)),
+        _encode_tlv(TAG_INTEGER, _encode_integer(message.error_index)),
+        _encode_tlv(TAG_SEQUENCE, varbinds),
+    ])
+
+    return _encode_tlv(TAG_SEQUENCE, b''.join([
+        _encode_tlv(TAG_INTEGER, _encode_integer(message.version)),
+        _encode_tlv(TAG_OCTET_STRING, message.community.encode('utf-8')),
+        _encode_tlv(message.pdu_type, pdu),
+    ]))
+
+
+def decode_message(data):
+    try:
+        (tag, content, _end) = _decode_tlv(data, 0)
+        if tag != TAG_SEQUENCE:
+            raise SNMPError('Not an SNMP message')
+
+        (_tag, version, offset) = _decode_tlv(content, 0)
+        (_tag, community, offset) = _decode_tlv(content, offset)
+        (pdu_type, pdu, offset) = _decode_tlv(content, offset)
+
+        fields = []
+        offset = 0
+        for _index in range(3):
+            (_tag, raw, offset) = _decode_tlv(pdu, offset)
+            fields.append(int.from_bytes(raw, 'big', signed=True))
+
+        (_tag, raw_varbinds, offset) = _decode_tlv(pdu, offset)
+
+        varbinds = []
+        offset = 0
+        while offset < len(raw_varbinds):
+            (_tag, raw_varbind, offset) = _decode_tlv(raw_varbinds, offset)
+            (_tag, raw_oid, value_offset) = _decode_tlv(raw_varbind, 0)
+            (value_tag, raw_value, _end) = _decode_tlv(raw_varbind, value_offset)
+            varbinds.append((_decode_oid(raw_oid), (value_tag, bytes(raw_value))))
+
+    except IndexError:
+        raise SNMPError('Truncated BER data')
+
+    return Message(
+        int.from_bytes(version, 'big'),
+        bytes(community).decode('utf-8', errors='replace'),
+        pdu_type,
+        fields[0],
+        fields[1],
+        fields[2],
+        varbinds,
+    )
+
+
+class SNMPClient:
+    """Blocking SNMP client, counts the requests and bytes sent to the device"""
+
+    def __init__(self, host, port=161, community='public', version=VERSION_2C, timeout=1.0, retries=2):
+        self.address = (host, port)
+        self.community = community
+        self.version = version
+        self.timeout = timeout
+        self.retries = retries
+
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+        self._request_id = random.randint(1, 0x7fffffff)
+        self._lock = threading.Lock()
+
+    def request(self, pdu_type, varbinds, error_status=0, error_index=0):
+        with self._lock:
+            self._request_id = self._request_id % 0x7fffffff + 1
+            request_id = self._request_id
+
+        request = encode_message(Message(self.version, self.community, pdu_type, request_id, error_status, error_index, varbinds))
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.timeout)
+
+            for _attempt in range(self.retries + 1):
+                sock.sendto(request, self.address)
+                self.requests += 1
+                self.bytes_sent += len(request)
+
+                try:
+                    while True:
+                        (data, _address) = sock.recvfrom(65535)
+                        response = decode_message(data)
+                        if response.request_id == request_id:
+                            self.bytes_received += len(data)
+                            return response
+
+                except socket.timeout:
+                    continue
+
+        raise SNMPTimeout(f"No response from {self.address[0]}:{self.address[1]}")
+
+    def get(self, oids):
+        return self.request(GET_REQUEST, [(oid, NULL) for oid in oids]).varbinds
+
+    def get_next(self, oids):
+        return self.request(GET_NEXT_REQUEST, [(oid, NULL) for oid in oids]).varbinds
+
+    def get_bulk(self, oids, max_repetitions=10, non_repeaters=0):
+        return self.request(GET_BULK_REQUEST, [(oid, NULL) for oid in oids], non_repeaters, max_repetitions).varbinds
+
+    def walk(self, root, max_repetitions=10):
+        # Returns the varbinds below root and the first varbind after it, the
+        # latter is None at the end of the MIB view
+        varbinds = []
+        oid = root
+
+        while True:
+            if self.version == VERSION_1:
+                response = self.request(GET_NEXT_REQUEST, [(oid, NULL)])
+                if response.error_status == ERROR_NO_SUCH_NAME:
+                    return (varbinds, None)
+                batch = response.varbinds
+            else:
+                batch = self.get_bulk([oid], max_repetitions)
+
+            if not batch:
+                return (varbinds, None)
+
+            for (next_oid, value) in batch:
+                if value[0] == TAG_END_OF_MIB_VIEW:
+                    return (varbinds, None)
+
+                if not oid_in_subtree(next_oid, root) or next_oid <= oid:
+                    return (varbinds, (next_oid, value))
+
+                varbinds.append((next_oid, value))
+                oid = next_oid
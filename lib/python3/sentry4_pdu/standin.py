@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Local SNMP stand-in for Sentry4 PDUs.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+# Answers Get, GetNext and GetBulk requests from a dict, like a PDU with a
+# fixed MIB would. Used by sentry4_pdu_budget to verify its numbers and by the
+# tests of the tools.
+
+import bisect
+import socketserver
+
+from . import snmp
+
+
+class SNMPStandIn(socketserver.ThreadingUDPServer):
+    """Answers Get/GetNext/GetBulk requests from a dict of OID tuples to values"""
+
+    daemon_threads = True
+
+    def __init__(self, data):
+        self.data = dict(data)
+        self.requests = []
+        super().__init__(('127.0.0.1', 0), _StandInHandler)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def get(self, oid):
+        return self.data.get(oid, snmp.NO_SUCH_INSTANCE)
+
+    def get_next(self, oid):
+        oids = sorted(self.data)
+        index = bisect.bisect_right(oids, oid)
+        if index < len(oids):
+            return (oids[index], self.data[oids[index]])
+        return (oid, snmp.END_OF_MIB_VIEW)
+
+    def answer(self, request):
+        self.requests.append(request)
+
+        if request.pdu_type == snmp.GET_REQUEST:
+            return [(oid, self.get(oid)) for (oid, _value) in request.varbinds]
+
+        if request.pdu_type == snmp.GET_NEXT_REQUEST:
+            return [self.get_next(oid) for (oid, _value) in request.varbinds]
+
+        varbinds = [self.get_next(oid) for (oid, _value) in request.varbinds[:request.error_status]]
+        row = request.varbinds[request.error_status:]
+        for _repetition in range(request.error_index):
+            row = [self.get_next(oid) for (oid, _value) in row]
+            varbinds.extend(row)
+        return varbinds
+
+
+class _StandInHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        (data, sock) = self.request
+        request = snmp.decode_message(data)
+        response = request._replace(pdu_type=snmp.RESPONSE, error_status=0, error_index=0, varbinds=self.server.answer(request))
+        sock.sendto(snmp.encode_message(response), self.client_address)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks based on the Sentry4-MIB for PDU status.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import sentry4_pdu_environment
+
+
+SECTION_TEMP = {
+    'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+    'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+    'E3': {'sensor_id': 'E3', 'name': 'Rack_top', 'value': 47.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+}
+
+SECTION_HUMID = {
+    'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+    'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 7, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+    'F1': {'sensor_id': 'F1', 'name': 'Aisle', 'value': 40, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+}
+
+
+@pytest.mark.parametrize('params, section_temp, section_humid, result', [
+    ({'environment_grouping': 'sensor'}, SECTION_TEMP, SECTION_HUMID, []),
+    ({'environment_grouping': 'unit'}, SECTION_TEMP, SECTION_HUMID, [Service(item='Environment E'), Service(item='Environment F')]),
+    ({'environment_grouping': 'unit'}, None, SECTION_HUMID, [Service(item='Environment E'), Service(item='Environment F')]),
+    ({'environment_grouping': 'unit'}, SECTION_TEMP, None, [Service(item='Environment E')]),
+])
+def test_discover_sentry4_pdu_environment(params, section_temp, section_humid, result):
+    assert list(sentry4_pdu_environment.discover_sentry4_pdu_environment(params, section_temp, section_humid)) == result
+
+
+@pytest.mark.parametrize('item, section_temp, section_humid, result', [
+    ('Environment A', SECTION_TEMP, SECTION_HUMID, []),
+    (
+        'Environment E',
+        SECTION_TEMP,
+        SECTION_HUMID,
+        [Result(state=State.OK, summary='Temperature: 3 sensors, min 15.5 °C, avg 26.7 °C, max 47.5 °C'),
+         Metric('sentry4_temp_min', 15.5),
+         Metric('sentry4_temp_avg', 26.7),
+         Metric('sentry4_temp_max', 47.5),
+         Result(state=State.OK, notice='E1 HVAC_1_output: 15.5 °C'),
+         Result(state=State.OK, notice='E2 HVAC_1_intake: 17.0 °C'),
+         Result(state=State.WARN, summary='E3 Rack_top: 47.5 °C is above warning threshold'),
+         Result(state=State.OK, summary='Humidity: 1 sensors, min 71%, avg 71.0%, max 71%'),
+         Metric('sentry4_humidity_min', 71),
+         Metric('sentry4_humidity_avg', 71.0),
+         Metric('sentry4_humidity_max', 71),
+         Result(state=State.OK, notice='E1 HVAC_1_output: 71%'),
+         Result(state=State.CRIT, summary='E2 HVAC_1_intake: Humidity sensor error')]
+    ),
+    (
+        'Environment F',
+        None,
+        SECTION_HUMID,
+        [Result(state=State.OK, summary='Humidity: 1 sensors, min 40%, avg 40.0%, max 40%'),
+         Metric('sentry4_humidity_min', 40),
+         Metric('sentry4_humidity_avg', 40.0),
+         Metric('sentry4_humidity_max', 40),
+         Result(state=State.OK, notice='F1 Aisle: 40%')]
+    ),
+])
+def test_check_sentry4_pdu_environment(item, section_temp, section_humid, result):
+    assert list(sentry4_pdu_environment.check_sentry4_pdu_environment(item, section_temp, section_humid)) == result
@@ -38,8 +38,8 @@ from cmk.base.plugins.agent_based import sentry4_pdu_humid
          ['E1', 'HVAC_1_output', '71', '0', '5', '10', '90', '95'],
          ['E2', 'HVAC_1_intake', '66', '0', '5', '10', '90', '95']],
         {
-            'Humidity E1 HVAC_1_output': {'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
-            'Humidity E2 HVAC_1_intake': {'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
         },
     ),
 ])
@@ -47,17 +47,26 @@ def test_parse_sentry4_pdu_humid(string_table, result):
     assert sentry4_pdu_humid.parse_sentry4_pdu_humid(string_table) == result
 
 
-@pytest.mark.parametrize('section, result', [
+@pytest.mark.parametrize('params, section, result', [
     (
+        {'item_naming': 'id_name'},
         {
-            'Humidity E1 HVAC_1_output': {'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
-            'Humidity E2 HVAC_1_intake': {'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
         },
         [Service(item='Humidity E1 HVAC_1_output'), Service(item='Humidity E2 HVAC_1_intake')]
     ),
+    (
+        {'item_naming': 'id'},
+        {
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+        },
+        [Service(item='Humidity E1'), Service(item='Humidity E2')]
+    ),
 ])
-def test_discover_sentry4_pdu_humid(section, result):
-    assert list(sentry4_pdu_humid.discover_sentry4_pdu_humid(section)) == result
+def test_discover_sentry4_pdu_humid(params, section, result):
+    assert list(sentry4_pdu_humid.discover_sentry4_pdu_humid(params, section)) == result
 
 
 @pytest.mark.parametrize('item, params, section, result', [
@@ -66,8 +75,8 @@ def test_discover_sentry4_pdu_humid(section, result):
         'foo',
         {},
         {
-            'Humidity E1 HVAC_1_output': {'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
-            'Humidity E2 HVAC_1_intake': {'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
         },
         []
     ),
@@ -75,8 +84,8 @@ def test_discover_sentry4_pdu_humid(section, result):
         'Humidity E1 HVAC_1_output',
         {},
         {
-            'Humidity E1 HVAC_1_output': {'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
-            'Humidity E2 HVAC_1_intake': {'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 71, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
         },
         [Metric('humidity', 71, levels=(90, 95)), Result(state=State.OK, summary='71%', details='High alarm:95.0, High warning:90.0, Low warning:10.0, Low alarm:5.0')]
     ),
@@ -84,8 +93,8 @@ def test_discover_sentry4_pdu_humid(section, result):
         'Humidity E1 HVAC_1_output',
         {},
         {
-            'Humidity E1 HVAC_1_output': {'value': 91, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
-            'Humidity E2 HVAC_1_intake': {'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 91, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
         },
         [Metric('humidity', 91, levels=(90, 95)), Result(state=State.WARN, summary='91% is above warning threshold', details='High alarm:95.0, High warning:90.0, Low warning:10.0, Low alarm:5.0')]
     ),
@@ -93,8 +102,8 @@ def test_discover_sentry4_pdu_humid(section, result):
         'Humidity E1 HVAC_1_output',
         {},
         {
-            'Humidity E1 HVAC_1_output': {'value': 96, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
-            'Humidity E2 HVAC_1_intake': {'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 96, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 66, 'status': 0, 'low_alarm': 5, 'low_warning': 10, 'high_warning': 90, 'high_alarm': 95}
         },
         [Metric('humidity', 96, levels=(90, 95)), Result(state=State.CRIT, summary='96% is above critical threshold', details='High alarm:95.0, High warning:90.0, Low warning:10.0, Low alarm:5.0')]
     ),
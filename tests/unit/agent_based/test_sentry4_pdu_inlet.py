@@ -34,8 +34,8 @@ from cmk.base.plugins.agent_based import sentry4_pdu_inlet
         [['AA', 'Master_UPS_A', '1', '0', '878', '952', '44', '92'],
          ['BA', 'Slave_UPS_B', '1', '0', '923', '996', '46', '93']],
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '1', 'status': '0', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '0', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
     ),
 ])
@@ -43,17 +43,26 @@ def test_parse_sentry4_pdu_inlet(string_table, result):
     assert sentry4_pdu_inlet.parse_sentry4_pdu_inlet(string_table) == result
 
 
-@pytest.mark.parametrize('section, result', [
+@pytest.mark.parametrize('params, section, result', [
     (
+        {'item_naming': 'id_name'},
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '1', 'status': '0', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '0', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
         [Service(item='Input cord AA Master_UPS_A'), Service(item='Input cord BA Slave_UPS_B')]
     ),
+    (
+        {'item_naming': 'id'},
+        {
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
+        },
+        [Service(item='Input cord AA'), Service(item='Input cord BA')]
+    ),
 ])
-def test_discover_sentry4_pdu_inlet(section, result):
-    assert list(sentry4_pdu_inlet.discover_sentry4_pdu_inlet(section)) == result
+def test_discover_sentry4_pdu_inlet(params, section, result):
+    assert list(sentry4_pdu_inlet.discover_sentry4_pdu_inlet(params, section)) == result
 
 
 @pytest.mark.parametrize('item, section, result', [
@@ -61,40 +70,40 @@ def test_discover_sentry4_pdu_inlet(section, result):
     (
         'foo',
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '1', 'status': '0', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '0', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
         []
     ),
     (
         'Input cord AA Master_UPS_A',
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '1', 'status': '0', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '0', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
         [Metric('power', 878), Metric('appower', 952), Metric('power_usage_percentage', 44), Result(state=State.OK, summary='Status: normal(0) State: on(1)')]
     ),
     (
         'Input cord AA Master_UPS_A',
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '1', 'status': '18', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '0', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 18, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
         [Metric('power', 878), Metric('appower', 952), Metric('power_usage_percentage', 44), Result(state=State.CRIT, summary='Status: alarm(18) State: on(1)')]
     ),
     (
         'Input cord BA Slave_UPS_B',
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '1', 'status': '0', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '12', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 1, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 12, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
         [Metric('power', 923), Metric('appower', 996), Metric('power_usage_percentage', 46), Result(state=State.CRIT, summary='Status: breakerTripped(12) State: on(1)')]
     ),
     (
         'Input cord AA Master_UPS_A',
         {
-            'Input cord AA Master_UPS_A': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': '0', 'status': '0', 'active_power': '878', 'apparent_power': '952', 'power_utilized': '44', 'power_factor': '92'},
-            'Input cord BA Slave_UPS_B': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': '1', 'status': '0', 'active_power': '923', 'apparent_power': '996', 'power_utilized': '46', 'power_factor': '93'}
+            'AA': {'cord_id': 'AA', 'cord_name': 'Master_UPS_A', 'state': 0, 'status': 0, 'active_power': 878, 'apparent_power': 952, 'power_utilized': 44, 'power_factor': 0.92},
+            'BA': {'cord_id': 'BA', 'cord_name': 'Slave_UPS_B', 'state': 1, 'status': 0, 'active_power': 923, 'apparent_power': 996, 'power_utilized': 46, 'power_factor': 0.93}
         },
         [Metric('power', 878), Metric('appower', 952), Metric('power_usage_percentage', 44), Result(state=State.WARN, summary='Status: normal(0) State: unknown(0)')]
     ),
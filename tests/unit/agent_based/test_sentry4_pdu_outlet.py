@@ -19,6 +19,9 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
+import os
+import timeit
+
 import pytest  # type: ignore[import]
 from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     Metric,
@@ -38,12 +41,12 @@ from cmk.base.plugins.agent_based import sentry4_pdu_outlet
          ['BA2', 'Link1_Outlet_2', '1', '0', '0', '2068', '0', '0'],
          ['BA3', 'Link1_Outlet_3', '1', '0', '28', '2058', '52', '58']],
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '0', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
     ),
 ])
@@ -51,15 +54,16 @@ def test_parse_sentry4_pdu_outlet(string_table, result):
     assert sentry4_pdu_outlet.parse_sentry4_pdu_outlet(string_table) == result
 
 
-@pytest.mark.parametrize('section, result', [
+@pytest.mark.parametrize('params, section, result', [
     (
+        {'item_naming': 'id_name'},
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '0', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
         [Service(item='Outlet AA1 Master_Outlet_1'),
          Service(item='Outlet AA2 Master_Outlet_2'),
@@ -68,9 +72,26 @@ def test_parse_sentry4_pdu_outlet(string_table, result):
          Service(item='Outlet BA2 Link1_Outlet_2'),
          Service(item='Outlet BA3 Link1_Outlet_3')]
     ),
+    (
+        {'item_naming': 'id'},
+        {
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
+        },
+        [Service(item='Outlet AA1'),
+         Service(item='Outlet AA2'),
+         Service(item='Outlet AA3'),
+         Service(item='Outlet BA1'),
+         Service(item='Outlet BA2'),
+         Service(item='Outlet BA3')]
+    ),
 ])
-def test_discover_sentry4_pdu_outlet(section, result):
-    assert list(sentry4_pdu_outlet.discover_sentry4_pdu_outlet(section)) == result
+def test_discover_sentry4_pdu_outlet(params, section, result):
+    assert list(sentry4_pdu_outlet.discover_sentry4_pdu_outlet(params, section)) == result
 
 
 @pytest.mark.parametrize('item, section, result', [
@@ -78,63 +99,115 @@ def test_discover_sentry4_pdu_outlet(section, result):
     (
         'foo',
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '0', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
         []
     ),
     (
         'Outlet AA3 Master_Outlet_3',
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '0', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
         [Metric('current', 0.27), Metric('voltage', 207.3), Metric('power', 48), Metric('appower', 55), Result(state=State.OK, summary='Status: normal(0) State: on(1)')]
     ),
     (
         'Outlet AA3 Master_Outlet_3',
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '22', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 22, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
         [Metric('current', 0.27), Metric('voltage', 207.3), Metric('power', 48), Metric('appower', 55), Result(state=State.WARN, summary='Status: profileError(22) State: on(1)')]
     ),
     (
         'Outlet AA3 Master_Outlet_3',
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '20', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 20, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
         [Metric('current', 0.27), Metric('voltage', 207.3), Metric('power', 48), Metric('appower', 55), Result(state=State.CRIT, summary='Status: overLimit(20) State: on(1)')]
     ),
     (
         'Outlet AA1 Master_Outlet_1',
         {
-            'Outlet AA1 Master_Outlet_1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2072', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA2 Master_Outlet_2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet AA3 Master_Outlet_3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': '1', 'status': '0', 'current': '27', 'voltage': '2073', 'active_power': '48', 'apparent_power': '55'},
-            'Outlet BA1 Link1_Outlet_1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2064', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA2 Link1_Outlet_2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': '1', 'status': '0', 'current': '0', 'voltage': '2068', 'active_power': '0', 'apparent_power': '0'},
-            'Outlet BA3 Link1_Outlet_3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': '1', 'status': '0', 'current': '28', 'voltage': '2058', 'active_power': '52', 'apparent_power': '58'}
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55},
+            'BA1': {'outlet_id': 'BA1', 'outlet_name': 'Link1_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.4, 'active_power': 0, 'apparent_power': 0},
+            'BA2': {'outlet_id': 'BA2', 'outlet_name': 'Link1_Outlet_2', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 206.8, 'active_power': 0, 'apparent_power': 0},
+            'BA3': {'outlet_id': 'BA3', 'outlet_name': 'Link1_Outlet_3', 'state': 1, 'status': 0, 'current': 0.28, 'voltage': 205.8, 'active_power': 52, 'apparent_power': 58}
         },
         [Metric('current', 0.0), Metric('voltage', 207.2), Metric('power', 0), Metric('appower', 0), Result(state=State.OK, summary='Status: normal(0) State: on(1)')]
     ),
+    (
+        'Outlet AA3',
+        {
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55}
+        },
+        [Result(state=State.OK, summary='Name: Master_Outlet_3'), Metric('current', 0.27), Metric('voltage', 207.3), Metric('power', 48), Metric('appower', 55), Result(state=State.OK, summary='Status: normal(0) State: on(1)')]
+    ),
+    (
+        'Outlet AA3 Old_Outlet_Name',
+        {
+            'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.0, 'voltage': 207.2, 'active_power': 0, 'apparent_power': 0},
+            'AA3': {'outlet_id': 'AA3', 'outlet_name': 'Master_Outlet_3', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 48, 'apparent_power': 55}
+        },
+        [Metric('current', 0.27), Metric('voltage', 207.3), Metric('power', 48), Metric('appower', 55), Result(state=State.OK, summary='Status: normal(0) State: on(1)')]
+    ),
 ])
 def test_check_sentry4_pdu_outlet(monkeypatch, item, section, result):
     assert list(sentry4_pdu_outlet.check_sentry4_pdu_outlet(item, section)) == result
+
+
+def _legacy_parse_and_convert(string_table):
+    # The parse function before the column specs plus the conversions the
+    # check function did on every outlet
+    parsed = {}
+    for (outlet_id, outlet_name, state, status, current, voltage, active_power, apparent_power) in string_table:
+        parsed[outlet_id] = {
+            'outlet_id': outlet_id,
+            'outlet_name': outlet_name,
+            'state': state,
+            'status': status,
+            'current': current,
+            'voltage': voltage,
+            'active_power': active_power,
+            'apparent_power': apparent_power,
+        }
+    for outlet in parsed.values():
+        outlet['state'] = int(outlet['state'])
+        outlet['status'] = int(outlet['status'])
+        outlet['current'] = int(outlet['current']) / 100
+        outlet['voltage'] = int(outlet['voltage']) / 10
+        outlet['active_power'] = int(outlet['active_power'])
+        outlet['apparent_power'] = int(outlet['apparent_power'])
+    return parsed
+
+
+@pytest.mark.skipif(not os.environ.get('SENTRY4_PDU_BENCHMARK'), reason='set SENTRY4_PDU_BENCHMARK=1 to run')
+def test_benchmark_parse_sentry4_pdu_outlet():
+    # Parses 10k outlet rows, run with: SENTRY4_PDU_BENCHMARK=1 pytest -s -k benchmark
+    string_table = [[f'A{row}', f'Outlet_{row}', '1', '0', str(row % 1600), '2073', str(row % 3700), str(row % 3900)] for row in range(10000)]
+    assert sentry4_pdu_outlet.parse_sentry4_pdu_outlet(string_table) == _legacy_parse_and_convert(string_table)
+
+    for (name, function) in (('column specs', sentry4_pdu_outlet.parse_sentry4_pdu_outlet), ('legacy', _legacy_parse_and_convert)):
+        seconds = min(timeit.repeat(lambda: function(string_table), number=10, repeat=5)) / 10
+        print(f'{name}: {seconds * 1000:.1f} ms per 10k outlet rows')
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks based on the Sentry4-MIB for PDU status.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import sentry4_pdu_rollup
+
+
+SECTION = {
+    'level': 'rack',
+    'pdus': 2,
+    'stale': 0,
+    'cord_power': 5230,
+    'outlet_current': 23.45,
+    'max_temperature': 27.5,
+    'max_temperature_sensor': 'pdu01 A1',
+}
+
+
+@pytest.mark.parametrize('string_table, result', [
+    ([], {}),
+    (
+        [['level', 'rack'], ['pdus', '2'], ['stale', '0'], ['cord_power', '5230'], ['outlet_current', '23.45'], ['max_temperature', '27.5', 'pdu01 A1']],
+        SECTION,
+    ),
+    (
+        [['level', 'site'], ['pdus', '0'], ['stale', '3'], ['cord_power', '0'], ['outlet_current', '0.0']],
+        {'level': 'site', 'pdus': 0, 'stale': 3, 'cord_power': 0, 'outlet_current': 0.0},
+    ),
+])
+def test_parse_sentry4_pdu_rollup(string_table, result):
+    assert sentry4_pdu_rollup.parse_sentry4_pdu_rollup(string_table) == result
+
+
+@pytest.mark.parametrize('section, result', [
+    ({}, []),
+    (SECTION, [Service()]),
+])
+def test_discover_sentry4_pdu_rollup(section, result):
+    assert list(sentry4_pdu_rollup.discover_sentry4_pdu_rollup(section)) == result
+
+
+@pytest.mark.parametrize('section, result', [
+    (
+        SECTION,
+        [Result(state=State.OK, summary='Rack: 2 PDUs, cord power 5230 W, outlet current 23.45 A'),
+         Metric('power', 5230),
+         Metric('current', 23.45),
+         Result(state=State.OK, summary='Hottest sensor: 27.5 °C (pdu01 A1)'),
+         Metric('sentry4_temp_max', 27.5)]
+    ),
+    (
+        {'level': 'site', 'pdus': 1, 'stale': 2, 'cord_power': 800, 'outlet_current': 3.5},
+        [Result(state=State.OK, summary='Site: 1 PDUs, cord power 800 W, outlet current 3.5 A'),
+         Metric('power', 800),
+         Metric('current', 3.5),
+         Result(state=State.WARN, summary='2 PDUs without current data')]
+    ),
+])
+def test_check_sentry4_pdu_rollup(section, result):
+    assert list(sentry4_pdu_rollup.check_sentry4_pdu_rollup(section)) == result
@@ -33,24 +33,24 @@ from cmk.base.plugins.agent_based import sentry4_pdu_status
     (
         [['A', 'Master', 'ABCD0000001', 'C2WG36TE-YQME2M66/C', '0', '0'], ['B', 'Link1', 'ABCD0000002', 'C2XG36TE-YQME2M66/C', '1', '0'], ['E', 'EMCU', '', 'EMCU-1-1B(C)', '3', '0']],
         {
-            'Sentry PDU status: Master': {'Unit': 'A',
-                                          'Name': 'Master',
-                                          'SN': 'ABCD0000001',
-                                          'Model': 'C2WG36TE-YQME2M66/C',
-                                          'Status': '0',
-                                          'Type': '0'},
-            'Sentry PDU status: Link1': {'Unit': 'B',
-                                         'Name': 'Link1',
-                                         'SN': 'ABCD0000002',
-                                         'Model': 'C2XG36TE-YQME2M66/C',
-                                         'Type': '1',
-                                         'Status': '0'},
-            'Sentry PDU status: EMCU': {'Unit': 'E',
-                                        'Name': 'EMCU',
-                                        'SN': '',
-                                        'Model': 'EMCU-1-1B(C)',
-                                        'Type': '3',
-                                        'Status': '0'}
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 0,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 0},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
         },
 
     ),
@@ -59,34 +59,60 @@ def test_parse_sentry4_pdu_status(string_table, result):
     assert sentry4_pdu_status.parse_sentry4_pdu_status(string_table) == result
 
 
-@pytest.mark.parametrize('section, result', [
+@pytest.mark.parametrize('params, section, result', [
     (
+        {'item_naming': 'id_name'},
         {
-            'Sentry PDU status: Master': {'Unit': 'A',
-                                          'Name': 'Master',
-                                          'SN': 'ABCD0000001',
-                                          'Model': 'C2WG36TE-YQME2M66/C',
-                                          'Status': '0',
-                                          'Type': '0'},
-            'Sentry PDU status: Link1': {'Unit': 'B',
-                                         'Name': 'Link1',
-                                         'SN': 'ABCD0000002',
-                                         'Model': 'C2XG36TE-YQME2M66/C',
-                                         'Type': '1',
-                                         'Status': '0'},
-            'Sentry PDU status: EMCU': {'Unit': 'E',
-                                        'Name': 'EMCU',
-                                        'SN': '',
-                                        'Model': 'EMCU-1-1B(C)',
-                                        'Type': '3',
-                                        'Status': '0'}
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 0,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 0},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
         },
 
         [Service(item='Sentry PDU status: Master'), Service(item='Sentry PDU status: Link1'), Service(item='Sentry PDU status: EMCU')]
     ),
+    (
+        {'item_naming': 'id'},
+        {
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 0,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 0},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
+        },
+
+        [Service(item='Sentry PDU status: A'), Service(item='Sentry PDU status: B'), Service(item='Sentry PDU status: E')]
+    ),
 ])
-def test_discover_sentry4_pdu_status(section, result):
-    assert list(sentry4_pdu_status.discover_sentry4_pdu_status(section)) == result
+def test_discover_sentry4_pdu_status(params, section, result):
+    assert list(sentry4_pdu_status.discover_sentry4_pdu_status(params, section)) == result
 
 
 @pytest.mark.parametrize('item, section, result', [
@@ -94,24 +120,24 @@ def test_discover_sentry4_pdu_status(section, result):
     (
         'foo',
         {
-            'Sentry PDU status: Master': {'Unit': 'A',
-                                          'Name': 'Master',
-                                          'SN': 'ABCD0000001',
-                                          'Model': 'C2WG36TE-YQME2M66/C',
-                                          'Status': '0',
-                                          'Type': '0'},
-            'Sentry PDU status: Link1': {'Unit': 'B',
-                                         'Name': 'Link1',
-                                         'SN': 'ABCD0000002',
-                                         'Model': 'C2XG36TE-YQME2M66/C',
-                                         'Type': '1',
-                                         'Status': '0'},
-            'Sentry PDU status: EMCU': {'Unit': 'E',
-                                        'Name': 'EMCU',
-                                        'SN': '',
-                                        'Model': 'EMCU-1-1B(C)',
-                                        'Type': '3',
-                                        'Status': '0'}
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 0,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 0},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
         },
 
         []
@@ -119,24 +145,24 @@ def test_discover_sentry4_pdu_status(section, result):
     (
         'Sentry PDU status: Master',
         {
-            'Sentry PDU status: Master': {'Unit': 'A',
-                                          'Name': 'Master',
-                                          'SN': 'ABCD0000001',
-                                          'Model': 'C2WG36TE-YQME2M66/C',
-                                          'Status': '0',
-                                          'Type': '0'},
-            'Sentry PDU status: Link1': {'Unit': 'B',
-                                         'Name': 'Link1',
-                                         'SN': 'ABCD0000002',
-                                         'Model': 'C2XG36TE-YQME2M66/C',
-                                         'Type': '1',
-                                         'Status': '0'},
-            'Sentry PDU status: EMCU': {'Unit': 'E',
-                                        'Name': 'EMCU',
-                                        'SN': '',
-                                        'Model': 'EMCU-1-1B(C)',
-                                        'Type': '3',
-                                        'Status': '0'}
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 0,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 0},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
         },
 
         [Result(state=State.OK, summary='Status: normal(0), Unit: A, Name: Master, SN: ABCD0000001, Model: C2WG36TE-YQME2M66/C, Type: masterPdu(0)')]
@@ -144,48 +170,66 @@ def test_discover_sentry4_pdu_status(section, result):
     (
         'Sentry PDU status: Master',
         {
-            'Sentry PDU status: Master': {'Unit': 'A',
-                                          'Name': 'Master',
-                                          'SN': 'ABCD0000001',
-                                          'Model': 'C2WG36TE-YQME2M66/C',
-                                          'Status': '2',
-                                          'Type': '0'},
-            'Sentry PDU status: Link1': {'Unit': 'B',
-                                         'Name': 'Link1',
-                                         'SN': 'ABCD0000002',
-                                         'Model': 'C2XG36TE-YQME2M66/C',
-                                         'Type': '1',
-                                         'Status': '0'},
-            'Sentry PDU status: EMCU': {'Unit': 'E',
-                                        'Name': 'EMCU',
-                                        'SN': '',
-                                        'Model': 'EMCU-1-1B(C)',
-                                        'Type': '3',
-                                        'Status': '0'}
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 2,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 0},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
         },
         [Result(state=State.WARN, summary='Status: purged(2), Unit: A, Name: Master, SN: ABCD0000001, Model: C2WG36TE-YQME2M66/C, Type: masterPdu(0)')]
     ),
     (
         'Sentry PDU status: Link1',
         {
-            'Sentry PDU status: Master': {'Unit': 'A',
-                                          'Name': 'Master',
-                                          'SN': 'ABCD0000001',
-                                          'Model': 'C2WG36TE-YQME2M66/C',
-                                          'Status': '2',
-                                          'Type': '0'},
-            'Sentry PDU status: Link1': {'Unit': 'B',
-                                         'Name': 'Link1',
-                                         'SN': 'ABCD0000002',
-                                         'Model': 'C2XG36TE-YQME2M66/C',
-                                         'Type': '1',
-                                         'Status': '8'},
-            'Sentry PDU status: EMCU': {'Unit': 'E',
-                                        'Name': 'EMCU',
-                                        'SN': '',
-                                        'Model': 'EMCU-1-1B(C)',
-                                        'Type': '3',
-                                        'Status': '0'}
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 2,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 8},
+            'E': {'Unit': 'E',
+                  'Name': 'EMCU',
+                  'SN': '',
+                  'Model': 'EMCU-1-1B(C)',
+                  'Type': 3,
+                  'Status': 0}
+        },
+        [Result(state=State.CRIT, summary='Status: lost(8), Unit: B, Name: Link1, SN: ABCD0000002, Model: C2XG36TE-YQME2M66/C, Type: linkPdu(1)')]
+    ),
+    (
+        'Sentry PDU status: B',
+        {
+            'A': {'Unit': 'A',
+                  'Name': 'Master',
+                  'SN': 'ABCD0000001',
+                  'Model': 'C2WG36TE-YQME2M66/C',
+                  'Status': 0,
+                  'Type': 0},
+            'B': {'Unit': 'B',
+                  'Name': 'Link1',
+                  'SN': 'ABCD0000002',
+                  'Model': 'C2XG36TE-YQME2M66/C',
+                  'Type': 1,
+                  'Status': 8}
         },
         [Result(state=State.CRIT, summary='Status: lost(8), Unit: B, Name: Link1, SN: ABCD0000002, Model: C2XG36TE-YQME2M66/C, Type: linkPdu(1)')]
     ),
@@ -39,8 +39,8 @@ from cmk.base.plugins.agent_based import sentry4_pdu_temp
          ['', 'E1', 'HVAC_1_output', '155', '0', '1', '5', '45', '50'],
          ['', 'E2', 'HVAC_1_intake', '170', '0', '1', '5', '45', '50']],
         {
-            'Temperature E1 HVAC_1_output': {'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
     ),
     (
@@ -52,8 +52,8 @@ from cmk.base.plugins.agent_based import sentry4_pdu_temp
          ['', 'E1', 'HVAC_1_output', '599', '0', '34', '41', '113', '122'],
          ['', 'E2', 'HVAC_1_intake', '626', '0', '34', '41', '113', '122']],
         {
-            'Temperature E1 HVAC_1_output': {'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
     ),
 ])
@@ -61,17 +61,34 @@ def test_parse_sentry4_pdu_temp(string_table, result):
     assert sentry4_pdu_temp.parse_sentry4_pdu_temp(string_table) == result
 
 
-@pytest.mark.parametrize('section, result', [
+@pytest.mark.parametrize('params, section, result', [
     (
+        {'item_naming': 'id_name'},
         {
-            'Temperature E1 HVAC_1_output': {'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
         [Service(item='Temperature E1 HVAC_1_output'), Service(item='Temperature E2 HVAC_1_intake')]
     ),
+    (
+        {'item_naming': 'id'},
+        {
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+        },
+        [Service(item='Temperature E1'), Service(item='Temperature E2')]
+    ),
+    (
+        {'item_naming': 'id_name', 'environment_grouping': 'unit'},
+        {
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+        },
+        []
+    ),
 ])
-def test_discover_sentry4_pdu_temp(section, result):
-    assert list(sentry4_pdu_temp.discover_sentry4_pdu_temp(section)) == result
+def test_discover_sentry4_pdu_temp(params, section, result):
+    assert list(sentry4_pdu_temp.discover_sentry4_pdu_temp(params, section)) == result
 
 
 @pytest.mark.parametrize('item, params, section, result', [
@@ -80,8 +97,8 @@ def test_discover_sentry4_pdu_temp(section, result):
         'foo',
         {},
         {
-            'Temperature E1 HVAC_1_output': {'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
         []
     ),
@@ -89,8 +106,8 @@ def test_discover_sentry4_pdu_temp(section, result):
         'Temperature E1 HVAC_1_output',
         {},
         {
-            'Temperature E1 HVAC_1_output': {'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
         [Metric('sentry4_temp', 15.5, levels=(45.0, 50.0)), Result(state=State.OK, summary='15.5 °C', details='High alarm:50.0, High warning:45.0, Low warning:5.0, Low alarm:1.0')]
     ),
@@ -98,8 +115,8 @@ def test_discover_sentry4_pdu_temp(section, result):
         'Temperature E1 HVAC_1_output',
         {},
         {
-            'Temperature E1 HVAC_1_output': {'value': 46.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 46.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
         [Metric('sentry4_temp', 46.0, levels=(45.0, 50.0)), Result(state=State.WARN, summary='46.0 °C is above warning threshold', details='High alarm:50.0, High warning:45.0, Low warning:5.0, Low alarm:1.0')]
     ),
@@ -107,11 +124,20 @@ def test_discover_sentry4_pdu_temp(section, result):
         'Temperature E1 HVAC_1_output',
         {},
         {
-            'Temperature E1 HVAC_1_output': {'value': 51.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
-            'Temperature E2 HVAC_1_intake': {'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 51.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
         },
         [Metric('sentry4_temp', 51.0, levels=(45.0, 50.0)), Result(state=State.CRIT, summary='51.0 °C is above critical threshold', details='High alarm:50.0, High warning:45.0, Low warning:5.0, Low alarm:1.0')]
     ),
+    (
+        'Temperature E1',
+        {},
+        {
+            'E1': {'sensor_id': 'E1', 'name': 'HVAC_1_output', 'value': 15.5, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50},
+            'E2': {'sensor_id': 'E2', 'name': 'HVAC_1_intake', 'value': 17.0, 'status': 0, 'low_alarm': 1, 'low_warning': 5, 'high_warning': 45, 'high_alarm': 50}
+        },
+        [Result(state=State.OK, summary='Name: HVAC_1_output'), Metric('sentry4_temp', 15.5, levels=(45.0, 50.0)), Result(state=State.OK, summary='15.5 °C', details='High alarm:50.0, High warning:45.0, Low warning:5.0, Low alarm:1.0')]
+    ),
 ])
 def test_check_sentry4_pdu_temp(monkeypatch, item, params, section, result):
     assert list(sentry4_pdu_temp.check_sentry4_pdu_temp(item, params, section)) == result
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks based on the Sentry4-MIB for PDU status.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.utils import sentry4_pdu
+
+
+SECTION = {
+    'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1'},
+    'AA2': {'outlet_id': 'AA2', 'outlet_name': 'Master Outlet 2'},
+}
+
+
+@pytest.mark.parametrize('params, result', [
+    ({}, 'Outlet AA1 Master_Outlet_1'),
+    ({'item_naming': 'id_name'}, 'Outlet AA1 Master_Outlet_1'),
+    ({'item_naming': 'id'}, 'Outlet AA1'),
+])
+def test_sentry4_item(params, result):
+    assert sentry4_pdu.sentry4_item('Outlet', 'AA1', 'Master_Outlet_1', params) == result
+
+
+@pytest.mark.parametrize('item, result', [
+    ('Outlet AA1', 'AA1'),
+    ('Outlet AA1 Master_Outlet_1', 'AA1'),
+    ('Outlet AA1 Relabeled_Outlet', 'AA1'),
+    ('Outlet Master Outlet 2', 'AA2'),
+    ('Outlet AA9', None),
+    ('Temperature AA1', None),
+    ('foo', None),
+])
+def test_sentry4_section_key(item, result):
+    assert sentry4_pdu.sentry4_section_key('Outlet', item, SECTION, 'outlet_name') == result
+
+
+TABLE = sentry4_pdu.Sentry4Table(
+    base='.1.3.6.1.4.1.1718.4.1.9',
+    columns=[
+        sentry4_pdu.Sentry4Column('1.10', None),
+        sentry4_pdu.Sentry4Column('2.1.2', 'sensor_id'),
+        sentry4_pdu.Sentry4Column('3.1.1', 'value', float, 10, ('', '-410')),
+        sentry4_pdu.Sentry4Column('3.1.2', 'status', int),
+    ],
+)
+
+
+def test_sentry4_table_fetch():
+    assert TABLE.fetch.base == '.1.3.6.1.4.1.1718.4.1.9'
+    assert TABLE.fetch.oids == ['1.10', '2.1.2', '3.1.1', '3.1.2']
+
+
+@pytest.mark.parametrize('string_table, result', [
+    ([], {}),
+    (
+        [['0', '', '', ''],
+         ['', 'A1', '-410', '7'],
+         ['', 'E1', '155', '0'],
+         ['', 'E2', '170', '']],
+        {
+            'E1': {'sensor_id': 'E1', 'value': 15.5, 'status': 0},
+            'E2': {'sensor_id': 'E2', 'value': 17.0, 'status': None},
+        },
+    ),
+])
+def test_sentry4_table_parse(string_table, result):
+    assert TABLE.parse(string_table) == result
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Local SNMP stand-in for a Sentry4 PDU used by the tool tests.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import threading
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+from sentry4_pdu.standin import SNMPStandIn
+
+
+def sentry4_standin_data(units=2, outlets=24):
+    # A chain of units with outlets, input cords and temperature sensors
+    base = (1, 3, 6, 1, 4, 1, 1718, 4, 1)
+    data = {
+        base + (1, 1, 1, 0): snmp.octet_string('Sentry Switched CDU'),
+        base + (1, 1, 10, 0): snmp.integer(1),
+        base + (9, 1, 10, 0): snmp.integer(0),
+    }
+
+    for unit in range(1, units + 1):
+        unit_id = chr(ord('A') + unit - 1)
+        data[base + (2, 2, 1, 2, unit)] = snmp.octet_string(unit_id)
+        data[base + (2, 2, 1, 3, unit)] = snmp.octet_string(f'Unit_{unit_id}')
+        data[base + (2, 3, 1, 1, unit)] = snmp.integer(0)
+
+        data[base + (3, 2, 1, 2, unit, 1)] = snmp.octet_string(f'{unit_id}A')
+        data[base + (3, 2, 1, 3, unit, 1)] = snmp.octet_string(f'Cord_{unit_id}A')
+        data[base + (3, 3, 1, 3, unit, 1)] = snmp.integer(878)
+
+        for outlet in range(1, outlets + 1):
+            index = (unit, 1, outlet)
+            data[base + (8, 2, 1, 2) + index] = snmp.octet_string(f'{unit_id}A{outlet}')
+            data[base + (8, 2, 1, 3) + index] = snmp.octet_string(f'Outlet_{unit_id}{outlet}')
+            data[base + (8, 3, 1, 1) + index] = snmp.integer(1)
+            data[base + (8, 3, 1, 2) + index] = snmp.integer(0)
+            data[base + (8, 3, 1, 3) + index] = snmp.integer(27)
+            data[base + (8, 3, 1, 6) + index] = snmp.integer(2073)
+
+        data[base + (9, 2, 1, 2, unit, 1)] = snmp.octet_string(f'{unit_id}1')
+        data[base + (9, 2, 1, 3, unit, 1)] = snmp.octet_string(f'Temp_Sensor_{unit_id}1')
+        data[base + (9, 3, 1, 1, unit, 1)] = snmp.integer(155)
+        data[base + (9, 4, 1, 2, unit, 1)] = snmp.integer(1)
+
+    # The first OID after the Sentry4 tables
+    data[(1, 3, 6, 1, 4, 1, 1718, 4, 2, 1, 0)] = snmp.integer(42)
+
+    return data
+
+
+@pytest.fixture
+def snmp_standin():
+    server = SNMPStandIn(sentry4_standin_data())
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the agent sections of the Sentry4 PDU special agent.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from io import StringIO
+
+from sentry4_pdu import snmp
+from sentry4_pdu.agent import write_sections
+from sentry4_pdu.fetch import Sentry4Fetcher
+from sentry4_pdu.sections import SECTIONS
+
+
+def checkmk_string_tables(output):
+    # Splits agent output the way Checkmk does: lines are stripped unless the
+    # section header has 'nostrip'
+    string_tables = {}
+    current = None
+
+    for line in output.splitlines():
+        if line.startswith('<<<') and line.endswith('>>>'):
+            (name, *options) = line[3:-3].split(':')
+            current = string_tables.setdefault(name, [])
+            strip = 'nostrip' not in options
+            separator = '\t' if 'sep(9)' in options else None
+        elif current is not None:
+            current.append((line.strip() if strip else line).split(separator))
+
+    return string_tables
+
+
+def test_write_sections(snmp_standin, tmp_path):
+    # Rows with empty cells at the start (temperature rows after the first
+    # lack st4TempSensorScale) or the end must survive Checkmk's parsing
+    client = snmp.SNMPClient('127.0.0.1', snmp_standin.port)
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    string_tables = Sentry4Fetcher(client, tables, str(tmp_path / 'pdu.json')).fetch()
+
+    output = StringIO()
+    write_sections(string_tables, output)
+    agent_tables = checkmk_string_tables(output.getvalue())
+
+    for (name, (_table, parse_function)) in SECTIONS.items():
+        assert agent_tables[f'{name}_agent'] == string_tables[name]
+        assert parse_function(agent_tables[f'{name}_agent']) == parse_function(string_tables[name])
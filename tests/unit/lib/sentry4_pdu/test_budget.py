@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the SNMP request budget of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+from sentry4_pdu.budget import Topology, fetch_budget, format_budget, measure_budget, topology_data, verify
+from sentry4_pdu.sections import SECTIONS
+
+TABLES = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+
+
+@pytest.mark.parametrize('outlets, max_repetitions, requests', [
+    (1, 10, 1),
+    (9, 10, 1),
+    (10, 10, 2),
+    (24, 10, 3),
+    (24, 25, 1),
+    (48, 25, 2),
+])
+def test_column_requests(outlets, max_repetitions, requests):
+    # A walk ends with the first varbind outside the column
+    budget = fetch_budget(TABLES, Topology(outlets=outlets), max_repetitions)
+    (rows, columns, cost) = budget['sentry4_pdu_outlet']
+    assert rows == outlets
+    assert cost.requests == requests * columns
+
+
+def test_topology_data():
+    data = topology_data({'sentry4_pdu_outlet': TABLES['sentry4_pdu_outlet']}, Topology(units=2, cords=2, outlets=3), name_length=8)
+    outlet_name = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.2.1.3')
+
+    assert len(data) == 2 * 2 * 3 * 8
+    assert data[outlet_name + (2, 1, 3)] == snmp.octet_string('BA3_xxxx')
+    assert data[outlet_name[:-1] + (2, 2, 2, 1)] == snmp.octet_string('BB1')
+
+
+@pytest.mark.parametrize('topology, max_repetitions, version', [
+    (Topology(), 10, snmp.VERSION_2C),
+    (Topology(units=2, cords=2, outlets=16, temp_sensors=2, humid_sensors=0), 25, snmp.VERSION_2C),
+    (Topology(outlets=8), 10, snmp.VERSION_1),
+])
+def test_budget_matches_standin(topology, max_repetitions, version):
+    budget = fetch_budget(TABLES, topology, max_repetitions, version)
+    measured = measure_budget(TABLES, topology, max_repetitions, version)
+
+    assert verify(budget, measured)
+    assert [cost.requests for (_rows, _columns, cost) in measured.values()] == [cost.requests for (_rows, _columns, cost) in budget.values()]
+
+
+def test_format_budget():
+    budget = fetch_budget(TABLES, Topology())
+    lines = format_budget(budget, rtt=0.01, pdus=100, interval=60.0).splitlines()
+
+    assert lines[-2].split()[:2] == ['Per', 'PDU']
+    requests = int(lines[-2].split()[2])
+    assert lines[-1].split()[:4] == ['Per', 'site', '(100', 'PDUs)']
+    assert int(lines[-1].split()[4]) == 100 * requests
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the adaptive sampling collector of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import os
+import threading
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+from sentry4_pdu.collector import PDUCollector, cache_main, is_active, readings, run
+from sentry4_pdu.fetch import Sentry4Fetcher
+from sentry4_pdu.ringbuffer import RingBuffer, SampleStore
+from sentry4_pdu.sections import SECTIONS
+
+OUTLET_CURRENT = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.3')
+OUTLET_STATUS = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.2')
+
+
+def parsed(current=2.7, temperature=15.5, status=0):
+    return {
+        'sentry4_pdu_outlet': {'AA1': {'current': current, 'status': status}},
+        'sentry4_pdu_temp': {'A1': {'value': temperature, 'status': 0}},
+    }
+
+
+@pytest.mark.parametrize('previous, current, result', [
+    (None, parsed(), False),
+    (None, parsed(status=12), True),
+    (parsed(), parsed(), False),
+    (parsed(), parsed(current=2.75), False),
+    (parsed(), parsed(current=2.9), True),
+    (parsed(), parsed(temperature=16.5), True),
+    (parsed(), parsed(status=1), False),
+    (parsed(current=None), parsed(), False),
+    (None, dict(parsed(), sentry4_pdu_status={'A': {'Unit': 'A', 'Status': 0}}), False),
+    (None, dict(parsed(), sentry4_pdu_status={'A': {'Unit': 'A', 'Status': 12}}), True),
+])
+def test_is_active(previous, current, result):
+    assert is_active(previous and readings(previous), readings(current)) is result
+
+
+@pytest.fixture
+def collector(snmp_standin, tmp_path):
+    client = snmp.SNMPClient('127.0.0.1', snmp_standin.port)
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    parse_functions = {name: parse_function for (name, (_table, parse_function)) in SECTIONS.items()}
+    fetcher = Sentry4Fetcher(client, tables, str(tmp_path / 'pdu.json'))
+    return PDUCollector('pdu', fetcher, parse_functions, str(tmp_path / 'pdu.txt'), min_interval=15.0, max_interval=60.0)
+
+
+def test_collector_backs_off(collector):
+    assert [collector.poll() for _poll in range(4)] == [30.0, 60.0, 60.0, 60.0]
+
+
+def test_collector_backs_off_on_failures(collector, monkeypatch):
+    fetch = collector.fetcher.fetch
+
+    def fail():
+        raise snmp.SNMPTimeout('no response')
+
+    monkeypatch.setattr(collector.fetcher, 'fetch', fail)
+    assert [collector.poll() for _poll in range(4)] == [15.0, 30.0, 60.0, 60.0]
+
+    monkeypatch.setattr(collector.fetcher, 'fetch', fetch)
+    assert [collector.poll() for _poll in range(2)] == [30.0, 60.0]
+
+
+def test_collector_polls_fast_while_moving(collector, snmp_standin):
+    collector.poll()
+    collector.poll()
+
+    snmp_standin.data[OUTLET_CURRENT + (1, 1, 1)] = snmp.integer(270)
+    assert collector.poll() == 15.0
+    assert collector.poll() == 30.0
+
+    snmp_standin.data[OUTLET_STATUS + (1, 1, 1)] = snmp.integer(12)
+    assert collector.poll() == 15.0
+    assert collector.poll() == 15.0
+
+
+def test_collector_cache(collector, snmp_standin, tmp_path, capsys):
+    collector.poll()
+
+    assert cache_main(['pdu', '--cache-dir', str(tmp_path)]) == 0
+    output = capsys.readouterr().out
+    assert '<<<sentry4_pdu_outlet_agent:sep(9):nostrip>>>\nAA1\tOutlet_A1\t1\t0\t27\t2073\t\t\n' in output
+
+    os.utime(tmp_path / 'pdu.txt', (0, 0))
+    assert cache_main(['pdu', '--cache-dir', str(tmp_path)]) == 1
+    assert cache_main(['other', '--cache-dir', str(tmp_path)]) == 1
+
+
+def test_collector_samples(collector, tmp_path):
+    collector.store = SampleStore(str(tmp_path / 'samples'), 100)
+    collector.poll()
+    collector.poll()
+    collector.store.close()
+
+    with RingBuffer.open(collector.store.path('pdu')) as ring:
+        assert len(ring) == 2
+        assert ring.samples()[1][1][ring.channels.index('outlet:AA1:current')] == pytest.approx(0.27)
+
+
+def test_run(collector):
+    stop = threading.Event()
+    collector.poll = lambda: stop.set() or 15.0
+
+    run([collector], stop)
+    assert stop.is_set()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the Prometheus/OpenMetrics exporter of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import socket
+import threading
+import time
+import urllib.request
+import uuid
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+from sentry4_pdu.exporter import ExporterServer, PDUTarget, Sentry4Exporter, SharedPDUTarget, service_states
+from sentry4_pdu.fetch import Sentry4Fetcher
+from sentry4_pdu.sections import SECTIONS
+from sentry4_pdu.shared import SharedModelPublisher
+
+OUTLET_STATUS = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.2')
+OUTLET_ACTIVE_POWER = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.7')
+OUTLET_APPARENT_POWER = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.9')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def target(name, port, tmp_path, clock):
+    client = snmp.SNMPClient('127.0.0.1', port, timeout=0.2, retries=0)
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    parse_functions = {name: parse_function for (name, (_table, parse_function)) in SECTIONS.items()}
+    fetcher = Sentry4Fetcher(client, tables, str(tmp_path / f'{name}.json'))
+    return PDUTarget(name, fetcher, parse_functions, ttl=10.0, clock=clock)
+
+
+@pytest.fixture
+def exporter(snmp_standin, tmp_path, clock):
+    return Sentry4Exporter([target('pdu01', snmp_standin.port, tmp_path, clock)])
+
+
+def test_exporter_render(exporter, snmp_standin):
+    # The stand-in lacks the outlet power the outlet check needs
+    for (oid, _value) in list(snmp_standin.data.items()):
+        if oid[:len(OUTLET_STATUS)] == OUTLET_STATUS:
+            snmp_standin.data[OUTLET_ACTIVE_POWER + oid[len(OUTLET_STATUS):]] = snmp.integer(56)
+            snmp_standin.data[OUTLET_APPARENT_POWER + oid[len(OUTLET_STATUS):]] = snmp.integer(60)
+    snmp_standin.data[OUTLET_STATUS + (2, 1, 3)] = snmp.integer(12)
+    lines = exporter.render().splitlines()
+
+    assert '# TYPE sentry4_outlet_current_amperes gauge' in lines
+    assert 'sentry4_outlet_current_amperes{pdu="pdu01",outlet="AA1",name="Outlet_A1"} 0.27' in lines
+    assert 'sentry4_outlet_active_power_watts{pdu="pdu01",outlet="AA1",name="Outlet_A1"} 56' in lines
+    assert 'sentry4_temperature_celsius{pdu="pdu01",sensor="A1",name="Temp_Sensor_A1"} 15.5' in lines
+    assert 'sentry4_service_state{pdu="pdu01",service="Outlet AA1"} 0' in lines
+    assert 'sentry4_service_state{pdu="pdu01",service="Outlet BA3"} 2' in lines
+    assert 'sentry4_up{pdu="pdu01"} 1' in lines
+    assert not any(line.startswith('sentry4_inlet_power_factor{') for line in lines)
+    assert lines[-1] != '# EOF'
+    assert exporter.render(openmetrics=True).endswith('\n# EOF\n')
+
+
+def test_exporter_caches_between_scrapes(exporter, snmp_standin, clock):
+    exporter.render()
+    requests = len(snmp_standin.requests)
+
+    clock.now += 9
+    exporter.render()
+    assert len(snmp_standin.requests) == requests
+
+    clock.now += 1
+    exporter.render()
+    assert len(snmp_standin.requests) > requests
+
+
+def test_exporter_pdu_down(snmp_standin, tmp_path, clock):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+        silent.bind(('127.0.0.1', 0))
+        exporter = Sentry4Exporter([
+            target('pdu01', snmp_standin.port, tmp_path, clock),
+            target('pdu02', silent.getsockname()[1], tmp_path, clock),
+        ])
+        lines = exporter.render().splitlines()
+
+    assert 'sentry4_up{pdu="pdu01"} 1' in lines
+    assert 'sentry4_up{pdu="pdu02"} 0' in lines
+    assert not any('pdu="pdu02",' in line for line in lines)
+
+
+def test_exporter_target_error(snmp_standin, tmp_path, clock, monkeypatch):
+    def attach(host):
+        raise ValueError(f'corrupt shared model of {host}')
+
+    monkeypatch.setattr('sentry4_pdu.exporter.attach', attach)
+    broken = target('pdu02', snmp_standin.port, tmp_path, clock)
+    broken.parse_functions = dict(broken.parse_functions, sentry4_pdu_outlet=lambda string_table: 1 / 0)
+    exporter = Sentry4Exporter([
+        target('pdu01', snmp_standin.port, tmp_path, clock),
+        broken,
+        SharedPDUTarget('pdu03'),
+    ])
+    lines = exporter.render().splitlines()
+
+    assert 'sentry4_up{pdu="pdu01"} 1' in lines
+    assert 'sentry4_up{pdu="pdu02"} 0' in lines
+    assert 'sentry4_up{pdu="pdu03"} 0' in lines
+    assert not any('pdu="pdu02",' in line for line in lines)
+
+
+def test_exporter_from_collector():
+    publisher = SharedModelPublisher(f'pdu-{uuid.uuid4()}')
+    exporter = Sentry4Exporter([SharedPDUTarget(publisher.host, max_age=600.0)])
+
+    try:
+        assert f'sentry4_up{{pdu="{publisher.host}"}} 0' in exporter.render().splitlines()
+
+        publisher.publish(time.time(), {'sentry4_pdu_temp': {'A1': {'sensor_id': 'A1', 'name': 'T', 'value': 21.5, 'status': 0}}})
+        lines = exporter.render().splitlines()
+        assert f'sentry4_up{{pdu="{publisher.host}"}} 1' in lines
+        assert f'sentry4_temperature_celsius{{pdu="{publisher.host}",sensor="A1",name="T"}} 21.5' in lines
+
+        publisher.publish(time.time() - 601, {})
+        assert f'sentry4_up{{pdu="{publisher.host}"}} 0' in exporter.render().splitlines()
+    finally:
+        publisher.close()
+
+
+@pytest.mark.parametrize('parsed, result', [
+    ({}, {}),
+    ({'sentry4_pdu_temp': {'A1': {'sensor_id': 'A1', 'name': 'T', 'value': 45.0, 'status': 0, 'low_alarm': 0, 'low_warning': 5, 'high_warning': 40, 'high_alarm': 50}}},
+     {'Temperature A1': 1}),
+    ({'sentry4_pdu_outlet': {'AA1': {'outlet_id': 'AA1', 'outlet_name': 'O', 'state': 1, 'status': 0, 'current': None, 'voltage': None, 'active_power': None, 'apparent_power': None}}},
+     {'Outlet AA1': 3}),
+])
+def test_service_states(parsed, result):
+    assert service_states(parsed) == result
+
+
+def test_exporter_http(exporter):
+    server = ExporterServer(('127.0.0.1', 0), exporter)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(urllib.request.Request(url, headers={'Accept': 'application/openmetrics-text'})) as response:
+            assert response.headers['Content-Type'].startswith('application/openmetrics-text')
+            assert b'sentry4_up{pdu="pdu01"} 1\n' in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
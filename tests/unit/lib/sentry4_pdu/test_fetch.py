@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the targeted GET fetching of the Sentry4 PDU special agent.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import json
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+from sentry4_pdu.fetch import Sentry4Fetcher, string_table
+from sentry4_pdu.sections import SECTIONS
+
+OUTLET_TABLE = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8')
+TEMP_VALUE = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.9.3.1.1')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def fetcher(snmp_standin, clock, tmp_path):
+    client = snmp.SNMPClient('127.0.0.1', snmp_standin.port)
+    tables = {name: table for (name, (table, _parse_function)) in SECTIONS.items()}
+    return Sentry4Fetcher(client, tables, str(tmp_path / 'pdu.json'), full_walk_interval=3600.0, max_oids=40, clock=clock)
+
+
+def parsed(string_tables):
+    return {name: parse_function(string_tables[name]) for (name, (_table, parse_function)) in SECTIONS.items()}
+
+
+@pytest.mark.parametrize('columns, result', [
+    ([{}, {}], []),
+    ([{(1, 1): 'A1', (1, 2): 'A2'}, {(1, 2): '5', (0,): '1'}], [['', '1'], ['A1', ''], ['A2', '5']]),
+])
+def test_string_table(columns, result):
+    assert string_table(columns) == result
+
+
+def test_fetch_targeted_after_walk(fetcher):
+    walked = fetcher.fetch()
+    assert fetcher.full_walk
+    walk_requests = fetcher.client.requests
+
+    fetched = fetcher.fetch()
+    assert not fetcher.full_walk
+    assert fetched == walked
+    assert fetcher.client.requests - walk_requests < walk_requests
+
+
+def test_fetch_walks_on_schedule(fetcher, clock):
+    fetcher.fetch()
+
+    clock.now += 3599
+    fetcher.fetch()
+    assert not fetcher.full_walk
+
+    clock.now += 1
+    fetcher.fetch()
+    assert fetcher.full_walk
+
+
+def test_fetch_walks_on_missing_index(fetcher, snmp_standin):
+    fetcher.fetch()
+
+    for oid in [oid for oid in snmp_standin.data if oid[:len(OUTLET_TABLE)] == OUTLET_TABLE and oid[-3:] == (2, 1, 24)]:
+        del snmp_standin.data[oid]
+
+    fetched = parsed(fetcher.fetch())
+    assert fetcher.full_walk
+    assert 'BA24' not in fetched['sentry4_pdu_outlet']
+    assert 'BA23' in fetched['sentry4_pdu_outlet']
+
+
+def test_fetch_skips_sentinel_rows(fetcher, snmp_standin):
+    snmp_standin.data[TEMP_VALUE + (2, 1)] = snmp.integer(-410)
+
+    walked = fetcher.fetch()
+    fetched = fetcher.fetch()
+    assert not fetcher.full_walk
+
+    requested = [oid for request in snmp_standin.requests if request.pdu_type == snmp.GET_REQUEST for (oid, _value) in request.varbinds]
+    assert TEMP_VALUE + (2, 1) not in requested
+    assert TEMP_VALUE + (1, 1) in requested
+    assert parsed(fetched) == parsed(walked)
+    assert list(parsed(fetched)['sentry4_pdu_temp']) == ['A1']
+
+
+def test_fetch_walks_on_error_status(fetcher, monkeypatch):
+    walked = fetcher.fetch()
+    request = fetcher.client.request
+
+    def gen_err(pdu_type, varbinds, *args):
+        response = request(pdu_type, varbinds, *args)
+        if pdu_type == snmp.GET_REQUEST:
+            # genErr echoes the request varbinds
+            return response._replace(error_status=5, error_index=1, varbinds=varbinds)
+        return response
+
+    monkeypatch.setattr(fetcher.client, 'request', gen_err)
+
+    assert fetcher.fetch() == walked
+    assert fetcher.full_walk
+
+
+def _drop_outlet_column(state):
+    state['columns']['sentry4_pdu_outlet'].pop()
+    state['indexes']['sentry4_pdu_outlet'].pop()
+
+
+def _drop_section(state):
+    del state['columns']['sentry4_pdu_temp']
+    del state['indexes']['sentry4_pdu_temp']
+
+
+def _drop_columns(state):
+    del state['columns']
+
+
+def _break_indexes(state):
+    state['indexes']['sentry4_pdu_outlet'][0] = ['1.1']
+
+
+@pytest.mark.parametrize('change_state', [
+    _drop_outlet_column,
+    _drop_section,
+    _drop_columns,
+    _break_indexes,
+])
+def test_fetch_walks_on_other_state(fetcher, change_state):
+    walked = fetcher.fetch()
+
+    with open(fetcher.state_file) as state_file:
+        state = json.load(state_file)
+    change_state(state)
+    with open(fetcher.state_file, 'w') as state_file:
+        json.dump(state, state_file)
+
+    assert fetcher.fetch() == walked
+    assert fetcher.full_walk
+
+    fetcher.fetch()
+    assert not fetcher.full_walk
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the caching SNMP proxy of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import threading
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+from sentry4_pdu.proxy import MAX_CACHES_PER_ADDRESS, ProxyServer, Sentry4Proxy
+from sentry4_pdu.sections import CONFIG_MODIFIED_OID, table_subtrees
+
+OUTLET_NAME = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.2.1.3')
+OUTLET_CURRENT = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.3')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def proxy(snmp_standin, clock):
+    (config_subtrees, monitor_subtrees) = table_subtrees()
+    proxy = Sentry4Proxy(config_subtrees, monitor_subtrees, snmp.oid_from_str(CONFIG_MODIFIED_OID), ttl=30.0, clock=clock, allowed=[f'127.0.0.1:{snmp_standin.port}'])
+    server = ProxyServer(('127.0.0.1', 0), proxy)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    proxy.port = server.server_address[1]
+    yield proxy
+    server.shutdown()
+    server.server_close()
+
+
+def proxy_client(proxy, snmp_standin, version=snmp.VERSION_2C):
+    return snmp.SNMPClient('127.0.0.1', proxy.port, f'public@127.0.0.1:{snmp_standin.port}', version)
+
+
+@pytest.mark.parametrize('version', [snmp.VERSION_1, snmp.VERSION_2C])
+def test_proxy_walk_matches_device(proxy, snmp_standin, version):
+    direct = snmp.SNMPClient('127.0.0.1', snmp_standin.port, version=version)
+    client = proxy_client(proxy, snmp_standin, version)
+
+    for oid in (OUTLET_NAME, OUTLET_CURRENT):
+        assert client.walk(oid, 10) == direct.walk(oid, 10)
+
+
+def test_proxy_saves_device_requests(proxy, snmp_standin):
+    sites = [proxy_client(proxy, snmp_standin) for _site in range(3)]
+
+    for client in sites:
+        client.walk(OUTLET_NAME, 10)
+        client.walk(OUTLET_CURRENT, 10)
+
+    stats = proxy.stats()
+    assert stats['client_requests'] == sum(client.requests for client in sites)
+    assert stats['device_requests'] == len(snmp_standin.requests)
+    assert stats['cache_hits'] == stats['client_requests']
+    assert stats['device_requests_saved'] > 0
+    assert stats['hit_rate'] == 1.0
+
+
+def test_proxy_ttl(proxy, snmp_standin, clock):
+    client = proxy_client(proxy, snmp_standin)
+    current = OUTLET_CURRENT + (1, 1, 1)
+
+    assert client.get([current])[0][1] == snmp.integer(27)
+
+    snmp_standin.data[current] = snmp.integer(30)
+    assert client.get([current])[0][1] == snmp.integer(27)
+
+    clock.now += 30
+    assert client.get([current])[0][1] == snmp.integer(30)
+
+
+def test_proxy_config_walked_on_change_only(proxy, snmp_standin, clock):
+    client = proxy_client(proxy, snmp_standin)
+    name = OUTLET_NAME + (1, 1, 1)
+    counter = snmp.oid_from_str(CONFIG_MODIFIED_OID)
+
+    assert client.get([name])[0][1] == snmp.octet_string('Outlet_A1')
+
+    snmp_standin.data[name] = snmp.octet_string('Relabeled')
+    clock.now += 30
+    requests = len(snmp_standin.requests)
+    assert client.get([name])[0][1] == snmp.octet_string('Outlet_A1')
+    assert len(snmp_standin.requests) == requests + 1
+
+    snmp_standin.data[counter] = snmp.integer(2)
+    clock.now += 30
+    assert client.get([name])[0][1] == snmp.octet_string('Relabeled')
+
+
+def test_proxy_config_walk_fails(proxy, snmp_standin, monkeypatch):
+    device = proxy.device(f'public@127.0.0.1:{snmp_standin.port}', snmp.VERSION_2C)
+    walk = device.client.walk
+
+    def timeout(*args):
+        raise snmp.SNMPTimeout('no response')
+
+    monkeypatch.setattr(device.client, 'walk', timeout)
+    with pytest.raises(snmp.SNMPTimeout):
+        device.get_next(OUTLET_NAME)
+    assert device.subtree(OUTLET_NAME).get_next(OUTLET_NAME) is None
+
+    # The config subtrees are walked once the PDU answers again
+    monkeypatch.setattr(device.client, 'walk', walk)
+    client = proxy_client(proxy, snmp_standin)
+    response = client.request(snmp.GET_NEXT_REQUEST, [(OUTLET_NAME, snmp.NULL)])
+    assert response.varbinds == [(OUTLET_NAME + (1, 1, 1), snmp.octet_string('Outlet_A1'))]
+    assert proxy.stats()['cache_hits'] == 1
+
+
+def test_proxy_forwards_other_requests(proxy, snmp_standin):
+    client = proxy_client(proxy, snmp_standin)
+    detect = snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.1.1.1.0')
+
+    assert client.get([detect])[0][1] == snmp.octet_string('Sentry Switched CDU')
+    assert proxy.stats()['forwarded'] == 1
+
+
+def test_proxy_coalesces_concurrent_walks(proxy, snmp_standin):
+    sites = [proxy_client(proxy, snmp_standin) for _site in range(5)]
+    threads = [threading.Thread(target=client.walk, args=(OUTLET_CURRENT, 10)) for client in sites]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    device_requests = len(snmp_standin.requests)
+
+    # A single walk of the outlet monitor subtree
+    walked = snmp.SNMPClient('127.0.0.1', snmp_standin.port)
+    walked.walk(OUTLET_CURRENT[:-2], 25)
+    assert device_requests == walked.requests
+
+
+def test_proxy_unknown_device(proxy):
+    client = snmp.SNMPClient('127.0.0.1', proxy.port, 'public', timeout=0.2, retries=0)
+    with pytest.raises(snmp.SNMPTimeout):
+        client.get([(1, 3, 6, 1, 2, 1, 1, 1, 0)])
+
+
+def test_proxy_drops_set_requests(proxy, snmp_standin):
+    client = proxy_client(proxy, snmp_standin)
+    client.timeout = 0.2
+    client.retries = 0
+    name = OUTLET_NAME + (1, 1, 1)
+
+    with pytest.raises(snmp.SNMPTimeout):
+        client.request(snmp.SET_REQUEST, [(name, snmp.octet_string('Relabeled'))])
+    assert not [request for request in snmp_standin.requests if request.pdu_type == snmp.SET_REQUEST]
+
+
+def test_proxy_allowed_addresses(proxy, snmp_standin):
+    client = snmp.SNMPClient('127.0.0.1', proxy.port, f'public@127.0.0.1:{snmp_standin.port + 1}', timeout=0.2, retries=0)
+    with pytest.raises(snmp.SNMPTimeout):
+        client.get([OUTLET_NAME + (1, 1, 1)])
+
+    with pytest.raises(snmp.SNMPError):
+        proxy.device(f'public@10.0.0.1:{snmp_standin.port}', snmp.VERSION_2C)
+
+
+def test_proxy_caches_per_address(proxy, snmp_standin):
+    for community in range(MAX_CACHES_PER_ADDRESS + 3):
+        proxy.device(f'community{community}@127.0.0.1:{snmp_standin.port}', snmp.VERSION_2C)
+
+    assert len(proxy._devices) == MAX_CACHES_PER_ADDRESS  # pylint: disable=protected-access
+    assert proxy.device(f'public@127.0.0.1:{snmp_standin.port}', snmp.VERSION_2C) is not None
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the ring buffers of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import math
+import os
+
+import pytest  # type: ignore[import]
+from sentry4_pdu.ringbuffer import RingBuffer, SampleStore, channel_values
+
+PARSED = {
+    'sentry4_pdu_outlet': {
+        'AA1': {'current': 0.27, 'active_power': 56},
+        'AA2': {'current': None, 'active_power': None},
+    },
+    'sentry4_pdu_inlet': {
+        'AA': {'active_power': 878},
+    },
+}
+
+
+def test_channel_values():
+    assert channel_values(PARSED) == {
+        'outlet:AA1:current': 0.27,
+        'outlet:AA2:current': None,
+        'outlet:AA1:active_power': 56,
+        'outlet:AA2:active_power': None,
+        'inlet:AA:active_power': 878,
+    }
+
+
+@pytest.mark.parametrize('appended, result', [
+    (0, []),
+    (2, [0, 1]),
+    (3, [0, 1, 2]),
+    (5, [2, 3, 4]),
+    (6, [3, 4, 5]),
+])
+def test_ring_buffer_wraps(tmp_path, appended, result):
+    with RingBuffer.create(str(tmp_path / 'pdu.ring'), ['a', 'b'], 3) as ring:
+        for sample in range(appended):
+            ring.append(float(sample), {'a': sample, 'b': sample * 2})
+
+        assert len(ring) == len(result)
+        assert ring.samples() == [(float(sample), [float(sample), float(sample * 2)]) for sample in result]
+
+
+def test_ring_buffer_file(tmp_path):
+    path = str(tmp_path / 'pdu.ring')
+
+    with RingBuffer.create(path, ['a', 'b', 'c'], 100) as ring:
+        size = os.path.getsize(path)
+        for sample in range(250):
+            ring.append(float(sample), {'a': 1.5, 'c': 2.5})
+        assert os.path.getsize(path) == size
+
+    with RingBuffer.open(path) as ring:
+        assert ring.channels == ['a', 'b', 'c']
+        assert ring.count == 250
+        (timestamp, (a, b, c)) = ring.samples()[0]
+        assert (timestamp, a, c) == (150.0, 1.5, 2.5)
+        assert math.isnan(b)
+
+        with pytest.raises(TypeError):
+            ring.append(250.0, {})
+
+    with open(path, 'r+b') as ring_file:
+        ring_file.write(b'XXXX')
+    with pytest.raises(ValueError):
+        RingBuffer.open(path)
+
+
+def test_ring_buffer_segments(tmp_path):
+    numpy = pytest.importorskip('numpy')
+
+    with RingBuffer.create(str(tmp_path / 'pdu.ring'), ['a', 'b'], 4) as writer, RingBuffer.open(writer.path) as reader:
+        for sample in range(6):
+            writer.append(float(sample), {'a': sample, 'b': -sample})
+
+        segments = reader.segments()
+        assert [list(timestamps) for (timestamps, _values) in segments] == [[2.0, 3.0], [4.0, 5.0]]
+        assert numpy.concatenate([values for (_timestamps, values) in segments])[:, 1].tolist() == [-2.0, -3.0, -4.0, -5.0]
+
+        # The views follow the writer without copying
+        writer.append(6.0, {'a': 6, 'b': -6})
+        assert segments[0][0][0] == 6.0
+
+
+def test_sample_store(tmp_path):
+    store = SampleStore(str(tmp_path), 10)
+    store.append('pdu', 1.0, PARSED)
+    store.append('pdu', 2.0, PARSED)
+    store.close()
+
+    with RingBuffer.open(store.path('pdu')) as ring:
+        assert ring.channels == sorted(channel_values(PARSED))
+        assert [timestamp for (timestamp, _values) in ring.samples()] == [1.0, 2.0]
+
+    # A new outlet starts a new file, the previous one is kept
+    parsed = {'sentry4_pdu_outlet': dict(PARSED['sentry4_pdu_outlet'], AA3={'current': 0.1, 'active_power': 20})}
+    store.append('pdu', 3.0, parsed)
+    store.close()
+
+    with RingBuffer.open(store.path('pdu')) as ring:
+        assert 'outlet:AA3:current' in ring.channels
+        assert ring.count == 1
+    with RingBuffer.open(f"{store.path('pdu')}.old") as ring:
+        assert ring.count == 2
+
+    # Missing outlets are stored as NaN in the same file
+    store.append('pdu', 4.0, PARSED)
+    store.close()
+
+    with RingBuffer.open(store.path('pdu')) as ring:
+        assert ring.count == 2
+        assert math.isnan(ring.samples()[1][1][ring.channels.index('outlet:AA3:current')])
+
+    # Another new outlet keeps the known ones
+    parsed = {'sentry4_pdu_outlet': dict(PARSED['sentry4_pdu_outlet'], AA4={'current': 0.2, 'active_power': 40})}
+    store.append('pdu', 5.0, parsed)
+    store.close()
+
+    with RingBuffer.open(store.path('pdu')) as ring:
+        assert {'outlet:AA3:current', 'outlet:AA4:current'} <= set(ring.channels)
+        assert ring.count == 1
+
+    # A shorter file does not replace a longer .old
+    parsed = {'sentry4_pdu_outlet': dict(parsed['sentry4_pdu_outlet'], AA5={'current': 0.3, 'active_power': 60})}
+    store.append('pdu', 6.0, parsed)
+    store.close()
+
+    with RingBuffer.open(store.path('pdu')) as ring:
+        assert 'outlet:AA5:current' in ring.channels
+        assert [timestamp for (timestamp, _values) in ring.samples()] == [6.0]
+    with RingBuffer.open(f"{store.path('pdu')}.old") as ring:
+        assert [timestamp for (timestamp, _values) in ring.samples()] == [3.0, 4.0]
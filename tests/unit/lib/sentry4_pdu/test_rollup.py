@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the power rollup of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import io
+import os
+
+import pytest  # type: ignore[import]
+from sentry4_pdu.agent import write_sections
+from sentry4_pdu.rollup import parse_agent_output, read_locations, rollup_levels, rollup_racks, write_piggyback
+from sentry4_pdu.sections import SECTIONS
+
+PARSE_FUNCTIONS = {name: parse_function for (name, (_table, parse_function)) in SECTIONS.items()}
+
+
+def agent_output(cord_power, currents, temperatures):
+    string_tables = {
+        'sentry4_pdu_inlet': [['AA', 'Cord_AA', '1', '0', str(cord_power), '', '', '']],
+        'sentry4_pdu_outlet': [[f'AA{outlet}', f'Outlet_{outlet}', '1', '0', str(current), '2073', '', ''] for (outlet, current) in enumerate(currents, 1)],
+        'sentry4_pdu_temp': [['0'] + [''] * 8] + [['', f'A{sensor}', 'Temp', str(value), status, '', '', '', ''] for (sensor, (value, status)) in enumerate(temperatures, 1)],
+    }
+    output = io.StringIO()
+    write_sections(string_tables, output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('lines, result', [
+    ([], {}),
+    (['# host site row rack\n', 'pdu01 dc1 r1 k1\n', 'pdu02 dc1 r1 k1  # second feed\n', 'broken line\n'],
+     {'pdu01': ('dc1', 'r1', 'k1'), 'pdu02': ('dc1', 'r1', 'k1')}),
+])
+def test_read_locations(lines, result):
+    assert read_locations(lines) == result
+
+
+def test_parse_agent_output():
+    parsed = parse_agent_output(io.StringIO(agent_output(878, [27, 130], [(215, '0')])), PARSE_FUNCTIONS)
+
+    assert parsed['sentry4_pdu_inlet']['AA']['active_power'] == 878
+    assert parsed['sentry4_pdu_outlet']['AA2']['current'] == 1.3
+    assert parsed['sentry4_pdu_temp']['A1']['value'] == 21.5
+    assert parsed['sentry4_pdu_temp']['A1']['status'] == 0
+    assert parsed['sentry4_pdu_humid'] == {}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    outputs = {
+        'pdu01': agent_output(800, [100, 150], [(215, '0'), (990, '9')]),
+        'pdu02': agent_output(1200, [250], [(265, '0')]),
+        'pdu03': agent_output(500, [200], [(301, '0')]),
+        'pdu04': agent_output(999, [999], [(999, '0')]),
+    }
+    for (host, output) in outputs.items():
+        (tmp_path / f'{host}.txt').write_text(output)
+    os.utime(tmp_path / 'pdu04.txt', (0, 0))
+    return str(tmp_path)
+
+
+LOCATIONS = {
+    'pdu01': ('dc1', 'r1', 'k1'),
+    'pdu02': ('dc1', 'r1', 'k1'),
+    'pdu03': ('dc1', 'r2', 'k7'),
+    'pdu04': ('dc1', 'r2', 'k7'),
+    'pdu05': ('dc1', 'r2', 'k8'),
+}
+
+
+def test_rollup_racks(cache):
+    racks = rollup_racks(LOCATIONS, PARSE_FUNCTIONS, cache)
+
+    assert list(racks) == [('dc1', 'r1', 'k1'), ('dc1', 'r2', 'k7'), ('dc1', 'r2', 'k8')]
+    assert racks['dc1', 'r1', 'k1'].lines('rack') == ['level\track', 'pdus\t2', 'stale\t0', 'cord_power\t2000', 'outlet_current\t5.0', 'max_temperature\t26.5\tpdu02 A1']
+    assert racks['dc1', 'r2', 'k7'].lines('rack') == ['level\track', 'pdus\t1', 'stale\t1', 'cord_power\t500', 'outlet_current\t2.0', 'max_temperature\t30.1\tpdu03 A1']
+    assert racks['dc1', 'r2', 'k8'].lines('rack') == ['level\track', 'pdus\t0', 'stale\t1', 'cord_power\t0', 'outlet_current\t0.0']
+
+
+def test_rollup_levels(cache):
+    levels = list(rollup_levels(rollup_racks(LOCATIONS, PARSE_FUNCTIONS, cache)))
+
+    assert [(host, level) for (host, level, _totals) in levels] == [
+        ('dc1', 'site'),
+        ('dc1-r1', 'row'),
+        ('dc1-r2', 'row'),
+        ('dc1-r1-k1', 'rack'),
+        ('dc1-r2-k7', 'rack'),
+        ('dc1-r2-k8', 'rack'),
+    ]
+    assert levels[0][2].lines('site') == ['level\tsite', 'pdus\t3', 'stale\t2', 'cord_power\t2500', 'outlet_current\t7.0', 'max_temperature\t30.1\tpdu03 A1']
+
+    output = io.StringIO()
+    write_piggyback(levels[:1], output)
+    assert output.getvalue() == (
+        '<<<<dc1>>>>\n'
+        '<<<sentry4_pdu_rollup:sep(9)>>>\n'
+        'level\tsite\npdus\t3\nstale\t2\ncord_power\t2500\noutlet_current\t7.0\nmax_temperature\t30.1\tpdu03 A1\n'
+        '<<<<>>>>\n'
+    )
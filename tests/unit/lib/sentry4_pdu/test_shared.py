@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the shared memory sections of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import math
+import uuid
+
+import pytest  # type: ignore[import]
+from sentry4_pdu.shared import SharedModelPublisher, attach
+
+OUTLETS = {
+    'AA1': {'outlet_id': 'AA1', 'outlet_name': 'Master_Outlet_1', 'state': 1, 'status': 0, 'current': 0.27, 'voltage': 207.3, 'active_power': 56, 'apparent_power': None},
+    'AA2': {'outlet_id': 'AA2', 'outlet_name': None, 'state': 2, 'status': 12, 'current': None, 'voltage': 207.3, 'active_power': 0, 'apparent_power': None},
+}
+
+
+@pytest.fixture
+def publisher():
+    publisher = SharedModelPublisher(f'pdu-{uuid.uuid4()}')
+    yield publisher
+    publisher.close()
+
+
+@pytest.mark.parametrize('parsed', [
+    {},
+    {'sentry4_pdu_humid': {}},
+    {'sentry4_pdu_outlet': OUTLETS},
+    {'sentry4_pdu_outlet': OUTLETS, 'sentry4_pdu_temp': {'A1': {'sensor_id': 'A1', 'name': 'Temp_Sensor_Ä1', 'value': 21.1, 'high_alarm': 37.8}}},
+])
+def test_shared_sections(publisher, parsed):
+    publisher.publish(1650000000.5, parsed)
+
+    with attach(publisher.host) as model:
+        assert model.timestamp == 1650000000.5
+        assert model.sections() == parsed
+
+
+def test_shared_column(publisher):
+    publisher.publish(1.0, {'sentry4_pdu_outlet': OUTLETS})
+
+    with attach(publisher.host) as model:
+        current = model.column('sentry4_pdu_outlet', 'current')
+        assert current[0] == 0.27
+        assert math.isnan(current[1])
+        current.release()
+
+        with pytest.raises(TypeError):
+            model.column('sentry4_pdu_outlet', 'outlet_name')
+
+
+def test_shared_latest(publisher):
+    assert attach(publisher.host) is None
+
+    publisher.publish(1.0, {})
+    first = attach(publisher.host)
+
+    for timestamp in (2.0, 3.0, 4.0):
+        publisher.publish(timestamp, {})
+
+    # A reader keeps its model while newer ones are published
+    assert first.timestamp == 1.0
+    first.close()
+
+    with attach(publisher.host) as model:
+        assert model.timestamp == 4.0
+
+    publisher.close()
+    assert attach(publisher.host) is None
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the SNMP codec and client of the Sentry4 PDU tools.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from sentry4_pdu import snmp
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 255, 256, -1, -128, -129, -410, 2 ** 31 - 1])
+def test_integer(value):
+    assert snmp.decode_value(snmp.integer(value)) == value
+
+
+@pytest.mark.parametrize('message', [
+    snmp.Message(snmp.VERSION_2C, 'public', snmp.GET_BULK_REQUEST, 1234, 0, 25, [((1, 3, 6, 1, 4, 1, 1718, 4, 1, 8, 2, 1, 2), snmp.NULL)]),
+    snmp.Message(snmp.VERSION_1, 'public', snmp.RESPONSE, 7, 0, 0, [
+        ((1, 3, 6, 1, 4, 1, 1718, 4, 1, 8, 2, 1, 2, 1, 1, 1), snmp.octet_string('AA1' * 100)),
+        ((1, 3, 6, 1, 4, 1, 1718, 4, 1, 9, 3, 1, 1, 1, 1), snmp.integer(-410)),
+        ((1, 3, 6, 1, 4, 1, 1718, 4, 1, 9, 3, 1, 1, 1, 2), snmp.END_OF_MIB_VIEW),
+    ]),
+])
+def test_encode_decode_message(message):
+    assert snmp.decode_message(snmp.encode_message(message)) == message
+
+
+def test_decode_message_truncated():
+    data = snmp.encode_message(snmp.Message(snmp.VERSION_2C, 'public', snmp.GET_REQUEST, 1, 0, 0, [((1, 3, 6, 1), snmp.NULL)]))
+    with pytest.raises(snmp.SNMPError):
+        snmp.decode_message(data[:-3])
+
+
+@pytest.mark.parametrize('version', [snmp.VERSION_1, snmp.VERSION_2C])
+def test_walk(snmp_standin, version):
+    client = snmp.SNMPClient('127.0.0.1', snmp_standin.port, version=version)
+    (varbinds, successor) = client.walk(snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.2.1.3'))
+
+    assert len(varbinds) == 48
+    assert snmp.decode_value(varbinds[0][1]) == 'Outlet_A1'
+    assert successor[0] == snmp.oid_from_str('.1.3.6.1.4.1.1718.4.1.8.3.1.1.1.1.1')
+    assert client.requests == len(snmp_standin.requests)
@@ -43,3 +43,59 @@ graph_info['sentry4_temp'] = {
         "sentry4_temp:crit",
     ]
 }
+
+metric_info['sentry4_temp_min'] = {
+    'title': _('Temperature minimum'),
+    'unit': 'c',
+    'color': '16/b',
+}
+
+metric_info['sentry4_temp_avg'] = {
+    'title': _('Temperature average'),
+    'unit': 'c',
+    'color': '16/a',
+}
+
+metric_info['sentry4_temp_max'] = {
+    'title': _('Temperature maximum'),
+    'unit': 'c',
+    'color': '15/a',
+}
+
+metric_info['sentry4_humidity_min'] = {
+    'title': _('Humidity minimum'),
+    'unit': '%',
+    'color': '31/b',
+}
+
+metric_info['sentry4_humidity_avg'] = {
+    'title': _('Humidity average'),
+    'unit': '%',
+    'color': '31/a',
+}
+
+metric_info['sentry4_humidity_max'] = {
+    'title': _('Humidity maximum'),
+    'unit': '%',
+    'color': '32/a',
+}
+
+
+graph_info['sentry4_temp_environment'] = {
+    'title': _('Temperature of all unit sensors'),
+    'metrics': [
+        ('sentry4_temp_max', 'line'),
+        ('sentry4_temp_avg', 'line'),
+        ('sentry4_temp_min', 'line'),
+    ],
+}
+
+
+graph_info['sentry4_humidity_environment'] = {
+    'title': _('Humidity of all unit sensors'),
+    'metrics': [
+        ('sentry4_humidity_max', 'line'),
+        ('sentry4_humidity_avg', 'line'),
+        ('sentry4_humidity_min', 'line'),
+    ],
+}
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Rule for the Sentry4 PDU special agent.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.special_agents.common import RulespecGroupDatasourceProgramsHardware
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    rulespec_registry,
+)
+from cmk.gui.valuespec import (
+    Age,
+    Dictionary,
+    DropdownChoice,
+    Float,
+    Integer,
+    Password,
+)
+
+
+def _valuespec_special_agents_sentry4_pdu():
+    return Dictionary(
+        title=_('Sentry4 PDUs via targeted SNMP GET requests'),
+        help=_('Fetches the Sentry4 tables of a PDU with batched GET requests for the known '
+               'outlets, input cords and sensors instead of walking the tables. The tables are '
+               'walked again on a schedule, and whenever a known index no longer exists. '
+               'Disable SNMP for the hosts this rule applies to.'),
+        elements=[
+            ('community', Password(
+                title=_('SNMP community'),
+                default_value='public',
+            )),
+            ('snmp_version', DropdownChoice(
+                title=_('SNMP version'),
+                choices=[
+                    ('1', _('SNMP v1')),
+                    ('2c', _('SNMP v2c')),
+                ],
+                default_value='2c',
+            )),
+            ('port', Integer(
+                title=_('SNMP port'),
+                minvalue=1,
+                maxvalue=65535,
+                default_value=161,
+            )),
+            ('timeout', Float(
+                title=_('Timeout'),
+                unit=_('s'),
+                default_value=1.0,
+            )),
+            ('retries', Integer(
+                title=_('Retries'),
+                minvalue=0,
+                default_value=2,
+            )),
+            ('max_repetitions', Integer(
+                title=_('GetBulk max-repetitions of full walks'),
+                minvalue=1,
+                default_value=25,
+            )),
+            ('max_oids', Integer(
+                title=_('OIDs per GET request'),
+                help=_('Lower this if the PDU answers with tooBig errors or not at all.'),
+                minvalue=1,
+                default_value=40,
+            )),
+            ('full_walk_interval', Age(
+                title=_('Interval between full walks'),
+                help=_('New outlets and sensors, and sensors connected since the last full walk, '
+                       'are discovered by the next full walk.'),
+                default_value=3600,
+            )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupDatasourceProgramsHardware,
+        name='special_agents:sentry4_pdu',
+        valuespec=_valuespec_special_agents_sentry4_pdu,
+    ))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks based on the Sentry4-MIB for PDU status.
+#
+# Copyright (C) 2022 Curtis Bowden <curtis.bowden@gmail.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    rulespec_registry,
+    RulespecGroupCheckParametersDiscovery,
+)
+from cmk.gui.valuespec import (
+    Dictionary,
+    DropdownChoice,
+)
+
+
+def _valuespec_sentry4_pdu_discovery():
+    return Dictionary(
+        title=_('Sentry4 PDU discovery'),
+        elements=[
+            ('item_naming', DropdownChoice(
+                title=_('Service item naming'),
+                help=_('Items built from the ID only stay the same when an outlet, input cord, '
+                       'sensor or unit is relabeled on the PDU. The name is then shown in the '
+                       'service summary instead. Existing services keep working after switching '
+                       'until they are rediscovered.'),
+                choices=[
+                    ('id_name', _('ID and name (e.g. "Outlet AA1 Master_Outlet_1")')),
+                    ('id', _('ID only (e.g. "Outlet AA1")')),
+                ],
+                default_value='id_name',
+            )),
+            ('environment_grouping', DropdownChoice(
+                title=_('Temperature and humidity sensors'),
+                help=_('Units with many environmental probes, e.g. an EMCU, can be monitored by a '
+                       'single "Environment" service per unit. It checks all temperature and '
+                       'humidity sensors of the unit against their thresholds, reports the ones '
+                       'out of range and records the minimum, average and maximum values.'),
+                choices=[
+                    ('sensor', _('One service per sensor')),
+                    ('unit', _('One "Environment" service per unit')),
+                ],
+                default_value='sensor',
+            )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupCheckParametersDiscovery,
+        match_type='dict',
+        name='sentry4_pdu_discovery',
+        valuespec=_valuespec_sentry4_pdu_discovery,
+    ))